@@ -34,3 +34,17 @@ FROM ops.pipeline_flow_audit
 WHERE started_at >= NOW() - INTERVAL '24 hours'
 GROUP BY flow_name
 ORDER BY flow_name;
+
+-- Column drift findings over 24h
+SELECT
+    profiled_at,
+    batch_id,
+    column_name,
+    finding ->> 'metric' AS metric,
+    (finding ->> 'observed')::DOUBLE PRECISION AS observed,
+    (finding ->> 'expected')::DOUBLE PRECISION AS expected,
+    (finding ->> 'score')::DOUBLE PRECISION AS score
+FROM ops.batch_column_profiles,
+    JSONB_ARRAY_ELEMENTS(drift_findings) AS finding
+WHERE profiled_at >= NOW() - INTERVAL '24 hours'
+ORDER BY profiled_at DESC, column_name;
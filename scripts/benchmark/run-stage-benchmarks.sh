@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+: "${BENCHMARK_ROWS:=100000}"
+: "${BENCHMARK_OUTPUT_DIR:=benchmark-results}"
+
+commit="$(git rev-parse --short HEAD 2>/dev/null || echo "workdir")"
+output="${BENCHMARK_OUTPUT_DIR}/stages-${commit}-${BENCHMARK_ROWS}.json"
+
+echo "[benchmark] rows=${BENCHMARK_ROWS} output=${output}"
+python -m drp.benchmarks.stage_benchmarks --rows "${BENCHMARK_ROWS}" --output "${output}" "$@"
@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Restores the staging and analytics tables displaced by the last stage-and-validate promotion.
+python -c "from drp.config.settings import get_settings; from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository; warehouse = DuckDbWarehouseRepository(get_settings()); warehouse.rollback_promotion(); warehouse.publish_snapshot()"
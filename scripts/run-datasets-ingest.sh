@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+python -m drp.orchestration.prefect.flows.ingest_datasets_flow
@@ -1,5 +1,4 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-bash /app/scripts/run-ingest-flow.sh
-bash /app/scripts/run-stage-validate-flow.sh
+python -m drp.orchestration.prefect.run ingest-orders-to-raw stage-and-validate-orders
@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Usage: run-raw-backfill.sh START_DATE END_DATE [--max-workers N]
+python -m drp.orchestration.prefect.flows.backfill_raw_orders_flow "$@"
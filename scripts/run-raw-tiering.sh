@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+python -m drp.orchestration.prefect.flows.tier_raw_orders_flow
@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Usage: run-recompute.sh START_DATE END_DATE [--grain day|week]
+python -m drp.orchestration.prefect.flows.recompute_orders_flow "$@"
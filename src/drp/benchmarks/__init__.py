@@ -0,0 +1 @@
+"""Synthetic benchmark suite for pipeline stages."""
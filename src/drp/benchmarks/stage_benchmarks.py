@@ -0,0 +1,389 @@
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from uuid import uuid4
+
+import psycopg
+import pyarrow.parquet as pq
+
+from drp.config.settings import Settings, get_settings
+from drp.core.exceptions import StorageError
+from drp.core.logging import configure_logging
+from drp.core.order_batch import RAW_ORDER_SCHEMA, SOURCE_ORDER_SCHEMA, OrderBatch
+from drp.observability.resource_usage import PeakRssSampler
+from drp.quality.great_expectations.orders_quality_validator import OrdersQualityValidator
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+from drp.storage.local.batch_spool import ArrowBatchSpool, BatchHandle
+from drp.storage.object_store.archive_service import ObjectStoreArchiveService
+from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+from drp.synthetic.orders_generator import (
+    LOAD_PROFILES,
+    SyntheticOrdersConfig,
+    SyntheticOrdersGenerator,
+    get_load_profile,
+)
+from drp.transform.staging.orders_staging_service import OrdersStagingService
+
+STAGE_NAMES = (
+    "insert_raw_orders",
+    "fetch_recent_raw_orders",
+    "build_staging",
+    "replace_staging_orders",
+    "refresh_daily_metrics",
+    "validate_staging_orders",
+    "export_daily_metrics_to_parquet",
+    "archive_raw_batch",
+)
+POSTGRES_STAGES = frozenset({"insert_raw_orders", "fetch_recent_raw_orders"})
+BENCHMARK_RAW_SCHEMA = "drp_bench"
+
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StageBenchmarkResult:
+    stage: str
+    status: str
+    rows: int
+    seconds: float
+    rows_per_sec: float
+    peak_rss_mb: float
+    rss_growth_mb: float
+    detail: str | None = None
+
+
+class InMemoryS3Repository:
+    def __init__(self, bucket: str = "drp-benchmark") -> None:
+        self._bucket = bucket
+        self.objects: dict[str, bytes] = {}
+
+    def put_json(self, key: str, payload: dict[str, Any]) -> str:
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        return self.put_bytes(key=key, payload=body, content_type="application/json")
+
+    def put_bytes(self, key: str, payload: bytes, content_type: str = "application/octet-stream") -> str:
+        self.objects[key] = payload
+        return f"s3://{self._bucket}/{key}"
+
+    def upload_file(self, local_path: str, key: str) -> str:
+        path = Path(local_path)
+        if not path.exists():
+            raise StorageError(f"Cannot upload missing file: {local_path}")
+        return self.put_bytes(key=key, payload=path.read_bytes())
+
+
+class StageBenchmarkRunner:
+    def __init__(
+        self,
+        settings: Settings,
+        config: SyntheticOrdersConfig,
+        work_dir: Path,
+        include_postgres: bool = True,
+        chunk_size: int = 100_000,
+    ) -> None:
+        self._config = config
+        self._chunk_size = chunk_size
+        self._include_postgres = include_postgres
+        self._settings = settings.model_copy(
+            update={
+                "duckdb_path": str(work_dir / "benchmark-warehouse.duckdb"),
+                "batch_spool_dir": str(work_dir / "spool"),
+                "raw_schema": BENCHMARK_RAW_SCHEMA,
+                "object_store_enabled": True,
+                "object_store_required": True,
+            }
+        )
+        self._work_dir = work_dir
+        self._logger = logging.getLogger(__name__)
+        self._spool = ArrowBatchSpool(self._settings)
+        self._source_batches: BatchHandle | None = None
+        self._raw_batches: BatchHandle | None = None
+        self._staged_rows: int | None = None
+        self._metrics_refreshed = False
+        self._raw_loaded = False
+
+    def run(self, stages: Sequence[str] = STAGE_NAMES) -> list[StageBenchmarkResult]:
+        unknown = sorted(set(stages) - set(STAGE_NAMES))
+        if unknown:
+            raise ValueError(f"Unknown benchmark stages: {unknown}")
+
+        self._spool_synthetic_orders()
+
+        postgres_skip_reason = self._prepare_postgres() if POSTGRES_STAGES & set(stages) else None
+        stage_functions: dict[str, Callable[[], int]] = {
+            "insert_raw_orders": self._bench_insert_raw_orders,
+            "fetch_recent_raw_orders": self._bench_fetch_recent_raw_orders,
+            "build_staging": self._bench_build_staging,
+            "replace_staging_orders": self._bench_replace_staging_orders,
+            "refresh_daily_metrics": self._bench_refresh_daily_metrics,
+            "validate_staging_orders": self._bench_validate_staging_orders,
+            "export_daily_metrics_to_parquet": self._bench_export_daily_metrics,
+            "archive_raw_batch": self._bench_archive_raw_batch,
+        }
+
+        results: list[StageBenchmarkResult] = []
+        try:
+            for stage in STAGE_NAMES:
+                if stage not in stages:
+                    continue
+                if stage in POSTGRES_STAGES and postgres_skip_reason is not None:
+                    results.append(_skipped(stage, postgres_skip_reason))
+                    continue
+                results.append(self._measure(stage, stage_functions[stage]))
+        finally:
+            for handle in (self._source_batches, self._raw_batches):
+                if handle is not None:
+                    self._spool.release(handle)
+        return results
+
+    def _measure(self, stage: str, func: Callable[[], int]) -> StageBenchmarkResult:
+        self._logger.info("Running benchmark stage=%s", stage)
+        sampler = PeakRssSampler()
+        with sampler:
+            started = time.perf_counter()
+            try:
+                rows = func()
+                status, detail = "ok", None
+            except Exception as exc:  # noqa: BLE001
+                rows, status, detail = 0, "failed", str(exc)
+            elapsed = time.perf_counter() - started
+
+        return StageBenchmarkResult(
+            stage=stage,
+            status=status,
+            rows=rows,
+            seconds=round(elapsed, 6),
+            rows_per_sec=round(rows / elapsed, 2) if elapsed > 0 else 0.0,
+            peak_rss_mb=round(sampler.peak_rss_bytes / _MB, 2),
+            rss_growth_mb=round((sampler.peak_rss_bytes - sampler.start_rss_bytes) / _MB, 2),
+            detail=detail,
+        )
+
+    def _prepare_postgres(self) -> str | None:
+        if not self._include_postgres:
+            return "postgres stages disabled"
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        try:
+            with psycopg.connect(self._settings.postgres_dsn, connect_timeout=5) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(f"DROP TABLE IF EXISTS {schema}.{table}")
+                conn.commit()
+            RawOrdersRepository(self._settings).ensure_table()
+        except (psycopg.Error, StorageError) as exc:
+            return f"postgres unavailable: {exc}"
+        return None
+
+    def _spool_synthetic_orders(self) -> None:
+        # Orders are generated once, a chunk at a time, into Arrow IPC files outside the timed stages;
+        # stages then stream them back memory-mapped, so memory stays bounded by the chunk size.
+        generator = SyntheticOrdersGenerator(self._config)
+        source_system = self._config.source_system
+        self._logger.info("Generating synthetic orders rows=%s seed=%s", self._config.rows, self._config.seed)
+        self._source_batches = self._spool.write_batches(
+            (
+                OrderBatch.from_source_records(chunk.to_source_records())
+                for chunk in generator.iter_chunks(self._chunk_size)
+            ),
+            name="benchmark-source",
+            schema=SOURCE_ORDER_SCHEMA,
+        )
+        self._raw_batches = self._spool.write_batches(
+            (
+                OrderBatch.from_raw_records(chunk.to_raw_records(source_system))
+                for chunk in generator.iter_chunks(self._chunk_size)
+            ),
+            name="benchmark-raw",
+            schema=RAW_ORDER_SCHEMA,
+        )
+
+    def _iter_source(self) -> Iterator[OrderBatch]:
+        assert self._source_batches is not None
+        return self._spool.iter_batches(self._source_batches)
+
+    def _iter_raw(self) -> Iterator[OrderBatch]:
+        assert self._raw_batches is not None
+        return self._spool.iter_batches(self._raw_batches)
+
+    def _bench_insert_raw_orders(self) -> int:
+        inserted = self._load_raw_orders()
+        self._raw_loaded = True
+        return inserted
+
+    def _bench_fetch_recent_raw_orders(self) -> int:
+        if not self._raw_loaded:
+            self._load_raw_orders()
+            self._raw_loaded = True
+        chunks = RawOrdersRepository(self._settings).iter_recent_raw_orders(
+            limit=self._config.rows, chunk_rows=self._chunk_size
+        )
+        return sum(len(chunk) for chunk in chunks)
+
+    def _bench_build_staging(self) -> int:
+        # Times the Arrow dedup and cleaning kernels chunk by chunk; the full-table dedup runs in DuckDB
+        # and is timed by replace_staging_orders.
+        service = OrdersStagingService(warehouse=DuckDbWarehouseRepository(self._settings))
+        rows = 0
+        for chunk in self._iter_raw():
+            service.clean(chunk)
+            rows += len(chunk)
+        return rows
+
+    def _bench_replace_staging_orders(self) -> int:
+        self._staged_rows = DuckDbWarehouseRepository(self._settings).replace_staging_orders_chunked(self._iter_raw())
+        return self._staged_rows
+
+    def _bench_refresh_daily_metrics(self) -> int:
+        staged_rows = self._ensure_staging_loaded()
+        DuckDbWarehouseRepository(self._settings).refresh_daily_metrics()
+        self._metrics_refreshed = True
+        # The rollup scans every staged row; the few metric rows it writes say nothing about throughput.
+        return staged_rows
+
+    def _bench_validate_staging_orders(self) -> int:
+        self._ensure_staging_loaded()
+        result = OrdersQualityValidator(self._settings).validate_staging_orders()
+        return result.checked_rows
+
+    def _bench_export_daily_metrics(self) -> int:
+        self._ensure_staging_loaded()
+        warehouse = DuckDbWarehouseRepository(self._settings)
+        if not self._metrics_refreshed:
+            warehouse.refresh_daily_metrics()
+            self._metrics_refreshed = True
+        output_path = self._work_dir / "daily_order_metrics.parquet"
+        warehouse.export_daily_metrics_to_parquet(str(output_path))
+        return pq.read_metadata(output_path).num_rows
+
+    def _bench_archive_raw_batch(self) -> int:
+        archive = ObjectStoreArchiveService(self._settings, repository=InMemoryS3Repository())  # type: ignore[arg-type]
+        rows = 0
+        for chunk in self._iter_source():
+            archive.archive_raw_batch(batch_id=str(uuid4()), records=chunk)
+            rows += len(chunk)
+        return rows
+
+    def _load_raw_orders(self) -> int:
+        repo = RawOrdersRepository(self._settings)
+        return sum(repo.insert_raw_orders(records=chunk, batch_id=uuid4()) for chunk in self._iter_source())
+
+    def _ensure_staging_loaded(self) -> int:
+        if self._staged_rows is None:
+            warehouse = DuckDbWarehouseRepository(self._settings)
+            self._staged_rows = warehouse.replace_staging_orders_chunked(self._iter_raw())
+        return self._staged_rows
+
+
+def build_report(config: SyntheticOrdersConfig, results: Sequence[StageBenchmarkResult]) -> dict[str, Any]:
+    config_payload = asdict(config)
+    config_payload["start_at"] = config.start_at.isoformat()
+    return {
+        "suite": "drp-stage-benchmarks",
+        "generated_at": datetime.now(UTC).isoformat(),
+        "git_commit": _git_commit(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config_payload,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time pipeline stages against seeded synthetic orders.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    parser.add_argument("--customer-skew", type=float, default=0.0, help="Zipf exponent; 0 means uniform.")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(LOAD_PROFILES),
+        default=None,
+        help="Named load profile; overrides --duplicate-ratio and --customer-skew.",
+    )
+    parser.add_argument("--customer-count", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--stages", nargs="+", choices=STAGE_NAMES, default=list(STAGE_NAMES))
+    parser.add_argument("--skip-postgres", action="store_true")
+    parser.add_argument("--work-dir", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    configure_logging(service_name="drp-benchmarks")
+    if args.profile is not None:
+        config = get_load_profile(args.profile).to_config(
+            rows=args.rows,
+            seed=args.seed,
+            customer_count=args.customer_count,
+            days=args.days,
+        )
+    else:
+        config = SyntheticOrdersConfig(
+            rows=args.rows,
+            seed=args.seed,
+            duplicate_ratio=args.duplicate_ratio,
+            customer_skew=args.customer_skew,
+            customer_count=args.customer_count,
+            days=args.days,
+        )
+
+    with TemporaryDirectory(prefix="drp-bench-") as tmp_dir:
+        work_dir = args.work_dir or Path(tmp_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        runner = StageBenchmarkRunner(
+            settings=get_settings(),
+            config=config,
+            work_dir=work_dir,
+            include_postgres=not args.skip_postgres,
+            chunk_size=args.chunk_size,
+        )
+        results = runner.run(stages=args.stages)
+
+    report = json.dumps(build_report(config, results), indent=2)
+    if args.output is None:
+        sys.stdout.write(report + "\n")
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(report + "\n", encoding="utf-8")
+    return 1 if any(result.status == "failed" for result in results) else 0
+
+
+def _skipped(stage: str, reason: str) -> StageBenchmarkResult:
+    return StageBenchmarkResult(
+        stage=stage,
+        status="skipped",
+        rows=0,
+        seconds=0.0,
+        rows_per_sec=0.0,
+        peak_rss_mb=0.0,
+        rss_growth_mb=0.0,
+        detail=reason,
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
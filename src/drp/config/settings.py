@@ -12,8 +12,33 @@ class Settings(BaseSettings):
 
     api_base_url: str = Field(default="http://api-generator:8000", alias="API_BASE_URL")
     api_orders_endpoint: str = Field(default="/v1/orders", alias="API_ORDERS_ENDPOINT")
+    orders_api_connect_timeout_seconds: float = Field(default=3.05, alias="ORDERS_API_CONNECT_TIMEOUT_SECONDS")
+    orders_api_read_timeout_seconds: float = Field(default=20.0, alias="ORDERS_API_READ_TIMEOUT_SECONDS")
+    orders_api_rate_limit_per_second: float = Field(default=20.0, alias="ORDERS_API_RATE_LIMIT_PER_SECOND")
+    orders_api_rate_limit_burst: int = Field(default=10, alias="ORDERS_API_RATE_LIMIT_BURST")
+    orders_api_circuit_failure_threshold: int = Field(default=5, alias="ORDERS_API_CIRCUIT_FAILURE_THRESHOLD")
+    orders_api_circuit_reset_seconds: float = Field(default=5.0, alias="ORDERS_API_CIRCUIT_RESET_SECONDS")
+    orders_api_circuit_max_reset_seconds: float = Field(default=120.0, alias="ORDERS_API_CIRCUIT_MAX_RESET_SECONDS")
     ingest_batch_size: int = Field(default=100, alias="INGEST_BATCH_SIZE")
+    ingest_adaptive_batching: bool = Field(default=True, alias="INGEST_ADAPTIVE_BATCHING")
+    ingest_min_page_size: int = Field(default=50, alias="INGEST_MIN_PAGE_SIZE")
+    ingest_max_page_size: int = Field(default=1000, alias="INGEST_MAX_PAGE_SIZE")
+    ingest_max_in_flight: int = Field(default=4, alias="INGEST_MAX_IN_FLIGHT")
+    ingest_target_latency_seconds: float = Field(default=1.0, alias="INGEST_TARGET_LATENCY_SECONDS")
+    ingest_batch_state_path: str = Field(default="/app/data/state/ingest_batch_sizing.json", alias="INGEST_BATCH_STATE_PATH")
+    stream_page_size: int = Field(default=500, alias="STREAM_PAGE_SIZE")
+    stream_queue_max_pages: int = Field(default=8, alias="STREAM_QUEUE_MAX_PAGES")
+    stream_commit_max_records: int = Field(default=5000, alias="STREAM_COMMIT_MAX_RECORDS")
+    stream_commit_max_seconds: float = Field(default=2.0, alias="STREAM_COMMIT_MAX_SECONDS")
+    stream_archive_queue_max_batches: int = Field(default=4, alias="STREAM_ARCHIVE_QUEUE_MAX_BATCHES")
+    stream_idle_wait_seconds: float = Field(default=1.0, alias="STREAM_IDLE_WAIT_SECONDS")
+    stream_max_consecutive_fetch_errors: int = Field(default=5, alias="STREAM_MAX_CONSECUTIVE_FETCH_ERRORS")
     duckdb_path: str = Field(default="/app/data/analytics/warehouse.duckdb", alias="DUCKDB_PATH")
+    duckdb_writer_lock_timeout_seconds: float = Field(default=600.0, alias="DUCKDB_WRITER_LOCK_TIMEOUT_SECONDS")
+    duckdb_snapshot_retain: int = Field(default=3, alias="DUCKDB_SNAPSHOT_RETAIN")
+
+    metrics_cache_ttl_seconds: float = Field(default=30.0, alias="METRICS_CACHE_TTL_SECONDS")
+    metrics_cache_max_entries: int = Field(default=256, alias="METRICS_CACHE_MAX_ENTRIES")
 
     postgres_host: str = Field(default="postgres", alias="POSTGRES_HOST")
     postgres_port: int = Field(default=5432, alias="POSTGRES_PORT")
@@ -23,12 +48,41 @@ class Settings(BaseSettings):
 
     raw_schema: str = Field(default="raw", alias="RAW_SCHEMA")
     raw_orders_table: str = Field(default="orders_raw", alias="RAW_ORDERS_TABLE")
+    raw_quarantine_table: str = Field(default="orders_quarantine", alias="RAW_QUARANTINE_TABLE")
+    raw_checkpoint_table: str = Field(default="ingestion_checkpoints", alias="RAW_CHECKPOINT_TABLE")
+    raw_backfill_table: str = Field(default="backfill_batches", alias="RAW_BACKFILL_TABLE")
+    raw_fingerprint_table: str = Field(default="batch_fingerprints", alias="RAW_FINGERPRINT_TABLE")
+    backfill_max_workers: int = Field(default=8, alias="BACKFILL_MAX_WORKERS")
+    raw_archive_catchup_batches: int = Field(default=20, alias="RAW_ARCHIVE_CATCHUP_BATCHES")
+    raw_hot_retention_days: int = Field(default=30, alias="RAW_HOT_RETENTION_DAYS")
+    raw_cold_cache_dir: str = Field(default="/app/data/raw_cold_cache", alias="RAW_COLD_CACHE_DIR")
 
     source_system: str = Field(default="fastapi-orders-api", alias="SOURCE_SYSTEM")
     transform_source_limit: int = Field(default=5000, alias="TRANSFORM_SOURCE_LIMIT")
+    stage_memory_budget_mb: int = Field(default=512, alias="STAGE_MEMORY_BUDGET_MB")
+    recompute_max_parallel_partitions: int = Field(default=4, alias="RECOMPUTE_MAX_PARALLEL_PARTITIONS")
+    batch_spool_dir: str = Field(default="/app/data/spool", alias="BATCH_SPOOL_DIR")
     observability_schema: str = Field(default="ops", alias="OBSERVABILITY_SCHEMA")
     flow_audit_table: str = Field(default="pipeline_flow_audit", alias="FLOW_AUDIT_TABLE")
+    column_profile_table: str = Field(default="batch_column_profiles", alias="COLUMN_PROFILE_TABLE")
+    column_profiling_enabled: bool = Field(default=True, alias="COLUMN_PROFILING_ENABLED")
+    column_profile_baseline_batches: int = Field(default=20, alias="COLUMN_PROFILE_BASELINE_BATCHES")
+    column_profile_min_baseline_batches: int = Field(default=5, alias="COLUMN_PROFILE_MIN_BASELINE_BATCHES")
+    drift_null_rate_tolerance: float = Field(default=0.05, alias="DRIFT_NULL_RATE_TOLERANCE")
+    drift_mean_zscore: float = Field(default=4.0, alias="DRIFT_MEAN_ZSCORE")
+    drift_psi_threshold: float = Field(default=0.25, alias="DRIFT_PSI_THRESHOLD")
+    dataset_registry_path: str = Field(default="", alias="DATASET_REGISTRY_PATH")
+    dataset_max_concurrency: int = Field(default=4, alias="DATASET_MAX_CONCURRENCY")
+    dataset_postgres_connections: int = Field(default=4, alias="DATASET_POSTGRES_CONNECTIONS")
+    dataset_warehouse_slots: int = Field(default=1, alias="DATASET_WAREHOUSE_SLOTS")
+    dataset_object_store_slots: int = Field(default=4, alias="DATASET_OBJECT_STORE_SLOTS")
+    reconciliation_enabled: bool = Field(default=True, alias="RECONCILIATION_ENABLED")
+    reconciliation_fail_on_mismatch: bool = Field(default=True, alias="RECONCILIATION_FAIL_ON_MISMATCH")
     alert_on_failure: bool = Field(default=True, alias="ALERT_ON_FAILURE")
+    profiling_enabled: bool = Field(default=False, alias="PROFILING_ENABLED")
+    profile_output_dir: str = Field(default="/app/data/profiles", alias="PROFILE_OUTPUT_DIR")
+    profile_sample_interval_seconds: float = Field(default=0.005, alias="PROFILE_SAMPLE_INTERVAL_SECONDS")
+    object_store_profiles_prefix: str = Field(default="profiles", alias="OBJECT_STORE_PROFILES_PREFIX")
     alert_webhook_url: Optional[str] = Field(default=None, alias="ALERT_WEBHOOK_URL")
     object_store_enabled: bool = Field(default=True, alias="OBJECT_STORE_ENABLED")
     object_store_required: bool = Field(default=False, alias="OBJECT_STORE_REQUIRED")
@@ -39,6 +93,7 @@ class Settings(BaseSettings):
     object_store_secret_access_key: Optional[str] = Field(default="minioadmin", alias="OBJECT_STORE_SECRET_ACCESS_KEY")
     object_store_secure: bool = Field(default=False, alias="OBJECT_STORE_SECURE")
     object_store_raw_prefix: str = Field(default="raw/orders", alias="OBJECT_STORE_RAW_PREFIX")
+    object_store_raw_cold_prefix: str = Field(default="raw/orders_cold", alias="OBJECT_STORE_RAW_COLD_PREFIX")
     object_store_analytics_prefix: str = Field(default="analytics/orders", alias="OBJECT_STORE_ANALYTICS_PREFIX")
 
     @property
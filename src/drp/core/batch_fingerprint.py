@@ -0,0 +1,78 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from hashlib import blake2b
+from uuid import UUID
+
+import numpy as np
+
+_HASH_MODULUS = 1 << 64
+_SIGNED_LIMIT = 1 << 63
+
+
+@dataclass(frozen=True)
+class BatchFingerprint:
+    # Every field is a sum, so fingerprints of disjoint row sets add up to the fingerprint of their union
+    # and two layers can be compared without reading a row. Keys are summed rather than XORed so a
+    # duplicated row changes the fingerprint instead of cancelling out.
+    batch_id: UUID
+    row_count: int = 0
+    amount_cents: int = 0
+    key_hash: int = 0
+
+    def __add__(self, other: "BatchFingerprint") -> "BatchFingerprint":
+        return BatchFingerprint(
+            batch_id=self.batch_id,
+            row_count=self.row_count + other.row_count,
+            amount_cents=self.amount_cents + other.amount_cents,
+            key_hash=signed_hash(self.key_hash + other.key_hash),
+        )
+
+    def matches(self, other: "BatchFingerprint") -> bool:
+        return (self.row_count, self.amount_cents, self.key_hash) == (
+            other.row_count,
+            other.amount_cents,
+            other.key_hash,
+        )
+
+
+def key_hashes(keys: Iterable[str | None]) -> np.ndarray:
+    # A keyed digest rather than hash(): the value must be identical in every process and every layer.
+    return np.fromiter(
+        (0 if key is None else int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little") for key in keys),
+        dtype=np.uint64,
+    )
+
+
+def amount_cents(amounts: Iterable[float | Decimal | None]) -> np.ndarray:
+    # Amounts are stored with two decimals, so cents make the sum exact and independent of row order.
+    return np.fromiter((0 if amount is None else round(amount * 100) for amount in amounts), dtype=np.int64)
+
+
+def fingerprint_rows(
+    batch_ids: Sequence[UUID | str],
+    keys: Sequence[str | None],
+    amounts: Sequence[float | Decimal | None],
+) -> dict[UUID, BatchFingerprint]:
+    if not batch_ids:
+        return {}
+    hashes = key_hashes(keys)
+    cents = amount_cents(amounts)
+    groups, inverse = np.unique(np.asarray([str(batch_id) for batch_id in batch_ids]), return_inverse=True)
+    fingerprints = {}
+    for index, batch_id in enumerate(groups):
+        rows = inverse == index
+        fingerprints[UUID(str(batch_id))] = BatchFingerprint(
+            batch_id=UUID(str(batch_id)),
+            row_count=int(rows.sum()),
+            amount_cents=int(cents[rows].sum()),
+            # uint64 sums wrap modulo 2**64, the same arithmetic the warehouse applies.
+            key_hash=signed_hash(int(hashes[rows].sum())),
+        )
+    return fingerprints
+
+
+def signed_hash(value: int) -> int:
+    # Hash sums are kept modulo 2**64 and stored as signed BIGINT in both Postgres and DuckDB.
+    value %= _HASH_MODULUS
+    return value - _HASH_MODULUS if value >= _SIGNED_LIMIT else value
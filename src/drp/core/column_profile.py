@@ -0,0 +1,101 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from drp.core.order_batch import SOURCE_ORDER_SCHEMA, OrderBatch, to_utc_timestamps
+
+NUMERIC = "numeric"
+TIMESTAMP = "timestamp"
+TEXT = "text"
+
+NEGATIVE_BUCKET = "<0"
+ZERO_BUCKET = "0"
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    column_name: str
+    kind: str
+    row_count: int
+    null_count: int
+    distinct_count: int
+    min_value: float | None = None
+    max_value: float | None = None
+    mean: float | None = None
+    stddev: float | None = None
+    histogram: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def null_rate(self) -> float:
+        return self.null_count / self.row_count if self.row_count else 0.0
+
+
+def profile_batch(batch: OrderBatch, schema: pa.Schema = SOURCE_ORDER_SCHEMA) -> list[ColumnProfile]:
+    # Profiles describe the batch as the source delivered it, so nulls that validation would
+    # quarantine still show up in the null rate.
+    num_rows = len(batch)
+    profiles = []
+    for target in schema:
+        if target.name not in batch.column_names:
+            profiles.append(ColumnProfile(target.name, _kind(target.type), num_rows, null_count=num_rows, distinct_count=0))
+            continue
+        profiles.append(_profile_column(target, batch.column(target.name), num_rows))
+    return profiles
+
+
+def _profile_column(target: pa.Field, column: pa.ChunkedArray, num_rows: int) -> ColumnProfile:
+    kind = _kind(target.type)
+    null_count = column.null_count
+    distinct_count = pc.count_distinct(column, mode="only_valid").as_py()
+    if kind == TEXT:
+        return ColumnProfile(target.name, kind, num_rows, null_count, distinct_count)
+    try:
+        if kind == TIMESTAMP:
+            # Epoch seconds keep timestamp statistics in the same float columns as numeric ones.
+            values = pc.cast(to_utc_timestamps(column, target.type), pa.int64()).to_numpy(zero_copy_only=False) / 1e6
+        else:
+            values = pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Unparsable values are quarantined by validation; the column still reports nulls and cardinality.
+        return ColumnProfile(target.name, kind, num_rows, null_count, distinct_count)
+
+    values = values[np.isfinite(values)]
+    if not values.size:
+        return ColumnProfile(target.name, kind, num_rows, null_count, distinct_count)
+    return ColumnProfile(
+        column_name=target.name,
+        kind=kind,
+        row_count=num_rows,
+        null_count=null_count,
+        distinct_count=distinct_count,
+        min_value=float(values.min()),
+        max_value=float(values.max()),
+        mean=float(values.mean()),
+        stddev=float(values.std()),
+        histogram=_octave_histogram(values) if kind == NUMERIC else {},
+    )
+
+
+def _octave_histogram(values: np.ndarray) -> dict[str, int]:
+    # Power-of-two buckets need no fitted edges, so the histograms of any two batches line up
+    # bucket for bucket and can be summed into a baseline.
+    positive = values[values > 0]
+    exponents, counts = np.unique(np.floor(np.log2(positive)).astype(np.int64), return_counts=True)
+    histogram = {f"2^{exponent}": int(count) for exponent, count in zip(exponents, counts, strict=True)}
+    zeros = int(np.count_nonzero(values == 0))
+    negatives = int(np.count_nonzero(values < 0))
+    if zeros:
+        histogram[ZERO_BUCKET] = zeros
+    if negatives:
+        histogram[NEGATIVE_BUCKET] = negatives
+    return histogram
+
+
+def _kind(data_type: pa.DataType) -> str:
+    if pa.types.is_timestamp(data_type):
+        return TIMESTAMP
+    if pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type):
+        return NUMERIC
+    return TEXT
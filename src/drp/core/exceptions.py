@@ -8,3 +8,11 @@ class DataSourceError(DataPlatformError):
 
 class StorageError(DataPlatformError):
     """Raised for storage access or write failures."""
+
+
+class CircuitOpenError(DataSourceError):
+    """Raised without calling the source while its circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after_seconds: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
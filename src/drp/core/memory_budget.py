@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+# Rough in-flight cost of one raw order: driver row tuple, its Python objects and the Arrow copy.
+RAW_ORDER_ROW_BYTES = 1024
+MIN_CHUNK_ROWS = 1_000
+
+_MIB = 1024 * 1024
+_MIN_DUCKDB_LIMIT_MB = 64
+
+
+@dataclass(frozen=True)
+class MemoryBudget:
+    limit_bytes: int
+
+    @classmethod
+    def from_megabytes(cls, megabytes: int) -> "MemoryBudget":
+        if megabytes <= 0:
+            raise ValueError(f"Memory budget must be positive, got {megabytes} MB")
+        return cls(limit_bytes=megabytes * _MIB)
+
+    def chunk_rows(self, row_bytes: int = RAW_ORDER_ROW_BYTES) -> int:
+        # A quarter of the budget per chunk: the chunk being fetched, the one being written and
+        # DuckDB's buffer pool all have to fit at the same time.
+        return max(MIN_CHUNK_ROWS, self.limit_bytes // 4 // row_bytes)
+
+    @property
+    def duckdb_memory_limit(self) -> str:
+        # DuckDB gets half; past that it spills sorts and window partitions to its temp directory.
+        return f"{max(self.limit_bytes // 2 // _MIB, _MIN_DUCKDB_LIMIT_MB)}MB"
@@ -0,0 +1,249 @@
+import hashlib
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, overload
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+SOURCE_ORDER_SCHEMA = pa.schema(
+    [
+        pa.field("order_id", pa.string()),
+        pa.field("customer_id", pa.string()),
+        pa.field("amount", pa.float64()),
+        pa.field("created_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+RAW_ORDER_SCHEMA = pa.schema(
+    [
+        pa.field("source_order_id", pa.string()),
+        pa.field("customer_id", pa.string()),
+        pa.field("amount", pa.float64()),
+        pa.field("order_created_at", pa.timestamp("us", tz="UTC")),
+        pa.field("ingested_at", pa.timestamp("us", tz="UTC")),
+        pa.field("batch_id", pa.string()),
+        pa.field("source_system", pa.string()),
+    ]
+)
+
+QUARANTINE_REASONS_COLUMN = "quarantine_reasons"
+
+_UTC_TIMESTAMP = pa.timestamp("us", tz="UTC")
+_ITER_CHUNK_ROWS = 4_096
+_ZONE_SUFFIX_PATTERN = r"(Z|[+-]\d{2}:?\d{2})$"
+
+
+class OrderBatch:
+    __slots__ = ("_table",)
+
+    def __init__(self, table: pa.Table) -> None:
+        self._table = table
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]], schema: pa.Schema | None = None) -> "OrderBatch":
+        names: dict[str, None] = {}
+        for record in records:
+            names.update(dict.fromkeys(record))
+        return cls.from_columns({name: [record.get(name) for record in records] for name in names}, schema)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[Any]], schema: pa.Schema | None = None) -> "OrderBatch":
+        arrays = {name: _column(list(values)) for name, values in columns.items()}
+        if schema is not None:
+            num_rows = len(next(iter(arrays.values()))) if arrays else 0
+            for name in schema.names:
+                arrays.setdefault(name, pa.nulls(num_rows))
+        batch = cls(pa.Table.from_arrays(list(arrays.values()), names=list(arrays)))
+        return batch if schema is None else batch.conform(schema)
+
+    @classmethod
+    def from_source_records(cls, records: Sequence[Mapping[str, Any]]) -> "OrderBatch":
+        return cls.from_records(records, SOURCE_ORDER_SCHEMA)
+
+    @classmethod
+    def from_raw_records(cls, records: Sequence[Mapping[str, Any]]) -> "OrderBatch":
+        return cls.from_records(records, RAW_ORDER_SCHEMA)
+
+    @classmethod
+    def empty(cls, schema: pa.Schema = SOURCE_ORDER_SCHEMA) -> "OrderBatch":
+        return cls(schema.empty_table())
+
+    @classmethod
+    def concat(cls, batches: Sequence["OrderBatch"]) -> "OrderBatch":
+        if not batches:
+            return cls.empty()
+        tables = [batch.table for batch in batches]
+        try:
+            return cls(pa.concat_tables(tables, promote_options="permissive"))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return cls(pa.concat_tables(_text_for_conflicts(tables), promote_options="permissive"))
+
+    @property
+    def table(self) -> pa.Table:
+        return self._table
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._table.schema
+
+    @property
+    def column_names(self) -> list[str]:
+        return self._table.column_names
+
+    @property
+    def num_rows(self) -> int:
+        return self._table.num_rows
+
+    @property
+    def nbytes(self) -> int:
+        return self._table.nbytes
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "OrderBatch": ...
+
+    def __getitem__(self, index: int | slice) -> "dict[str, Any] | OrderBatch":
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.num_rows)
+            if step != 1:
+                raise ValueError("OrderBatch slices must be contiguous.")
+            return self.slice(start, max(stop - start, 0))
+        if index < 0:
+            index += self.num_rows
+        if not 0 <= index < self.num_rows:
+            raise IndexError(f"OrderBatch index {index} out of range for {self.num_rows} rows.")
+        return self._table.slice(index, 1).to_pylist()[0]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        # Materialize rows a chunk at a time so iteration never holds the whole batch as dicts.
+        for view in self.iter_slices(_ITER_CHUNK_ROWS):
+            yield from view.table.to_pylist()
+
+    def column(self, name: str) -> pa.ChunkedArray:
+        return self._table.column(name)
+
+    def slice(self, offset: int, length: int | None = None) -> "OrderBatch":
+        return OrderBatch(self._table.slice(offset, length))
+
+    def iter_slices(self, size: int) -> Iterator["OrderBatch"]:
+        if size < 1:
+            raise ValueError("Slice size must be positive.")
+        for offset in range(0, self.num_rows, size):
+            yield self.slice(offset, size)
+
+    def filter(self, mask: pa.Array | pa.ChunkedArray) -> "OrderBatch":
+        return OrderBatch(self._table.filter(mask))
+
+    def take(self, indices: pa.Array | pa.ChunkedArray) -> "OrderBatch":
+        return OrderBatch(self._table.take(indices))
+
+    def with_column(self, name: str, values: pa.Array | pa.ChunkedArray) -> "OrderBatch":
+        if name in self._table.column_names:
+            index = self._table.column_names.index(name)
+            return OrderBatch(self._table.set_column(index, name, values))
+        return OrderBatch(self._table.append_column(name, values))
+
+    def conform(self, schema: pa.Schema) -> "OrderBatch":
+        # Casts the columns the schema knows about and keeps any extra source fields as-is.
+        table = self._table
+        for field in schema:
+            if field.name not in table.column_names:
+                continue
+            index = table.column_names.index(field.name)
+            column = _cast_column(table.column(index), field.type)
+            table = table.set_column(index, field.name, column)
+        return OrderBatch(table)
+
+    def content_hash(self) -> str:
+        # Deterministic fingerprint of the rows: refetching the same source page yields the same hash.
+        digest = hashlib.sha256()
+        for name in sorted(self._table.column_names):
+            digest.update(name.encode("utf-8"))
+            for value in _text_values(self._table.column(name)):
+                digest.update(b"\x1f" if value is None else b"\x1e" + value.encode("utf-8"))
+        return digest.hexdigest()
+
+    def to_records(self) -> list[dict[str, Any]]:
+        return self._table.to_pylist()
+
+    def to_json_records(self) -> list[dict[str, Any]]:
+        table = self._table
+        for index, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                table = table.set_column(index, field.name, _iso_strings(table.column(index)))
+        return table.to_pylist()
+
+
+def as_order_batch(records: "OrderBatch | Sequence[Mapping[str, Any]]", schema: pa.Schema) -> OrderBatch:
+    if isinstance(records, OrderBatch):
+        return records.conform(schema)
+    return OrderBatch.from_records(records, schema)
+
+
+def to_utc_timestamps(
+    column: pa.Array | pa.ChunkedArray,
+    target: pa.DataType = _UTC_TIMESTAMP,
+) -> pa.Array | pa.ChunkedArray:
+    if pa.types.is_timestamp(column.type):
+        # Naive timestamps are taken to be UTC, which is how every layer writes them.
+        return pc.cast(column, target)
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        has_offset = pc.match_substring_regex(column, _ZONE_SUFFIX_PATTERN)
+        column = pc.if_else(has_offset, column, pc.binary_join_element_wise(column, "+00:00", ""))
+    return pc.cast(column, target)
+
+
+def _column(values: list[Any]) -> pa.Array:
+    first = next((value for value in values if value is not None), None)
+    if isinstance(first, UUID):
+        values = [None if value is None else str(value) for value in values]
+    try:
+        return pa.array(values)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Mixed-type source fields stay textual; conform() decides whether they are valid.
+        return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+def _text_values(column: pa.ChunkedArray) -> list[str | None]:
+    if pa.types.is_timestamp(column.type):
+        return _iso_strings(column).to_pylist()
+    try:
+        return pc.cast(column, pa.string()).to_pylist()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return [None if value is None else str(value) for value in column.to_pylist()]
+
+
+def _text_for_conflicts(tables: list[pa.Table]) -> list[pa.Table]:
+    # Pages can infer different types for one dirty field; keep such fields textual like _column does.
+    types: dict[str, set[pa.DataType]] = {}
+    for table in tables:
+        for field in table.schema:
+            if not pa.types.is_null(field.type):
+                types.setdefault(field.name, set()).add(field.type)
+    conflicts = {name for name, seen in types.items() if len(seen) > 1}
+    unified = []
+    for table in tables:
+        for name in conflicts & set(table.column_names):
+            index = table.column_names.index(name)
+            table = table.set_column(index, name, pc.cast(table.column(index), pa.string()))
+        unified.append(table)
+    return unified
+
+
+def _cast_column(column: pa.ChunkedArray, target: pa.DataType) -> pa.ChunkedArray:
+    if column.type == target:
+        return column
+    if pa.types.is_timestamp(target) and target.tz is not None:
+        return to_utc_timestamps(column, target)
+    return pc.cast(column, target)
+
+
+def _iso_strings(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    utc = pc.cast(column, pa.timestamp("us", tz="UTC"))
+    return pc.utf8_replace_slice(pc.strftime(utc, format="%Y-%m-%dT%H:%M:%S%z"), start=-2, stop=-2, replacement=":")
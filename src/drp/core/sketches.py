@@ -0,0 +1,151 @@
+import hashlib
+import math
+import struct
+from collections.abc import Iterable
+
+import numpy as np
+
+HLL_PRECISION = 12
+TDIGEST_COMPRESSION = 200.0
+
+_HASH_BITS = 64
+_DIGEST_HEADER = struct.Struct("<dddI")
+
+
+def hash64(value: str) -> int:
+    # Matches DuckDB's CAST(md5_number(x) & 0xFFFFFFFFFFFFFFFF AS UBIGINT), so SQL and Python agree.
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "little")
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = HLL_PRECISION, registers: np.ndarray | None = None) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        size = 1 << precision
+        self.registers = np.zeros(size, dtype=np.uint8) if registers is None else registers.astype(np.uint8)
+        if self.registers.shape != (size,):
+            raise ValueError(f"Expected {size} HyperLogLog registers, got {self.registers.shape[0]}")
+
+    @classmethod
+    def from_hashes(cls, hashes: np.ndarray, precision: int = HLL_PRECISION) -> "HyperLogLog":
+        sketch = cls(precision)
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size:
+            width = _HASH_BITS - precision
+            index = (hashes >> np.uint64(width)).astype(np.int64)
+            rank = width + 1 - _bit_length(hashes & np.uint64((1 << width) - 1))
+            np.maximum.at(sketch.registers, index, rank.astype(np.uint8))
+        return sketch
+
+    @classmethod
+    def from_values(cls, values: Iterable[str], precision: int = HLL_PRECISION) -> "HyperLogLog":
+        return cls.from_hashes(np.array([hash64(value) for value in values], dtype=np.uint64), precision)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "HyperLogLog":
+        return cls(payload[0], np.frombuffer(payload, dtype=np.uint8, offset=1))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + self.registers.tobytes()
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog sketches of precision {self.precision} and {other.precision}")
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def estimate(self) -> float:
+        size = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is more accurate while many registers are still empty.
+        if raw <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+        return raw
+
+
+class TDigest:
+    def __init__(
+        self,
+        compression: float = TDIGEST_COMPRESSION,
+        means: np.ndarray | None = None,
+        weights: np.ndarray | None = None,
+        minimum: float = math.inf,
+        maximum: float = -math.inf,
+    ) -> None:
+        self.compression = compression
+        self.means = np.zeros(0) if means is None else np.asarray(means, dtype=np.float64)
+        self.weights = np.zeros(0) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: float = TDIGEST_COMPRESSION) -> "TDigest":
+        ordered = np.sort(np.asarray(values, dtype=np.float64))
+        if not ordered.size:
+            return cls(compression)
+        # Singleton centroids compress into k-size buckets in one vectorised pass over sorted data.
+        digest = cls(compression, ordered, np.ones(ordered.size), float(ordered[0]), float(ordered[-1]))
+        return digest._compressed()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "TDigest":
+        compression, minimum, maximum, size = _DIGEST_HEADER.unpack_from(payload)
+        body = np.frombuffer(payload, dtype=np.float64, offset=_DIGEST_HEADER.size)
+        return cls(compression, body[:size].copy(), body[size:].copy(), minimum, maximum)
+
+    def to_bytes(self) -> bytes:
+        header = _DIGEST_HEADER.pack(self.compression, self.minimum, self.maximum, self.means.size)
+        return header + self.means.tobytes() + self.weights.tobytes()
+
+    @property
+    def count(self) -> int:
+        return int(round(float(self.weights.sum())))
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        means = np.concatenate([self.means, other.means])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(means, kind="stable")
+        merged = TDigest(
+            self.compression,
+            means[order],
+            weights[order],
+            min(self.minimum, other.minimum),
+            max(self.maximum, other.maximum),
+        )
+        return merged._compressed()
+
+    def quantile(self, q: float) -> float | None:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"Quantile must be within [0, 1], got {q}")
+        if not self.means.size:
+            return None
+        total = float(self.weights.sum())
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centres, [total]])
+        values = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return float(np.interp(q * total, positions, values))
+
+    def _compressed(self) -> "TDigest":
+        total = float(self.weights.sum())
+        if not total:
+            return self
+        # k1 scale function: centroids stay small near the tails, where p95/p99 need resolution.
+        cumulative = np.cumsum(self.weights) - self.weights / 2
+        scale = self.compression / (2 * math.pi) * np.arcsin(np.clip(2 * cumulative / total - 1, -1.0, 1.0))
+        _, bucket = np.unique(np.floor(scale), return_inverse=True)
+        weights = np.bincount(bucket, weights=self.weights)
+        means = np.bincount(bucket, weights=self.means * self.weights) / weights
+        return TDigest(self.compression, means, weights, self.minimum, self.maximum)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    lengths = np.zeros(values.shape, dtype=np.int64)
+    remaining = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = remaining >> np.uint64(shift)
+        mask = high > 0
+        lengths[mask] += shift
+        remaining = np.where(mask, high, remaining)
+    return lengths + (remaining > 0)
@@ -0,0 +1 @@
+"""Dataset registry package."""
@@ -0,0 +1,162 @@
+import json
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+
+from drp.config.settings import Settings
+from drp.core.order_batch import RAW_ORDER_SCHEMA, SOURCE_ORDER_SCHEMA
+from drp.storage.duckdb.order_marts import ORDER_MART_GRAINS, MartGrain
+
+# Expectations answered by one DuckDB query over the whole table rather than per validated chunk.
+TABLE_EXPECTATIONS = frozenset({"expect_table_row_count_to_be_between", "expect_column_values_to_be_unique"})
+
+
+@dataclass(frozen=True)
+class Expectation:
+    expectation_type: str
+    column: str | None = None
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    name: str
+    source_schema: pa.Schema
+    required_columns: tuple[str, ...]
+    staging_schema: pa.Schema
+    staging_table: str
+    key_columns: tuple[str, ...]
+    version_column: str
+    partition_column: str
+    marts: tuple[MartGrain, ...] = ()
+    expectations: tuple[Expectation, ...] = ()
+    non_negative_columns: tuple[str, ...] = ()
+    # Per-batch fingerprints (row count, amount and key hash sums) reconcile staging against raw.
+    fingerprint_key: str | None = None
+    fingerprint_amount: str | None = None
+    # Unset source and archive fields fall back to the environment's settings.
+    source_system: str | None = None
+    source_endpoint: str | None = None
+    archive_prefix: str | None = None
+
+    @property
+    def spill_table(self) -> str:
+        return f"{self.staging_table}_spill"
+
+    @property
+    def mart_tables(self) -> tuple[str, ...]:
+        return tuple(f"analytics.{grain.table}" for grain in self.marts)
+
+    @property
+    def fingerprint_table(self) -> str | None:
+        return f"{self.staging_table}_fingerprints" if self.fingerprint_key is not None else None
+
+    @property
+    def blue_green_tables(self) -> tuple[str, ...]:
+        # Fingerprints describe one staging build, so they are swapped together with it.
+        fingerprints = () if self.fingerprint_table is None else (self.fingerprint_table,)
+        return (self.staging_table, *fingerprints, *self.mart_tables)
+
+    def settings_for(self, settings: Settings) -> Settings:
+        # Components read their source, checkpoint and archive locations from settings, so a dataset
+        # is served by the same components through a copy with its own values.
+        overrides = {
+            "source_system": self.source_system,
+            "api_orders_endpoint": self.source_endpoint,
+            "object_store_raw_prefix": self.archive_prefix,
+        }
+        update = {name: value for name, value in overrides.items() if value is not None}
+        return settings.model_copy(update=update) if update else settings
+
+
+ORDERS = DatasetSpec(
+    name="orders",
+    source_schema=SOURCE_ORDER_SCHEMA,
+    required_columns=("order_id", "customer_id", "amount", "created_at"),
+    staging_schema=RAW_ORDER_SCHEMA,
+    staging_table="staging.orders",
+    key_columns=("source_order_id",),
+    version_column="ingested_at",
+    partition_column="order_created_at",
+    marts=ORDER_MART_GRAINS,
+    expectations=(
+        Expectation("expect_table_row_count_to_be_between", kwargs={"min_value": 1}),
+        Expectation("expect_column_values_to_be_unique", "source_order_id"),
+        Expectation("expect_column_values_to_not_be_null", "source_order_id"),
+        Expectation("expect_column_values_to_not_be_null", "customer_id"),
+        Expectation("expect_column_values_to_be_between", "amount", {"min_value": 0}),
+        Expectation("expect_column_values_to_not_be_null", "order_created_at"),
+    ),
+    non_negative_columns=("amount",),
+    fingerprint_key="source_order_id",
+    fingerprint_amount="amount",
+)
+
+# Only plain values can be declared in a registry file; schemas, marts and expectations come from the base.
+_DECLARABLE_FIELDS = frozenset(
+    spec_field.name for spec_field in fields(DatasetSpec) if spec_field.type in (str, str | None)
+)
+
+
+class DatasetRegistry:
+    def __init__(self, datasets: Sequence[DatasetSpec] = ()) -> None:
+        self._datasets: dict[str, DatasetSpec] = {}
+        for dataset in datasets:
+            self.register(dataset)
+
+    def register(self, dataset: DatasetSpec) -> DatasetSpec:
+        if dataset.name in self._datasets:
+            raise ValueError(f"Dataset '{dataset.name}' is already registered")
+        self._datasets[dataset.name] = dataset
+        return dataset
+
+    def get(self, name: str) -> DatasetSpec:
+        try:
+            return self._datasets[name]
+        except KeyError:
+            raise ValueError(f"Unknown dataset '{name}'; registered: {', '.join(self.names())}") from None
+
+    def names(self) -> list[str]:
+        return list(self._datasets)
+
+    def select(self, names: Sequence[str] | None = None) -> list[DatasetSpec]:
+        return list(self._datasets.values()) if names is None else [self.get(name) for name in names]
+
+    def __iter__(self) -> Iterator[DatasetSpec]:
+        return iter(self._datasets.values())
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def load_file(self, path: str | Path) -> list[DatasetSpec]:
+        # Entries declare a new source of an already registered dataset shape, e.g.
+        # {"name": "partner_orders", "extends": "orders", "source_system": "partner-api", ...}.
+        try:
+            entries = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise ValueError(f"Cannot read dataset registry file {path}: {exc}") from exc
+        if not isinstance(entries, list):
+            raise ValueError(f"Dataset registry file {path} must contain a list of datasets")
+
+        loaded = []
+        for entry in entries:
+            if not isinstance(entry, dict) or "name" not in entry or "extends" not in entry:
+                raise ValueError(f"Dataset registry entries need 'name' and 'extends', got {entry!r}")
+            overrides = {key: value for key, value in entry.items() if key != "extends"}
+            unknown = set(overrides) - _DECLARABLE_FIELDS
+            if unknown:
+                raise ValueError(f"Dataset '{entry['name']}' declares unsupported fields: {sorted(unknown)}")
+            # Marts and the staging table belong to the base dataset; a new source stages on its own.
+            overrides.setdefault("staging_table", f"staging.{entry['name']}")
+            loaded.append(self.register(replace(self.get(entry["extends"]), marts=(), **overrides)))
+        return loaded
+
+
+def load_registry(settings: Settings) -> DatasetRegistry:
+    registry = DatasetRegistry([ORDERS])
+    if settings.dataset_registry_path:
+        registry.load_file(settings.dataset_registry_path)
+    return registry
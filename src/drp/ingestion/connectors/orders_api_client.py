@@ -1,25 +1,56 @@
-from typing import Any
-
+import pyarrow as pa
 import requests
 
 from drp.config.settings import Settings
 from drp.core.exceptions import DataSourceError
+from drp.core.order_batch import OrderBatch
+from drp.ingestion.connectors.resilience import SourceGuard, source_guard
 
 
 class OrdersApiClient:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, guard: SourceGuard | None = None) -> None:
         self._settings = settings
+        self._guard = guard if guard is not None else source_guard(settings)
+        self._timeout = (settings.orders_api_connect_timeout_seconds, settings.orders_api_read_timeout_seconds)
 
-    def fetch_orders(self, limit: int) -> list[dict[str, Any]]:
+    def fetch_orders(self, limit: int, cursor: int | None = None) -> OrderBatch:
         url = f"{self._settings.api_base_url}{self._settings.api_orders_endpoint}"
+        params: dict[str, int] = {"limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        self._before_request()
         try:
-            response = requests.get(url, params={"limit": limit}, timeout=20)
+            response = requests.get(url, params=params, timeout=self._timeout)
             response.raise_for_status()
-            payload = response.json()
         except requests.RequestException as exc:
+            raise self._request_failed("Orders API request", exc) from exc
+        self._guard.breaker.record_success()
+        try:
+            payload = response.json()
+        except ValueError as exc:
             raise DataSourceError(f"Orders API request failed: {exc}") from exc
 
         records = payload.get("records")
         if not isinstance(records, list):
             raise DataSourceError("Orders API returned invalid payload: missing list 'records'.")
-        return records
+        try:
+            # Types are left as delivered; ingestion validation quarantines rows that do not conform.
+            return OrderBatch.from_records(records)
+        except (pa.ArrowException, AttributeError, TypeError, ValueError) as exc:
+            raise DataSourceError(f"Orders API returned records that are not JSON objects: {exc}") from exc
+
+    def _before_request(self) -> None:
+        # An open circuit fails before spending a token, so a down source costs neither a timeout nor capacity.
+        self._guard.breaker.before_call()
+        if self._guard.limiter is not None:
+            self._guard.limiter.acquire()
+
+    def _request_failed(self, description: str, exc: requests.RequestException) -> DataSourceError:
+        response = exc.response
+        if response is None or response.status_code >= 500 or response.status_code == 429:
+            self._guard.breaker.record_failure()
+        else:
+            # A client error means the source answered, so it says nothing about the source's health.
+            self._guard.breaker.record_success()
+        return DataSourceError(f"{description} failed: {exc}")
+
@@ -0,0 +1,177 @@
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from drp.config.settings import Settings
+from drp.core.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_GUARDS: dict[tuple[object, ...], "SourceGuard"] = {}
+_GUARDS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate_per_second <= 0:
+            raise ValueError(f"rate_per_second must be positive, got {rate_per_second}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        # Each caller reserves its token up front, so the balance can go negative and waiters are
+        # released one refill interval apart in arrival order rather than racing for each token.
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate_per_second)
+            self._updated = now
+            self._tokens -= 1
+            wait_seconds = max(0.0, -self._tokens / self.rate_per_second)
+        if wait_seconds > 0:
+            self._sleep(wait_seconds)
+        return wait_seconds
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        max_reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be at least 1, got {failure_threshold}")
+        if not 0 < reset_timeout_seconds <= max_reset_timeout_seconds:
+            raise ValueError(
+                "Reset timeouts must satisfy 0 < base <= max, "
+                f"got {reset_timeout_seconds}..{max_reset_timeout_seconds}"
+            )
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.max_reset_timeout_seconds = max_reset_timeout_seconds
+        self._clock = clock
+        self._jitter = jitter
+        self._state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._retry_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            now = self._clock()
+            if self._state == OPEN and now >= self._retry_at:
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == HALF_OPEN and not self._probing:
+                # A single probe decides whether the source is back; everyone else keeps failing fast.
+                self._probing = True
+                self._logger.info("Circuit half-open, probing source=%s", self.name)
+                return
+            retry_after_seconds = max(self._retry_at - now, 0.0)
+        raise CircuitOpenError(
+            f"Circuit open for {self.name}; not calling the source for another {retry_after_seconds:.1f}s",
+            retry_after_seconds=retry_after_seconds,
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                self._logger.info("Circuit closed source=%s after %s trip(s)", self.name, self._trips)
+            self._state = CLOSED
+            self._failures = 0
+            self._trips = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip()
+            elif self._state == CLOSED:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._trip()
+
+    def _trip(self) -> None:
+        # Each failed probe doubles the open period up to the cap. Jitter keeps half of it fixed so
+        # workers that tripped together do not all probe a recovering source at the same instant.
+        self._trips += 1
+        backoff = min(self.max_reset_timeout_seconds, self.reset_timeout_seconds * 2 ** (self._trips - 1))
+        open_seconds = backoff * (0.5 + 0.5 * self._jitter())
+        self._state = OPEN
+        self._failures = 0
+        self._probing = False
+        self._retry_at = self._clock() + open_seconds
+        self._logger.warning(
+            "Circuit opened source=%s trips=%s open_seconds=%.2f", self.name, self._trips, open_seconds
+        )
+
+
+@dataclass(frozen=True)
+class SourceGuard:
+    breaker: CircuitBreaker
+    limiter: TokenBucket | None = None
+
+
+def source_guard(settings: Settings) -> SourceGuard:
+    # Every client of a source in this process shares one guard, since tasks build a fresh client per run
+    # and the source's capacity and health are properties of the source, not of a client instance.
+    key = (
+        settings.api_base_url,
+        settings.orders_api_rate_limit_per_second,
+        settings.orders_api_rate_limit_burst,
+        settings.orders_api_circuit_failure_threshold,
+        settings.orders_api_circuit_reset_seconds,
+        settings.orders_api_circuit_max_reset_seconds,
+    )
+    with _GUARDS_LOCK:
+        guard = _GUARDS.get(key)
+        if guard is None:
+            limiter = None
+            if settings.orders_api_rate_limit_per_second > 0:
+                limiter = TokenBucket(
+                    rate_per_second=settings.orders_api_rate_limit_per_second,
+                    burst=settings.orders_api_rate_limit_burst,
+                )
+            guard = SourceGuard(
+                breaker=CircuitBreaker(
+                    name=settings.api_base_url,
+                    failure_threshold=settings.orders_api_circuit_failure_threshold,
+                    reset_timeout_seconds=settings.orders_api_circuit_reset_seconds,
+                    max_reset_timeout_seconds=settings.orders_api_circuit_max_reset_seconds,
+                ),
+                limiter=limiter,
+            )
+            _GUARDS[key] = guard
+        return guard
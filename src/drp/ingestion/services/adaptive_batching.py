@@ -0,0 +1,139 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from drp.config.settings import Settings
+
+_DECREASE_FACTOR = 0.5
+_ADDITIVE_STEP_FRACTION = 0.05
+_THROUGHPUT_SMOOTHING = 0.3
+
+
+@dataclass(frozen=True)
+class BatchSizing:
+    page_size: int
+    in_flight: int = 1
+
+
+class BatchSizingStore:
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._logger = logging.getLogger(__name__)
+
+    def load(self, key: str) -> BatchSizing | None:
+        try:
+            entry = json.loads(self._path.read_text(encoding="utf-8")).get(key)
+            if entry is None:
+                return None
+            return BatchSizing(page_size=int(entry["page_size"]), in_flight=int(entry["in_flight"]))
+        except FileNotFoundError:
+            return None
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            # A cold start is always safe, so unreadable state is ignored rather than fatal.
+            self._logger.warning("Ignoring unreadable batch sizing state path=%s error=%s", self._path, exc)
+            return None
+
+    def save(self, key: str, sizing: BatchSizing, throughput_rows_per_second: float) -> None:
+        # Warm-start state is an optimisation; failing to write it must never fail ingestion.
+        try:
+            try:
+                state = json.loads(self._path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                state = {}
+            state[key] = {
+                **asdict(sizing),
+                "throughput_rows_per_second": round(throughput_rows_per_second, 3),
+                "updated_at": datetime.now(UTC).isoformat(),
+            }
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+            tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(self._path)
+        except OSError as exc:
+            self._logger.warning("Failed saving batch sizing state path=%s error=%s", self._path, exc)
+
+
+class AdaptiveBatchController:
+    def __init__(
+        self,
+        initial: BatchSizing,
+        min_page_size: int,
+        max_page_size: int,
+        max_in_flight: int,
+        target_latency_seconds: float,
+        store: BatchSizingStore | None = None,
+        key: str = "default",
+    ) -> None:
+        if not 1 <= min_page_size <= max_page_size:
+            raise ValueError(f"Page size bounds must satisfy 1 <= min <= max, got {min_page_size}..{max_page_size}")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        if target_latency_seconds <= 0:
+            raise ValueError(f"target_latency_seconds must be positive, got {target_latency_seconds}")
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.max_in_flight = max_in_flight
+        self.target_latency_seconds = target_latency_seconds
+        self.throughput_rows_per_second = 0.0
+        self._page_size = min(max(initial.page_size, min_page_size), max_page_size)
+        self._in_flight = min(max(initial.in_flight, 1), max_in_flight)
+        self._step = max(1, round(max_page_size * _ADDITIVE_STEP_FRACTION))
+        self._in_flight_credit = 0.0
+        self._store = store
+        self._key = key
+
+    @classmethod
+    def from_settings(cls, settings: Settings, initial_page_size: int) -> "AdaptiveBatchController":
+        store = BatchSizingStore(settings.ingest_batch_state_path)
+        return cls(
+            initial=store.load(settings.source_system) or BatchSizing(page_size=initial_page_size),
+            min_page_size=settings.ingest_min_page_size,
+            max_page_size=settings.ingest_max_page_size,
+            max_in_flight=settings.ingest_max_in_flight,
+            target_latency_seconds=settings.ingest_target_latency_seconds,
+            store=store,
+            key=settings.source_system,
+        )
+
+    @property
+    def sizing(self) -> BatchSizing:
+        return BatchSizing(page_size=self._page_size, in_flight=self._in_flight)
+
+    def record_success(self, requested: int, rows: int, latency_seconds: float) -> BatchSizing:
+        if latency_seconds > 0:
+            rate = rows / latency_seconds
+            self.throughput_rows_per_second += _THROUGHPUT_SMOOTHING * (rate - self.throughput_rows_per_second)
+
+        if latency_seconds > self.target_latency_seconds:
+            # Multiplicative decrease in proportion to the overshoot, at most halving. Concurrency gives
+            # way before page size, the reverse of the order in which they grow.
+            factor = max(_DECREASE_FACTOR, self.target_latency_seconds / latency_seconds)
+            if self._in_flight > 1:
+                self._in_flight = max(1, int(self._in_flight * factor))
+            else:
+                self._page_size = max(self.min_page_size, int(self._page_size * factor))
+            self._in_flight_credit = 0.0
+        elif rows < requested:
+            # A short page means the source ran dry, which says nothing about how much more it could take.
+            pass
+        elif self._page_size < self.max_page_size:
+            self._page_size = min(self.max_page_size, self._page_size + self._step)
+        elif self._in_flight < self.max_in_flight:
+            # One extra request per round of in-flight responses, the additive increase of a window.
+            self._in_flight_credit += 1 / self._in_flight
+            if self._in_flight_credit >= 1:
+                self._in_flight += 1
+                self._in_flight_credit = 0.0
+        return self.sizing
+
+    def record_failure(self) -> BatchSizing:
+        self._in_flight = max(1, int(self._in_flight * _DECREASE_FACTOR))
+        self._page_size = max(self.min_page_size, int(self._page_size * _DECREASE_FACTOR))
+        self._in_flight_credit = 0.0
+        return self.sizing
+
+    def persist(self) -> None:
+        if self._store is not None:
+            self._store.save(self._key, self.sizing, self.throughput_rows_per_second)
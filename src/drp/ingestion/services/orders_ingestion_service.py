@@ -1,9 +1,21 @@
-from typing import Any
-from uuid import UUID
+import time
+from dataclasses import dataclass
+from uuid import NAMESPACE_URL, uuid5
 
 from drp.config.settings import Settings
+from drp.core.exceptions import CircuitOpenError, DataSourceError
+from drp.core.order_batch import OrderBatch
 from drp.ingestion.connectors.orders_api_client import OrdersApiClient
-from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+from drp.ingestion.services.adaptive_batching import AdaptiveBatchController
+from drp.ingestion.validation.orders_payload_validator import OrdersPayloadValidator
+from drp.storage.postgres.raw_orders_repository import IngestionCheckpoint, RawOrdersRepository
+
+
+@dataclass(frozen=True)
+class RawLoadResult:
+    inserted: int
+    quarantined: int
+    already_committed: bool = False
 
 
 class OrdersIngestionService:
@@ -12,15 +24,61 @@ class OrdersIngestionService:
         settings: Settings,
         client: OrdersApiClient,
         repository: RawOrdersRepository,
+        validator: OrdersPayloadValidator | None = None,
     ) -> None:
         self._settings = settings
         self._client = client
         self._repository = repository
+        self._validator = validator if validator is not None else OrdersPayloadValidator()
+
+    def extract(self, limit: int | None = None, cursor: int | None = None) -> OrderBatch:
+        if limit is not None or not self._settings.ingest_adaptive_batching:
+            batch_size = limit if limit is not None else self._settings.ingest_batch_size
+            return self._client.fetch_orders(limit=batch_size, cursor=cursor)
 
-    def extract(self, limit: int | None = None) -> list[dict[str, Any]]:
-        batch_size = limit if limit is not None else self._settings.ingest_batch_size
-        return self._client.fetch_orders(limit=batch_size)
+        # Each run starts from the page size the previous runs settled on and feeds its own latency back.
+        batching = AdaptiveBatchController.from_settings(self._settings, self._settings.ingest_batch_size)
+        batch_size = batching.sizing.page_size
+        started = time.monotonic()
+        try:
+            batch = self._client.fetch_orders(limit=batch_size, cursor=cursor)
+        except CircuitOpenError:
+            raise
+        except DataSourceError:
+            batching.record_failure()
+            batching.persist()
+            raise
+        batching.record_success(requested=batch_size, rows=len(batch), latency_seconds=time.monotonic() - started)
+        batching.persist()
+        return batch
 
-    def load_raw(self, records: list[dict[str, Any]], batch_id: UUID) -> int:
+    def resume_cursor(self) -> int:
         self._repository.ensure_table()
-        return self._repository.insert_raw_orders(records=records, batch_id=batch_id)
+        checkpoint = self._repository.latest_checkpoint(self._settings.source_system)
+        return 0 if checkpoint is None else checkpoint.cursor_end
+
+    def checkpoint_for(self, batch: OrderBatch, cursor: int) -> IngestionCheckpoint:
+        # Refetching the same page yields the same hash and therefore the same batch_id on every retry.
+        batch_hash = batch.content_hash()
+        cursor_end = cursor + len(batch)
+        source_system = self._settings.source_system
+        return IngestionCheckpoint(
+            source_system=source_system,
+            cursor_start=cursor,
+            cursor_end=cursor_end,
+            batch_id=uuid5(NAMESPACE_URL, f"drp:{source_system}:{cursor}:{cursor_end}:{batch_hash}"),
+            batch_hash=batch_hash,
+        )
+
+    def load_page(self, records: OrderBatch, checkpoint: IngestionCheckpoint) -> RawLoadResult:
+        if not records:
+            return RawLoadResult(inserted=0, quarantined=0)
+        result = self._validator.validate(records)
+        committed = self._repository.commit_page(
+            valid=result.valid,
+            quarantined=result.quarantined,
+            checkpoint=checkpoint,
+        )
+        if committed is None:
+            return RawLoadResult(inserted=0, quarantined=0, already_committed=True)
+        return RawLoadResult(inserted=committed.inserted, quarantined=committed.quarantined)
@@ -0,0 +1,311 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from drp.config.settings import Settings
+from drp.core.exceptions import CircuitOpenError, DataSourceError
+from drp.core.order_batch import OrderBatch
+from drp.ingestion.connectors.orders_api_client import OrdersApiClient
+from drp.ingestion.services.adaptive_batching import AdaptiveBatchController, BatchSizing
+from drp.ingestion.services.orders_ingestion_service import OrdersIngestionService
+from drp.quality.drift import BatchDriftMonitor
+from drp.storage.object_store.archive_service import ObjectStoreArchiveService
+from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+
+_END = object()
+_QUEUE_POLL_SECONDS = 0.2
+
+
+@dataclass
+class StreamingIngestionStats:
+    pages_fetched: int = 0
+    records_fetched: int = 0
+    batches_committed: int = 0
+    records_loaded: int = 0
+    records_quarantined: int = 0
+    batches_archived: int = 0
+    fetch_errors: int = 0
+    drifted_batches: int = 0
+    next_cursor: int = 0
+    page_size: int = 0
+    in_flight: int = 0
+
+    def as_metadata(self) -> dict[str, Any]:
+        return {
+            "pages_fetched": self.pages_fetched,
+            "records_fetched": self.records_fetched,
+            "batches_committed": self.batches_committed,
+            "records_loaded": self.records_loaded,
+            "records_quarantined": self.records_quarantined,
+            "batches_archived": self.batches_archived,
+            "fetch_errors": self.fetch_errors,
+            "drifted_batches": self.drifted_batches,
+            "next_cursor": self.next_cursor,
+            "page_size": self.page_size,
+            "in_flight": self.in_flight,
+        }
+
+
+class StreamingIngestionService:
+    def __init__(
+        self,
+        settings: Settings,
+        client: OrdersApiClient,
+        repository: RawOrdersRepository,
+        archive: ObjectStoreArchiveService,
+        drift_monitor: BatchDriftMonitor | None = None,
+    ) -> None:
+        self._settings = settings
+        self._client = client
+        self._repository = repository
+        self._archive = archive
+        self._drift_monitor = drift_monitor
+        self._loader = OrdersIngestionService(settings=settings, client=client, repository=repository)
+        self._logger = logging.getLogger(__name__)
+        self._errors: list[BaseException] = []
+        self._failed = threading.Event()
+
+    def run(
+        self,
+        stop_event: threading.Event,
+        max_records: int | None = None,
+        start_cursor: int | None = None,
+    ) -> StreamingIngestionStats:
+        # Without an explicit cursor, continue right after the last committed micro-batch.
+        cursor = self._loader.resume_cursor() if start_cursor is None else start_cursor
+        # Resuming skips committed micro-batches whose archival never finished, so archive those first.
+        self._archive.archive_unarchived_batches(
+            self._repository,
+            source_system=self._settings.source_system,
+            limit=self._settings.raw_archive_catchup_batches,
+        )
+        self._errors = []
+        self._failed.clear()
+        stats = StreamingIngestionStats(next_cursor=cursor)
+        batching = (
+            AdaptiveBatchController.from_settings(self._settings, self._settings.stream_page_size)
+            if self._settings.ingest_adaptive_batching
+            else None
+        )
+        fetch_queue: queue.Queue[Any] = queue.Queue(maxsize=self._settings.stream_queue_max_pages)
+        archive_queue: queue.Queue[Any] = queue.Queue(maxsize=self._settings.stream_archive_queue_max_batches)
+
+        workers = [
+            threading.Thread(
+                target=self._guard,
+                args=(stop_event, lambda: self._fetch_loop(stop_event, fetch_queue, stats, max_records, batching)),
+                name="stream-fetch",
+            ),
+            threading.Thread(
+                target=self._guard,
+                args=(stop_event, lambda: self._load_loop(fetch_queue, archive_queue, stats)),
+                name="stream-load",
+            ),
+            threading.Thread(
+                target=self._guard,
+                args=(stop_event, lambda: self._archive_loop(archive_queue, stats)),
+                name="stream-archive",
+            ),
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return stats
+
+    def _guard(self, stop_event: threading.Event, target: Callable[[], None]) -> None:
+        try:
+            target()
+        except Exception as exc:  # noqa: BLE001
+            self._logger.exception("Streaming ingestion worker failed worker=%s", threading.current_thread().name)
+            self._errors.append(exc)
+            self._failed.set()
+            stop_event.set()
+
+    def _fetch_loop(
+        self,
+        stop_event: threading.Event,
+        fetch_queue: queue.Queue[Any],
+        stats: StreamingIngestionStats,
+        max_records: int | None,
+        batching: AdaptiveBatchController | None,
+    ) -> None:
+        consecutive_errors = 0
+        sizing = BatchSizing(page_size=self._settings.stream_page_size) if batching is None else batching.sizing
+        try:
+            with ThreadPoolExecutor(
+                max_workers=1 if batching is None else batching.max_in_flight,
+                thread_name_prefix="stream-fetch",
+            ) as pool:
+                while not stop_event.is_set():
+                    if max_records is not None and stats.records_fetched >= max_records:
+                        break
+                    if batching is not None:
+                        sizing = batching.sizing
+                    # Consecutive cursor windows are requested together and consumed strictly in order.
+                    windows = _plan_windows(stats.next_cursor, sizing, stats.records_fetched, max_records)
+                    futures = [pool.submit(self._timed_fetch, limit, cursor) for cursor, limit in windows]
+                    idle = False
+                    for (cursor, limit), future in zip(windows, futures, strict=True):
+                        try:
+                            page, latency_seconds = future.result()
+                        except DataSourceError as exc:
+                            consecutive_errors += 1
+                            stats.fetch_errors += 1
+                            # A request the circuit breaker rejected never reached the source, so it is no
+                            # evidence about batch size, and the breaker says when probing is worthwhile again.
+                            circuit_open = isinstance(exc, CircuitOpenError)
+                            if batching is not None and not circuit_open:
+                                batching.record_failure()
+                            if consecutive_errors >= self._settings.stream_max_consecutive_fetch_errors:
+                                raise
+                            self._logger.warning("Stream fetch failed attempt=%s error=%s", consecutive_errors, exc)
+                            wait_seconds = self._settings.stream_idle_wait_seconds * consecutive_errors
+                            if circuit_open:
+                                wait_seconds = max(wait_seconds, exc.retry_after_seconds)
+                            stop_event.wait(wait_seconds)
+                            break
+
+                        consecutive_errors = 0
+                        if batching is not None:
+                            batching.record_success(requested=limit, rows=len(page), latency_seconds=latency_seconds)
+                        if not page:
+                            idle = True
+                            break
+                        # Blocks while the loader is behind, which is the backpressure on the source.
+                        if not self._put(fetch_queue, (cursor, page), abort=stop_event.is_set):
+                            return
+                        stats.pages_fetched += 1
+                        stats.records_fetched += len(page)
+                        stats.next_cursor += len(page)
+                        if len(page) < limit:
+                            # The source ran dry inside this window; later windows would start past its end.
+                            break
+                    if idle:
+                        stop_event.wait(self._settings.stream_idle_wait_seconds)
+        finally:
+            if batching is not None:
+                batching.persist()
+                sizing = batching.sizing
+            stats.page_size, stats.in_flight = sizing.page_size, sizing.in_flight
+            self._put(fetch_queue, _END, abort=self._failed.is_set)
+
+    def _timed_fetch(self, limit: int, cursor: int) -> tuple[OrderBatch, float]:
+        started = time.monotonic()
+        page = self._client.fetch_orders(limit=limit, cursor=cursor)
+        return page, time.monotonic() - started
+
+    def _load_loop(
+        self,
+        fetch_queue: queue.Queue[Any],
+        archive_queue: queue.Queue[Any],
+        stats: StreamingIngestionStats,
+    ) -> None:
+        max_records = self._settings.stream_commit_max_records
+        max_seconds = self._settings.stream_commit_max_seconds
+        buffer: list[OrderBatch] = []
+        buffered_rows = 0
+        buffer_cursor = 0
+        deadline = time.monotonic() + max_seconds
+        try:
+            while not self._failed.is_set():
+                timeout = _QUEUE_POLL_SECONDS
+                if buffer:
+                    timeout = min(max(deadline - time.monotonic(), 0.0), _QUEUE_POLL_SECONDS)
+                try:
+                    item = fetch_queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _END:
+                    break
+                if item is not None:
+                    page_cursor, page = item
+                    if not buffer:
+                        buffer_cursor = page_cursor
+                    buffer.append(page)
+                    buffered_rows += len(page)
+                if buffer and (buffered_rows >= max_records or time.monotonic() >= deadline):
+                    self._commit(OrderBatch.concat(buffer), buffer_cursor, archive_queue, stats)
+                    buffer, buffered_rows = [], 0
+                if not buffer:
+                    deadline = time.monotonic() + max_seconds
+            # Graceful drain: records fetched before shutdown are still committed.
+            if buffer and not self._failed.is_set():
+                self._commit(OrderBatch.concat(buffer), buffer_cursor, archive_queue, stats)
+        finally:
+            self._put(archive_queue, _END, abort=self._failed.is_set)
+
+    def _commit(
+        self,
+        records: OrderBatch,
+        cursor: int,
+        archive_queue: queue.Queue[Any],
+        stats: StreamingIngestionStats,
+    ) -> None:
+        # Fetched pages are contiguous, so the micro-batch covers one source range and commits with its checkpoint.
+        checkpoint = self._loader.checkpoint_for(records, cursor=cursor)
+        batch_id = checkpoint.batch_id
+        loaded = self._loader.load_page(records=records, checkpoint=checkpoint)
+        stats.batches_committed += 1
+        stats.records_loaded += loaded.inserted
+        stats.records_quarantined += loaded.quarantined
+        if self._drift_monitor is not None and self._drift_monitor.observe(batch_id=batch_id, records=records).findings:
+            stats.drifted_batches += 1
+        self._logger.info(
+            "Committed micro-batch batch_id=%s records=%s quarantined=%s",
+            batch_id,
+            loaded.inserted,
+            loaded.quarantined,
+        )
+        # Blocks while archival is behind; committed batches are archived even during shutdown.
+        self._put(archive_queue, (batch_id, records), abort=self._failed.is_set)
+
+    def _archive_loop(self, archive_queue: queue.Queue[Any], stats: StreamingIngestionStats) -> None:
+        while not self._failed.is_set():
+            try:
+                item = archive_queue.get(timeout=_QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if item is _END:
+                return
+            batch_id, records = item
+            if self._archive.archive_raw_batch(batch_id=str(batch_id), records=records) is not None:
+                self._repository.mark_archived(batch_id)
+            stats.batches_archived += 1
+
+    @staticmethod
+    def _put(target: queue.Queue[Any], item: Any, abort: Callable[[], bool]) -> bool:
+        while not abort():
+            try:
+                target.put(item, timeout=_QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+def _plan_windows(
+    cursor: int,
+    sizing: BatchSizing,
+    records_fetched: int,
+    max_records: int | None,
+) -> list[tuple[int, int]]:
+    windows = []
+    for _ in range(sizing.in_flight):
+        limit = sizing.page_size
+        if max_records is not None:
+            limit = min(limit, max_records - records_fetched)
+        if limit <= 0:
+            break
+        windows.append((cursor, limit))
+        cursor += limit
+        records_fetched += limit
+    return windows
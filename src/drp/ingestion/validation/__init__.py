@@ -0,0 +1 @@
+"""Ingestion payload validation."""
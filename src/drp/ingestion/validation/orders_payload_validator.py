@@ -0,0 +1,149 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from drp.core.order_batch import QUARANTINE_REASONS_COLUMN, OrderBatch, to_utc_timestamps
+from drp.datasets.registry import ORDERS, DatasetSpec
+
+_NUMBER_PATTERN = r"^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?\s*$"
+# Raw numbers land in NUMERIC(12, 2) columns; a larger value would abort the page's COPY instead of one row.
+_NUMBER_LIMIT = 10.0**10
+_SEPARATOR = "; "
+_TIMESTAMP_PATTERN = r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d{1,9})?)?(Z|[+-]\d{2}:?\d{2})?$"
+
+
+@dataclass(frozen=True)
+class PayloadValidationResult:
+    valid: OrderBatch
+    quarantined: OrderBatch
+
+    @property
+    def valid_count(self) -> int:
+        return len(self.valid)
+
+    @property
+    def quarantined_count(self) -> int:
+        return len(self.quarantined)
+
+
+class OrdersPayloadValidator:
+    def __init__(self, dataset: DatasetSpec = ORDERS) -> None:
+        self._dataset = dataset
+
+    def validate(self, records: OrderBatch | Sequence[Mapping[str, Any]]) -> PayloadValidationResult:
+        batch = records if isinstance(records, OrderBatch) else OrderBatch.from_records(records)
+        num_rows = len(batch)
+        parsed: dict[str, pa.Array] = {}
+        reasons: list[pa.Array] = []
+        for field in self._dataset.source_schema:
+            required = field.name in self._dataset.required_columns
+            column = batch.column(field.name).combine_chunks() if field.name in batch.column_names else None
+            if column is None:
+                if required:
+                    reasons.append(pa.array([f"missing {field.name}{_SEPARATOR}"] * num_rows, type=pa.string()))
+                continue
+            values, problems = _parser(field.type)(field, column, required)
+            parsed[field.name] = values
+            reasons.append(problems)
+        # Postgres text and JSONB cannot hold NUL, and every column is kept in the raw payload.
+        for name in batch.column_names:
+            column = batch.column(name).combine_chunks()
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                reasons.append(_reason(pc.match_substring(column, "\x00"), f"NUL character in {name}"))
+
+        # Each check yields "reason; " or ""; concatenated, a row's reasons are empty only if it is valid.
+        joined = pc.utf8_rtrim(pc.binary_join_element_wise(*reasons, ""), characters=_SEPARATOR)
+        invalid = pc.not_equal(joined, "")
+        valid_mask = pc.invert(invalid)
+
+        valid = batch
+        for name, values in parsed.items():
+            valid = valid.with_column(name, values)
+        quarantined = batch.filter(invalid).with_column(QUARANTINE_REASONS_COLUMN, joined.filter(invalid))
+        return PayloadValidationResult(valid=valid.filter(valid_mask), quarantined=quarantined)
+
+
+def _parse_identifier(field: pa.Field, column: pa.Array, required: bool) -> tuple[pa.Array, pa.Array]:
+    name = field.name
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type) or pa.types.is_integer(column.type):
+        values = pc.cast(column, pa.string())
+    elif pa.types.is_null(column.type):
+        values = pa.nulls(len(column), pa.string())
+    else:
+        return pa.nulls(len(column), pa.string()), _reason(pc.is_valid(column), f"invalid {name} type")
+    blank = pc.equal(pc.utf8_trim_whitespace(values), "")
+    missing = pc.or_(pc.is_null(values), pc.fill_null(blank, False))
+    return values, _reason(missing, f"missing {name}", required)
+
+
+def _parse_number(field: pa.Field, column: pa.Array, required: bool) -> tuple[pa.Array, pa.Array]:
+    name = field.name
+    missing = pc.is_null(column)
+    if pa.types.is_integer(column.type) or pa.types.is_floating(column.type) or pa.types.is_decimal(column.type):
+        values = pc.cast(column, pa.float64())
+        unparsable = pc.invert(pc.fill_null(pc.is_finite(values), True))
+    elif pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        numeric = pc.fill_null(pc.match_substring_regex(column, _NUMBER_PATTERN), False)
+        values = pc.cast(pc.utf8_trim_whitespace(pc.if_else(numeric, column, None)), pa.float64())
+        unparsable = pc.and_(pc.invert(numeric), pc.is_valid(column))
+    else:
+        values = pa.nulls(len(column), pa.float64())
+        unparsable = pc.is_valid(column)
+    out_of_range = pc.greater_equal(pc.abs(pc.round(values, 2)), _NUMBER_LIMIT)
+    return values, _merge(
+        _merge(_reason(missing, f"missing {name}", required), _reason(unparsable, f"non-numeric {name}")),
+        _reason(out_of_range, f"out-of-range {name}"),
+    )
+
+
+def _parse_timestamp(field: pa.Field, column: pa.Array, required: bool) -> tuple[pa.Array, pa.Array]:
+    name, target = field.name, field.type
+    missing = pc.is_null(column)
+    if pa.types.is_timestamp(column.type):
+        return to_utc_timestamps(column, target), _reason(missing, f"missing {name}", required)
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        unparsable = pc.is_valid(column)
+        return pa.nulls(len(column), target), _merge(
+            _reason(missing, f"missing {name}", required), _reason(unparsable, f"invalid {name}")
+        )
+
+    shaped = pc.fill_null(pc.match_substring_regex(column, _TIMESTAMP_PATTERN), False)
+    candidates = pc.if_else(shaped, column, None)
+    try:
+        values = to_utc_timestamps(candidates, target)
+    except pa.ArrowInvalid:
+        # Rare: well-shaped but impossible values (month 13, hour 25); isolate them row by row.
+        values = pa.array([_parse_one(value, target) for value in candidates.to_pylist()], type=target)
+    unparsable = pc.and_(pc.is_valid(column), pc.is_null(values))
+    return values, _merge(_reason(missing, f"missing {name}", required), _reason(unparsable, f"invalid {name}"))
+
+
+def _parse_one(value: str | None, target: pa.DataType) -> Any:
+    if value is None:
+        return None
+    try:
+        return to_utc_timestamps(pa.array([value]), target)[0].as_py()
+    except pa.ArrowInvalid:
+        return None
+
+
+def _reason(mask: pa.Array, reason: str, applies: bool = True) -> pa.Array:
+    if not applies:
+        mask = pa.nulls(len(mask), pa.bool_())
+    return pc.if_else(pc.fill_null(mask, False), f"{reason}{_SEPARATOR}", "")
+
+
+def _merge(first: pa.Array, second: pa.Array) -> pa.Array:
+    return pc.binary_join_element_wise(first, second, "")
+
+
+def _parser(data_type: pa.DataType) -> Any:
+    # Columns are parsed by their declared type, so a dataset's schema is all the validator needs.
+    if pa.types.is_timestamp(data_type):
+        return _parse_timestamp
+    if pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type):
+        return _parse_number
+    return _parse_identifier
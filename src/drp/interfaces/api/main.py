@@ -1,10 +1,69 @@
+import io
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict
 from datetime import UTC, datetime
-from random import Random
+from typing import Literal
 
-from fastapi import FastAPI, Query
+import pyarrow as pa
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from drp.synthetic.orders_generator import (
+    LOAD_PROFILES,
+    SOURCE_ARROW_SCHEMA,
+    SyntheticOrdersGenerator,
+    get_load_profile,
+)
 
 app = FastAPI(title="DRP Data Generator API", version="0.1.0")
-_rng = Random(42)
+_logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MAX_STREAM_ROWS = 50_000_000
+GENERATOR_CUSTOMER_COUNT = 200
+DEFAULT_ORDER_INTERVAL_MS = 1_000
+# A fixed epoch rather than "today", so a (seed, cursor) page is the same rows whenever it is requested.
+DEFAULT_START_AT = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+class StreamStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._streams_completed = 0
+        self._rows_total = 0
+        self._seconds_total = 0.0
+        self._last: dict[str, object] | None = None
+
+    def record(self, rows: int, seconds: float, stream_format: str, completed: bool) -> None:
+        rows_per_sec = round(rows / seconds, 2) if seconds > 0 else 0.0
+        with self._lock:
+            self._streams_completed += int(completed)
+            self._rows_total += rows
+            self._seconds_total += seconds
+            self._last = {
+                "rows": rows,
+                "seconds": round(seconds, 6),
+                "rows_per_sec": rows_per_sec,
+                "format": stream_format,
+                "completed": completed,
+            }
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            overall = self._rows_total / self._seconds_total if self._seconds_total > 0 else 0.0
+            return {
+                "streams_completed": self._streams_completed,
+                "rows_total": self._rows_total,
+                "rows_per_sec": round(overall, 2),
+                "last_stream": self._last,
+            }
+
+
+_stream_stats = StreamStats()
 
 
 @app.get("/health")
@@ -12,16 +71,147 @@ def health() -> dict[str, str]:
     return {"status": "ok", "service": "api-generator"}
 
 
+@app.get("/v1/profiles")
+def list_profiles() -> dict[str, object]:
+    return {"profiles": {name: asdict(profile) for name, profile in LOAD_PROFILES.items()}}
+
+
 @app.get("/v1/orders")
-def get_orders(limit: int = Query(default=100, ge=1, le=1000)) -> dict[str, object]:
-    orders: list[dict[str, object]] = []
-    for idx in range(limit):
-        orders.append(
-            {
-                "order_id": f"ord_{idx + 1:06d}",
-                "customer_id": f"cus_{_rng.randint(1, 200):05d}",
-                "amount": round(_rng.uniform(5, 500), 2),
-                "created_at": datetime.now(UTC).isoformat(),
-            }
+def get_orders(
+    limit: int = Query(default=100, ge=1, le=1000),
+    seed: int = Query(default=42),
+    cursor: int = Query(default=0, ge=0),
+    profile: str = Query(default="steady"),
+    start_at: datetime | None = Query(default=None),
+    interval_ms: int = Query(default=DEFAULT_ORDER_INTERVAL_MS, ge=1),
+) -> dict[str, object]:
+    resolved_start = _resolve_start(start_at)
+    generator = _build_generator(
+        rows=cursor + limit,
+        seed=seed,
+        profile=profile,
+        start_at=resolved_start,
+        interval_ms=interval_ms,
+    )
+    records = generator.page(cursor=cursor, size=limit).to_source_records()
+    return {
+        "records": records,
+        "count": len(records),
+        "seed": seed,
+        "profile": profile,
+        "start_at": resolved_start.isoformat(),
+        "cursor": cursor,
+        "next_cursor": cursor + len(records),
+    }
+
+
+@app.get("/v1/orders/stream")
+def stream_orders(
+    rows: int = Query(default=100_000, ge=1, le=MAX_STREAM_ROWS),
+    seed: int = Query(default=42),
+    cursor: int = Query(default=0, ge=0),
+    profile: str = Query(default="steady"),
+    start_at: datetime | None = Query(default=None),
+    interval_ms: int = Query(default=DEFAULT_ORDER_INTERVAL_MS, ge=1),
+    chunk_size: int = Query(default=50_000, ge=1, le=1_000_000),
+    stream_format: Literal["ndjson", "arrow"] = Query(default="ndjson", alias="format"),
+) -> StreamingResponse:
+    resolved_start = _resolve_start(start_at)
+    generator = _build_generator(
+        rows=cursor + rows,
+        seed=seed,
+        profile=profile,
+        start_at=resolved_start,
+        interval_ms=interval_ms,
+    )
+    if stream_format == "arrow":
+        body, media_type = _arrow_stream(generator, chunk_size, cursor), ARROW_STREAM_MEDIA_TYPE
+    else:
+        body, media_type = _ndjson_stream(generator, chunk_size, cursor), NDJSON_MEDIA_TYPE
+
+    return StreamingResponse(
+        _timed(body, stream_format=stream_format),
+        media_type=media_type,
+        headers={
+            "X-Stream-Rows": str(rows),
+            "X-Stream-Seed": str(seed),
+            "X-Stream-Profile": profile,
+            "X-Stream-Start-At": resolved_start.isoformat(),
+            "X-Stream-Cursor": str(cursor),
+            "X-Stream-Next-Cursor": str(cursor + rows),
+        },
+    )
+
+
+@app.get("/v1/orders/stream/stats")
+def stream_stats() -> dict[str, object]:
+    return _stream_stats.snapshot()
+
+
+def _build_generator(
+    rows: int,
+    seed: int,
+    profile: str,
+    start_at: datetime,
+    interval_ms: int,
+) -> SyntheticOrdersGenerator:
+    try:
+        load_profile = get_load_profile(profile)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    config = load_profile.to_config(
+        rows=rows,
+        seed=seed,
+        start_at=start_at,
+        order_interval_us=interval_ms * 1_000,
+        customer_count=GENERATOR_CUSTOMER_COUNT,
+    )
+    return SyntheticOrdersGenerator(config)
+
+
+def _ndjson_stream(generator: SyntheticOrdersGenerator, chunk_size: int, cursor: int) -> Iterator[tuple[bytes, int]]:
+    for chunk in generator.iter_chunks(chunk_size, start=cursor):
+        yield chunk.to_ndjson(), len(chunk)
+
+
+def _arrow_stream(generator: SyntheticOrdersGenerator, chunk_size: int, cursor: int) -> Iterator[tuple[bytes, int]]:
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, SOURCE_ARROW_SCHEMA) as writer:
+        for chunk in generator.iter_chunks(chunk_size, start=cursor):
+            writer.write_batch(chunk.to_arrow())
+            yield _drain(sink), len(chunk)
+    yield _drain(sink), 0
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    payload = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return payload
+
+
+def _timed(body: Iterator[tuple[bytes, int]], stream_format: str) -> Iterator[bytes]:
+    started = time.perf_counter()
+    sent_rows = 0
+    completed = False
+    try:
+        for payload, rows in body:
+            yield payload
+            sent_rows += rows
+        completed = True
+    finally:
+        elapsed = time.perf_counter() - started
+        _stream_stats.record(rows=sent_rows, seconds=elapsed, stream_format=stream_format, completed=completed)
+        _logger.info(
+            "Order stream finished format=%s rows=%s seconds=%.3f completed=%s",
+            stream_format,
+            sent_rows,
+            elapsed,
+            completed,
         )
-    return {"records": orders, "count": len(orders)}
+
+
+def _resolve_start(start_at: datetime | None) -> datetime:
+    if start_at is None:
+        return DEFAULT_START_AT
+    return start_at.replace(tzinfo=UTC) if start_at.tzinfo is None else start_at.astimezone(UTC)
@@ -0,0 +1,93 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
+
+from drp.config.settings import Settings, get_settings
+from drp.core.exceptions import StorageError
+from drp.core.ttl_cache import TtlLruCache
+from drp.storage.duckdb.warehouse_access import metrics_version
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+
+app = FastAPI(title="DRP Metrics API", version="0.1.0")
+
+JSON_MEDIA_TYPE = "application/json"
+MAX_RANGE_DAYS = 3_660
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    body: bytes
+
+
+_cache: TtlLruCache[tuple[str, date, date], CachedResponse] = TtlLruCache(
+    max_entries=get_settings().metrics_cache_max_entries,
+    ttl_seconds=get_settings().metrics_cache_ttl_seconds,
+)
+
+
+@app.get("/health")
+def health() -> dict[str, str]:
+    return {"status": "ok", "service": "api-metrics"}
+
+
+@app.get("/v1/metrics/daily")
+def get_daily_metrics(
+    start: date = Query(),
+    end: date = Query(),
+    if_none_match: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings),
+) -> Response:
+    if end < start:
+        raise HTTPException(status_code=422, detail="end must not be before start")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=422, detail=f"date range is limited to {MAX_RANGE_DAYS} days")
+
+    # The version marker changes whenever metrics are refreshed, so it keys both the cache and the ETag.
+    version = metrics_version(settings.duckdb_path)
+    key = (version, start, end)
+    cached = _cache.get(key)
+    if cached is None:
+        cached = _render(settings, version, start, end)
+        _cache.put(key, cached)
+
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "X-Metrics-Version": version}
+    if if_none_match is not None and _etag_matches(cached.etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+@app.get("/v1/metrics/cache")
+def cache_stats() -> dict[str, int]:
+    return {"entries": len(_cache), "hits": _cache.hits, "misses": _cache.misses}
+
+
+def _render(settings: Settings, version: str, start: date, end: date) -> CachedResponse:
+    try:
+        rows = DuckDbWarehouseRepository(settings).read_daily_metrics(start=start, end=end)
+    except StorageError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"}) from exc
+
+    payload = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "version": version,
+        "count": len(rows),
+        "metrics": rows,
+    }
+    body = json.dumps(payload, separators=(",", ":"), default=_json_default).encode("utf-8")
+    return CachedResponse(etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', body=body)
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _json_default(value: object) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
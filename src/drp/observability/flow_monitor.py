@@ -2,11 +2,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-from prefect.runtime import flow_run
-
 from drp.config.settings import Settings
 from drp.observability.alerting import AlertNotifier
 from drp.observability.run_audit_repository import FlowAuditRepository, utc_now
+from drp.observability.task_profiler import current_flow_run_id, profile_artifacts, profile_dir
+from drp.storage.object_store.archive_service import ObjectStoreArchiveService
 
 
 @dataclass(frozen=True)
@@ -23,8 +23,7 @@ class FlowMonitor:
         self._notifier = AlertNotifier(settings)
 
     def start(self, flow_name: str) -> FlowExecutionContext:
-        run_id = getattr(flow_run, "id", None)
-        flow_run_id = str(run_id or "local-manual-run")
+        flow_run_id = current_flow_run_id()
         started_at = utc_now()
         return FlowExecutionContext(flow_name=flow_name, flow_run_id=flow_run_id, started_at=started_at.isoformat())
 
@@ -38,13 +37,14 @@ class FlowMonitor:
             started_at=started,
             ended_at=ended,
             records_processed=records_processed,
-            metadata=metadata,
+            metadata=self._with_profile(ctx, metadata),
         )
 
     def failure(self, ctx: FlowExecutionContext, error: Exception, metadata: dict[str, Any]) -> None:
         started = _parse_dt(ctx.started_at)
         ended = utc_now()
         error_message = str(error)
+        metadata = self._with_profile(ctx, metadata)
         self._audit_repo.insert_audit_event(
             flow_name=ctx.flow_name,
             flow_run_id=ctx.flow_run_id,
@@ -62,6 +62,15 @@ class FlowMonitor:
             metadata=metadata,
         )
 
+    def _with_profile(self, ctx: FlowExecutionContext, metadata: dict[str, Any]) -> dict[str, Any]:
+        artifacts = profile_artifacts(self._settings, ctx.flow_run_id)
+        if not artifacts:
+            return metadata
+        archive = ObjectStoreArchiveService(self._settings)
+        uri = archive.archive_profiles(flow_run_id=ctx.flow_run_id, artifacts=artifacts)
+        # Without an object store the local directory is still a usable reference on the worker.
+        return {**metadata, "profile_uri": uri or str(profile_dir(self._settings, ctx.flow_run_id))}
+
 
 def _parse_dt(iso_value: str) -> datetime:
     return datetime.fromisoformat(iso_value)
@@ -0,0 +1,74 @@
+import os
+import resource
+import sys
+import threading
+from types import TracebackType
+from typing import Self
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_STATM_PATH = "/proc/self/statm"
+
+
+def current_rss_bytes() -> int:
+    try:
+        with open(_STATM_PATH, encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return max_rss_bytes()
+
+
+def max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+class PeakRssSampler:
+    def __init__(self, interval_seconds: float = 0.01) -> None:
+        self._interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._peak_rss_bytes = 0
+        self._start_rss_bytes = 0
+
+    @property
+    def peak_rss_bytes(self) -> int:
+        return self._peak_rss_bytes
+
+    @property
+    def start_rss_bytes(self) -> int:
+        return self._start_rss_bytes
+
+    def start(self) -> None:
+        self._start_rss_bytes = current_rss_bytes()
+        self._peak_rss_bytes = self._start_rss_bytes
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="peak-rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sample()
+        return self._peak_rss_bytes
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_seconds):
+            self._sample()
+
+    def _sample(self) -> None:
+        self._peak_rss_bytes = max(self._peak_rss_bytes, current_rss_bytes())
@@ -1,11 +1,9 @@
 from datetime import UTC, datetime
 from typing import Any
 
-import psycopg
-from psycopg.types.json import Json
-
 from drp.config.settings import Settings
 from drp.core.exceptions import StorageError
+from drp.storage.postgres.connection import connect, json_param
 
 
 class FlowAuditRepository:
@@ -31,7 +29,7 @@ class FlowAuditRepository:
         );
         """
         try:
-            with psycopg.connect(self._settings.postgres_dsn) as conn:
+            with connect(self._settings.postgres_dsn) as conn:
                 with conn.cursor() as cur:
                     cur.execute(statement)
                 conn.commit()
@@ -69,7 +67,7 @@ class FlowAuditRepository:
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         try:
-            with psycopg.connect(self._settings.postgres_dsn) as conn:
+            with connect(self._settings.postgres_dsn) as conn:
                 with conn.cursor() as cur:
                     cur.execute(
                         statement,
@@ -81,7 +79,7 @@ class FlowAuditRepository:
                             ended_at,
                             duration_seconds,
                             records_processed,
-                            Json(metadata),
+                            json_param(metadata),
                             error_message,
                         ),
                     )
@@ -0,0 +1,160 @@
+import cProfile
+import functools
+import io
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from types import FrameType, TracebackType
+from typing import ParamSpec, Self, TypeVar
+
+from prefect.runtime import flow_run, task_run
+
+from drp.config.settings import Settings, get_settings
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_STATS_LIMIT = 60
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+# Since Python 3.12 one cProfile may be active per process and it records every thread, so a single task
+# holds it at a time; tasks that overlap it are profiled by the per-thread stack sampler alone.
+_CPROFILE_LOCK = threading.Lock()
+_ACTIVE: set["TaskProfiler"] = set()
+_ACTIVE_GUARD = threading.Lock()
+
+
+def current_flow_run_id() -> str:
+    return str(getattr(flow_run, "id", None) or "local-manual-run")
+
+
+def profiling_requested(settings: Settings) -> bool:
+    # The flow parameter opts a single run in; the setting turns profiling on for every run.
+    parameters = getattr(flow_run, "parameters", None) or {}
+    return bool(parameters.get("profile")) or settings.profiling_enabled
+
+
+def profile_dir(settings: Settings, flow_run_id: str) -> Path:
+    return Path(settings.profile_output_dir) / f"flow_run_id={flow_run_id}"
+
+
+class TaskProfiler:
+    def __init__(self, output_dir: Path, name: str, sample_interval_seconds: float = 0.005) -> None:
+        self._output_dir = output_dir
+        self._name = _UNSAFE_NAME.sub("_", name)
+        self._interval_seconds = sample_interval_seconds
+        self._profile = cProfile.Profile()
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._thread_id = 0
+        self._root: FrameType | None = None
+        self._profiling = False
+        self._overlapped = False
+
+    def __enter__(self) -> Self:
+        self._thread_id = threading.get_ident()
+        self._root = sys._getframe(1)
+        with _ACTIVE_GUARD:
+            _ACTIVE.add(self)
+            if len(_ACTIVE) > 1:
+                for profiler in _ACTIVE:
+                    profiler._overlapped = True
+        self._profiling = _CPROFILE_LOCK.acquire(blocking=False)
+        if self._profiling:
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler (a debugger, coverage) owns the process-wide hook.
+                _CPROFILE_LOCK.release()
+                self._profiling = False
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name=f"profile-{self._name}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._profiling:
+            self._profile.disable()
+            _CPROFILE_LOCK.release()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        with _ACTIVE_GUARD:
+            _ACTIVE.discard(self)
+        self.write()
+
+    def write(self) -> list[Path]:
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        folded_path = self._output_dir / f"{self._name}.folded"
+        # Collapsed stacks ("a;b;c count") feed flamegraph.pl, speedscope and inferno directly.
+        folded = "".join(f"{stack} {count}\n" for stack, count in sorted(self._stacks.items()))
+        folded_path.write_text(folded, encoding="utf-8")
+        if not self._profiling:
+            return [folded_path]
+
+        stats_path = self._output_dir / f"{self._name}.pstats"
+        text_path = self._output_dir / f"{self._name}.stats.txt"
+        self._profile.dump_stats(str(stats_path))
+        report = io.StringIO()
+        if self._overlapped and sys.version_info >= (3, 12):
+            report.write("Other profiled tasks ran meanwhile; these function stats include their calls.\n")
+        stats = pstats.Stats(self._profile, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_STATS_LIMIT)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(_STATS_LIMIT)
+        text_path.write_text(report.getvalue(), encoding="utf-8")
+        return [stats_path, text_path, folded_path]
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_seconds):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = self._collapse(frame)
+            if stack:
+                self._stacks[stack] += 1
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        labels = []
+        while frame is not None and frame is not self._root:
+            if frame.f_code in _PROFILER_CODE:
+                # Caught while the profiler itself was entering or leaving; not task time.
+                return ""
+            labels.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+_PROFILER_CODE = frozenset({TaskProfiler.__enter__.__code__, TaskProfiler.__exit__.__code__})
+
+
+def profiled(fn: Callable[P, R]) -> Callable[P, R]:
+    @functools.wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        settings = get_settings()
+        if not profiling_requested(settings):
+            return fn(*args, **kwargs)
+        name = getattr(task_run, "name", None) or fn.__name__
+        with TaskProfiler(
+            output_dir=profile_dir(settings, current_flow_run_id()),
+            name=str(name),
+            sample_interval_seconds=settings.profile_sample_interval_seconds,
+        ):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def profile_artifacts(settings: Settings, flow_run_id: str) -> list[Path]:
+    directory = profile_dir(settings, flow_run_id)
+    if not directory.is_dir():
+        return []
+    return sorted(path for path in directory.iterdir() if path.is_file())
+
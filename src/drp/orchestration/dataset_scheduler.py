@@ -0,0 +1,92 @@
+import contextvars
+import logging
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from drp.config.settings import Settings
+from drp.datasets.registry import DatasetSpec
+
+POSTGRES = "postgres"
+WAREHOUSE = "warehouse"
+OBJECT_STORE = "object_store"
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    postgres_connections: int
+    warehouse_slots: int
+    object_store_slots: int
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResourceLimits":
+        return cls(
+            postgres_connections=settings.dataset_postgres_connections,
+            warehouse_slots=settings.dataset_warehouse_slots,
+            object_store_slots=settings.dataset_object_store_slots,
+        )
+
+
+class SharedResources:
+    def __init__(self, limits: ResourceLimits) -> None:
+        self._slots = {
+            POSTGRES: threading.BoundedSemaphore(max(limits.postgres_connections, 1)),
+            WAREHOUSE: threading.BoundedSemaphore(max(limits.warehouse_slots, 1)),
+            OBJECT_STORE: threading.BoundedSemaphore(max(limits.object_store_slots, 1)),
+        }
+
+    @contextmanager
+    def hold(self, name: str) -> Iterator[None]:
+        # Datasets run side by side but queue here for the backends they share, so adding a source
+        # never multiplies the connections or writers a backend sees.
+        slot = self._slots[name]
+        slot.acquire()
+        try:
+            yield
+        finally:
+            slot.release()
+
+
+@dataclass(frozen=True)
+class DatasetRun:
+    dataset: str
+    succeeded: bool
+    result: Any = None
+    error: str | None = None
+
+
+class DatasetScheduler:
+    def __init__(self, settings: Settings, resources: SharedResources | None = None) -> None:
+        self._settings = settings
+        self._resources = (
+            resources if resources is not None else SharedResources(ResourceLimits.from_settings(settings))
+        )
+        self._logger = logging.getLogger(__name__)
+
+    def run(
+        self,
+        work: Callable[[DatasetSpec, SharedResources], Any],
+        datasets: Sequence[DatasetSpec],
+    ) -> list[DatasetRun]:
+        if not datasets:
+            return []
+        workers = max(1, min(self._settings.dataset_max_concurrency, len(datasets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drp-dataset") as executor:
+            # Each worker runs in a copy of the caller's context so orchestration state (e.g. the
+            # active flow run) is visible to the work it executes.
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._run_one, work, dataset)
+                for dataset in datasets
+            ]
+            return [future.result() for future in futures]
+
+    def _run_one(self, work: Callable[[DatasetSpec, SharedResources], Any], dataset: DatasetSpec) -> DatasetRun:
+        # One failing source must not hold back the others; its failure is reported with the run.
+        try:
+            return DatasetRun(dataset=dataset.name, succeeded=True, result=work(dataset, self._resources))
+        except Exception as exc:  # noqa: BLE001
+            self._logger.exception("Dataset run failed dataset=%s", dataset.name)
+            return DatasetRun(dataset=dataset.name, succeeded=False, error=str(exc))
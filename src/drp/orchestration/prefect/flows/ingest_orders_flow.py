@@ -1,84 +1,176 @@
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from prefect import flow, get_run_logger, task
+from prefect.tasks import exponential_backoff
 
 from drp.config.settings import get_settings
+from drp.core.exceptions import CircuitOpenError
 from drp.core.logging import configure_logging
 from drp.ingestion.connectors.orders_api_client import OrdersApiClient
-from drp.ingestion.services.orders_ingestion_service import OrdersIngestionService
+from drp.ingestion.services.orders_ingestion_service import OrdersIngestionService, RawLoadResult
 from drp.observability.flow_monitor import FlowMonitor
+from drp.observability.task_profiler import profiled
+from drp.quality.drift import BatchDriftMonitor, DriftReport
+from drp.storage.local.batch_spool import ArrowBatchSpool, BatchHandle
 from drp.storage.object_store.archive_service import ObjectStoreArchiveService
-from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+from drp.storage.postgres.raw_orders_repository import IngestionCheckpoint, RawOrdersRepository
 
 
-@task(name="extract-orders", retries=2, retry_delay_seconds=10)
-def extract_orders(limit: int | None = None) -> list[dict]:
+def source_may_recover(task, task_run, state) -> bool:  # type: ignore[no-untyped-def]
+    # With the circuit open the source is known to be down; the next scheduled run probes it instead.
+    return not isinstance(state.result(raise_on_failure=False), CircuitOpenError)
+
+
+@task(
+    name="extract-orders",
+    retries=3,
+    retry_delay_seconds=exponential_backoff(backoff_factor=2),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=source_may_recover,
+)
+@profiled
+def extract_orders(limit: int | None = None) -> tuple[BatchHandle, IngestionCheckpoint]:
     settings = get_settings()
     service = OrdersIngestionService(
         settings=settings,
         client=OrdersApiClient(settings),
         repository=RawOrdersRepository(settings),
     )
-    return service.extract(limit=limit)
+    # Resume after the last committed page; a retry refetches the same page and gets the same identity.
+    cursor = service.resume_cursor()
+    batch = service.extract(limit=limit, cursor=cursor)
+    checkpoint = service.checkpoint_for(batch, cursor=cursor)
+    handle = ArrowBatchSpool(settings).write_batch(batch, name=f"source-{checkpoint.batch_id}")
+    return handle, checkpoint
 
 
 @task(name="load-raw-orders")
-def load_raw_orders(records: list[dict], batch_id: str) -> int:
+@profiled
+def load_raw_orders(batch: BatchHandle, checkpoint: IngestionCheckpoint) -> RawLoadResult:
     settings = get_settings()
     service = OrdersIngestionService(
         settings=settings,
         client=OrdersApiClient(settings),
         repository=RawOrdersRepository(settings),
     )
-    return service.load_raw(records=records, batch_id=UUID(batch_id))
+    records = ArrowBatchSpool(settings).open_batch(batch)
+    return service.load_page(records=records, checkpoint=checkpoint)
+
+
+@task(name="profile-raw-batch", retries=2, retry_delay_seconds=5)
+@profiled
+def profile_raw_batch(batch_id: str, batch: BatchHandle) -> DriftReport:
+    settings = get_settings()
+    records = ArrowBatchSpool(settings).open_batch(batch)
+    return BatchDriftMonitor(settings).observe(batch_id=UUID(batch_id), records=records)
 
 
-@task(name="archive-raw-batch")
-def archive_raw_batch(batch_id: str, records: list[dict]) -> str | None:
+@task(
+    name="archive-raw-batch",
+    retries=3,
+    retry_delay_seconds=exponential_backoff(backoff_factor=2),
+    retry_jitter_factor=0.5,
+)
+@profiled
+def archive_raw_batch(batch_id: str, batch: BatchHandle) -> str | None:
     settings = get_settings()
     archive = ObjectStoreArchiveService(settings=settings)
-    return archive.archive_raw_batch(batch_id=batch_id, records=records)
+    records = ArrowBatchSpool(settings).open_batch(batch)
+    uri = archive.archive_raw_batch(batch_id=batch_id, records=records)
+    if uri is not None:
+        RawOrdersRepository(settings).mark_archived(UUID(batch_id))
+    return uri
+
+
+@task(name="archive-unarchived-batches", retries=2, retry_delay_seconds=5)
+@profiled
+def archive_unarchived_batches() -> list[str]:
+    settings = get_settings()
+    return ObjectStoreArchiveService(settings=settings).archive_unarchived_batches(
+        RawOrdersRepository(settings),
+        source_system=settings.source_system,
+        limit=settings.raw_archive_catchup_batches,
+    )
 
 
 @flow(name="ingest-orders-to-raw")
-def ingest_orders_to_raw_flow(limit: int | None = None) -> dict[str, str | int | None]:
+def ingest_orders_to_raw_flow(
+    limit: int | None = None,
+    profile: bool = False,
+) -> dict[str, str | int | bool | None]:
     configure_logging(service_name="drp-pipeline")
     settings = get_settings()
     logger = get_run_logger()
     monitor = FlowMonitor(settings)
     ctx = monitor.start(flow_name="ingest-orders-to-raw")
-    batch_id = str(uuid4())
     source_limit = limit if limit is not None else settings.ingest_batch_size
 
-    logger.info("Starting ingestion batch batch_id=%s", batch_id)
+    logger.info("Starting ingestion limit=%s", source_limit)
+    batch: BatchHandle | None = None
+    checkpoint: IngestionCheckpoint | None = None
     try:
-        records = extract_orders(limit=limit)
-        inserted_count = load_raw_orders(records=records, batch_id=batch_id)
-        archive_uri = archive_raw_batch(batch_id=batch_id, records=records)
+        batch, checkpoint = extract_orders(limit=limit)
+        batch_id = str(checkpoint.batch_id)
+        load_result = load_raw_orders(batch=batch, checkpoint=checkpoint)
+        inserted_count = load_result.inserted
+        drifted_columns = None
+        if settings.column_profiling_enabled:
+            # Profiles are keyed by batch, so a replayed batch is checked again but stored once.
+            drifted_columns = profile_raw_batch(batch_id=batch_id, batch=batch).drifted_columns
+        archive_uri = archive_raw_batch(batch_id=batch_id, batch=batch)
+        # Also archives earlier committed pages whose upload failed, since resuming never refetches them.
+        catchup_uris = archive_unarchived_batches()
         monitor.success(
             ctx=ctx,
             records_processed=inserted_count,
             metadata={
                 "batch_id": batch_id,
                 "source_limit": source_limit,
-                "records_extracted": len(records),
+                "cursor_start": checkpoint.cursor_start,
+                "cursor_end": checkpoint.cursor_end,
+                "batch_hash": checkpoint.batch_hash,
+                "already_committed": load_result.already_committed,
+                "records_extracted": batch.row_count,
+                "records_quarantined": load_result.quarantined,
+                "drifted_columns": drifted_columns,
                 "raw_archive_uri": archive_uri,
+                "catchup_archived": len(catchup_uris),
             },
         )
-        logger.info("Completed ingestion batch batch_id=%s inserted=%s", batch_id, inserted_count)
+        logger.info(
+            "Completed ingestion batch batch_id=%s cursor=[%s, %s) inserted=%s quarantined=%s already_committed=%s",
+            batch_id,
+            checkpoint.cursor_start,
+            checkpoint.cursor_end,
+            inserted_count,
+            load_result.quarantined,
+            load_result.already_committed,
+        )
     except Exception as exc:  # noqa: BLE001
         monitor.failure(
             ctx=ctx,
             error=exc,
             metadata={
-                "batch_id": batch_id,
+                "batch_id": None if checkpoint is None else str(checkpoint.batch_id),
+                "cursor_start": None if checkpoint is None else checkpoint.cursor_start,
                 "source_limit": source_limit,
             },
         )
-        logger.exception("Ingestion flow failed batch_id=%s", batch_id)
+        logger.exception("Ingestion flow failed limit=%s", source_limit)
         raise
+    finally:
+        if batch is not None:
+            ArrowBatchSpool(settings).release(batch)
 
-    return {"batch_id": batch_id, "inserted_count": inserted_count, "raw_archive_uri": archive_uri}
+    return {
+        "batch_id": batch_id,
+        "inserted_count": inserted_count,
+        "quarantined_count": load_result.quarantined,
+        "already_committed": load_result.already_committed,
+        "drifted_columns": drifted_columns,
+        "next_cursor": checkpoint.cursor_end,
+        "raw_archive_uri": archive_uri,
+    }
 
 
 if __name__ == "__main__":
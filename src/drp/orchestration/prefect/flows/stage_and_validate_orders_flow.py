@@ -1,12 +1,19 @@
-from typing import Any
-
 from prefect import flow, get_run_logger, task
+from prefect.task_runners import ConcurrentTaskRunner
 
 from drp.config.settings import get_settings
 from drp.core.logging import configure_logging
+from drp.core.memory_budget import MemoryBudget
+from drp.core.order_batch import RAW_ORDER_SCHEMA
 from drp.observability.flow_monitor import FlowMonitor
+from drp.observability.resource_usage import PeakRssSampler
+from drp.observability.task_profiler import profiled
 from drp.quality.great_expectations.orders_quality_validator import OrdersQualityValidator
-from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+from drp.quality.reconciliation import LayerReconciler
+from drp.storage.duckdb.order_marts import DAILY_ORDER_METRICS
+from drp.storage.duckdb.order_sketch_repository import OrderSketchRepository
+from drp.storage.duckdb.warehouse_repository import STAGING_ORDERS, DuckDbWarehouseRepository, shadow_table
+from drp.storage.local.batch_spool import ArrowBatchSpool, BatchHandle
 from drp.storage.object_store.archive_service import ObjectStoreArchiveService
 from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
 from drp.transform.analytics.orders_analytics_service import OrdersAnalyticsService
@@ -14,33 +21,42 @@ from drp.transform.staging.orders_staging_service import OrdersStagingService
 
 
 @task(name="extract-raw-orders")
-def extract_raw_orders(limit: int) -> list[dict[str, Any]]:
+@profiled
+def extract_raw_orders(limit: int) -> BatchHandle:
     settings = get_settings()
     repo = RawOrdersRepository(settings)
-    return repo.fetch_recent_raw_orders(limit=limit)
+    budget = MemoryBudget.from_megabytes(settings.stage_memory_budget_mb)
+    chunks = repo.iter_recent_raw_orders(limit=limit, chunk_rows=budget.chunk_rows())
+    return ArrowBatchSpool(settings).write_batches(chunks, name="raw-orders", schema=RAW_ORDER_SCHEMA)
 
 
 @task(name="build-staging-orders")
-def build_staging_orders(raw_records: list[dict[str, Any]]) -> int:
+@profiled
+def build_staging_orders(raw_batch: BatchHandle) -> int:
     settings = get_settings()
     warehouse = DuckDbWarehouseRepository(settings)
     service = OrdersStagingService(warehouse=warehouse)
-    return service.build_staging(raw_records=raw_records)
+    budget = MemoryBudget.from_megabytes(settings.stage_memory_budget_mb)
+    raw_chunks = ArrowBatchSpool(settings).iter_batches(raw_batch)
+    # Rebuilds land in shadow tables; readers keep the live version until promotion.
+    return service.build_staging_chunked(raw_chunks, memory_limit=budget.duckdb_memory_limit, shadow=True)
 
 
 @task(name="refresh-analytics-metrics")
-def refresh_analytics_metrics() -> int:
+@profiled
+def refresh_analytics_metrics() -> dict[str, int]:
     settings = get_settings()
     warehouse = DuckDbWarehouseRepository(settings)
     service = OrdersAnalyticsService(warehouse=warehouse)
-    return service.refresh_daily_metrics()
+    return service.refresh_marts(shadow=True)
 
 
 @task(name="run-quality-checks")
-def run_quality_checks() -> dict[str, int | bool]:
+@profiled
+def run_quality_checks(shadow: bool = True) -> dict[str, int | bool]:
     settings = get_settings()
     validator = OrdersQualityValidator(settings=settings)
-    result = validator.validate_staging_orders()
+    result = validator.validate_staging_orders(table=shadow_table(STAGING_ORDERS) if shadow else STAGING_ORDERS)
     payload = {
         "success": result.success,
         "checked_rows": result.checked_rows,
@@ -53,7 +69,42 @@ def run_quality_checks() -> dict[str, int | bool]:
     return payload
 
 
+@task(name="reconcile-layers")
+@profiled
+def reconcile_layers(shadow: bool = True) -> dict[str, object]:
+    settings = get_settings()
+    report = LayerReconciler(settings, raw_repository=RawOrdersRepository(settings)).reconcile(shadow=shadow)
+    payload: dict[str, object] = {
+        "success": report.success,
+        "batch_statuses": report.status_counts(),
+        "mismatched_batches": report.mismatched_batches,
+        "mismatched_marts": report.mismatched_marts,
+    }
+    if not report.success and settings.reconciliation_fail_on_mismatch:
+        raise RuntimeError(
+            f"Layer reconciliation failed: mismatched_batches={report.mismatched_batches}, "
+            f"mismatched_marts={report.mismatched_marts}"
+        )
+    return payload
+
+
+@task(name="promote-warehouse-tables")
+@profiled
+def promote_warehouse_tables() -> None:
+    settings = get_settings()
+    # Sketches are incremental rather than blue-green, so they catch up from the shadow build first and
+    # the snapshot published after the promotion carries both.
+    sketches = OrderSketchRepository(settings).refresh(source=shadow_table(STAGING_ORDERS))
+    get_run_logger().info(
+        "Refreshed order sketches batch_sketches=%s days=%s", sketches.batch_sketches, sketches.days_refreshed
+    )
+    warehouse = DuckDbWarehouseRepository(settings)
+    warehouse.promote_shadow_tables()
+    warehouse.publish_snapshot()
+
+
 @task(name="archive-analytics-snapshot")
+@profiled
 def archive_analytics_snapshot() -> str | None:
     settings = get_settings()
     warehouse = DuckDbWarehouseRepository(settings)
@@ -61,8 +112,11 @@ def archive_analytics_snapshot() -> str | None:
     return archive.archive_analytics_snapshot(warehouse=warehouse)
 
 
-@flow(name="stage-and-validate-orders")
-def stage_and_validate_orders_flow(limit: int | None = None) -> dict[str, int | bool | str | None]:
+@flow(name="stage-and-validate-orders", task_runner=ConcurrentTaskRunner())
+def stage_and_validate_orders_flow(
+    limit: int | None = None,
+    profile: bool = False,
+) -> dict[str, int | bool | str | None]:
     configure_logging(service_name="drp-pipeline")
     settings = get_settings()
     logger = get_run_logger()
@@ -70,27 +124,58 @@ def stage_and_validate_orders_flow(limit: int | None = None) -> dict[str, int |
     ctx = monitor.start(flow_name="stage-and-validate-orders")
 
     source_limit = limit if limit is not None else settings.transform_source_limit
-    logger.info("Starting staging and quality flow limit=%s", source_limit)
+    budget = MemoryBudget.from_megabytes(settings.stage_memory_budget_mb)
+    run_metadata = {
+        "source_limit": source_limit,
+        "memory_budget_bytes": budget.limit_bytes,
+        "chunk_rows": budget.chunk_rows(),
+    }
+    logger.info("Starting staging and quality flow %s", run_metadata)
 
+    raw_future = None
+    rss = PeakRssSampler()
+    rss.start()
     try:
-        raw_records = extract_raw_orders(limit=source_limit)
-        staged_rows = build_staging_orders(raw_records=raw_records)
-        analytics_rows = refresh_analytics_metrics()
-        quality = run_quality_checks()
-        analytics_archive_uri = archive_analytics_snapshot()
+        # extract -> staging -> {analytics -> reconcile, quality} -> promote -> archive; nothing goes live
+        # unless the gates pass on the shadow build.
+        raw_future = extract_raw_orders.submit(limit=source_limit)
+        staged_future = build_staging_orders.submit(raw_batch=raw_future)
+        analytics_future = refresh_analytics_metrics.submit(wait_for=[staged_future])
+        quality_future = run_quality_checks.submit(wait_for=[staged_future])
+        gates = [analytics_future, quality_future]
+        reconcile_future = None
+        if settings.reconciliation_enabled:
+            # Per-batch fingerprints prove every raw row was staged or deliberately excluded, and the
+            # marts add up to what was staged; a mismatch blocks promotion like a failed expectation.
+            reconcile_future = reconcile_layers.submit(wait_for=[analytics_future])
+            gates.append(reconcile_future)
+        promote_future = promote_warehouse_tables.submit(wait_for=gates)
+        archive_future = archive_analytics_snapshot.submit(wait_for=[promote_future])
+
+        raw_batch = raw_future.result()
+        staged_rows = staged_future.result()
+        quality = quality_future.result()
+        mart_rows = analytics_future.result()
+        analytics_rows = mart_rows[DAILY_ORDER_METRICS.table]
+        reconciliation = None if reconcile_future is None else reconcile_future.result()
+        promote_future.result()
+        analytics_archive_uri = archive_future.result()
         result = {
             "staged_rows": staged_rows,
             "analytics_rows": analytics_rows,
             "quality_success": bool(quality["success"]),
             "quality_failed_expectations": int(quality["failed_expectations"]),
             "analytics_archive_uri": analytics_archive_uri,
+            "reconciliation": reconciliation,
         }
         monitor.success(
             ctx=ctx,
             records_processed=staged_rows,
             metadata={
-                "source_limit": source_limit,
-                "raw_records": len(raw_records),
+                **run_metadata,
+                "peak_rss_bytes": rss.stop(),
+                "raw_records": raw_batch.row_count,
+                "mart_rows": mart_rows,
                 **result,
             },
         )
@@ -104,10 +189,14 @@ def stage_and_validate_orders_flow(limit: int | None = None) -> dict[str, int |
         monitor.failure(
             ctx=ctx,
             error=exc,
-            metadata={"source_limit": source_limit},
+            metadata={**run_metadata, "peak_rss_bytes": rss.stop()},
         )
         logger.exception("Stage and validate flow failed source_limit=%s", source_limit)
         raise
+    finally:
+        rss.stop()
+        if raw_future is not None and raw_future.get_state().is_completed():
+            ArrowBatchSpool(settings).release(raw_future.result())
 
     return result
 
@@ -0,0 +1,91 @@
+import signal
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prefect import flow, get_run_logger
+
+from drp.config.settings import get_settings
+from drp.core.logging import configure_logging
+from drp.ingestion.connectors.orders_api_client import OrdersApiClient
+from drp.ingestion.services.streaming_ingestion_service import StreamingIngestionService
+from drp.observability.flow_monitor import FlowMonitor
+from drp.quality.drift import BatchDriftMonitor
+from drp.storage.object_store.archive_service import ObjectStoreArchiveService
+from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+
+
+@flow(name="stream-orders-to-raw")
+def stream_orders_to_raw_flow(
+    duration_seconds: float | None = None,
+    max_records: int | None = None,
+    start_cursor: int | None = None,
+) -> dict[str, int | None]:
+    configure_logging(service_name="drp-pipeline")
+    settings = get_settings()
+    logger = get_run_logger()
+    monitor = FlowMonitor(settings)
+    ctx = monitor.start(flow_name="stream-orders-to-raw")
+    stop_event = threading.Event()
+    service = StreamingIngestionService(
+        settings=settings,
+        client=OrdersApiClient(settings),
+        repository=RawOrdersRepository(settings),
+        archive=ObjectStoreArchiveService(settings),
+        drift_monitor=BatchDriftMonitor(settings) if settings.column_profiling_enabled else None,
+    )
+    run_limits = {"duration_seconds": duration_seconds, "max_records": max_records, "start_cursor": start_cursor}
+
+    logger.info("Starting streaming ingestion %s", run_limits)
+    timer = threading.Timer(duration_seconds, stop_event.set) if duration_seconds is not None else None
+    try:
+        with _stop_on_signals(stop_event):
+            if timer is not None:
+                timer.start()
+            stats = service.run(stop_event=stop_event, max_records=max_records, start_cursor=start_cursor)
+        monitor.success(
+            ctx=ctx,
+            records_processed=stats.records_loaded,
+            metadata={**run_limits, **stats.as_metadata()},
+        )
+        logger.info(
+            "Stopped streaming ingestion batches=%s records_loaded=%s next_cursor=%s",
+            stats.batches_committed,
+            stats.records_loaded,
+            stats.next_cursor,
+        )
+    except Exception as exc:  # noqa: BLE001
+        monitor.failure(ctx=ctx, error=exc, metadata=run_limits)
+        logger.exception("Streaming ingestion failed")
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+    return {
+        "batches_committed": stats.batches_committed,
+        "records_loaded": stats.records_loaded,
+        "next_cursor": stats.next_cursor,
+    }
+
+
+@contextmanager
+def _stop_on_signals(stop_event: threading.Event) -> Iterator[None]:
+    # Signal handlers can only be installed from the main thread.
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def request_stop(signum: int, frame: object) -> None:
+        stop_event.set()
+
+    previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        yield
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+
+if __name__ == "__main__":
+    stream_orders_to_raw_flow()
@@ -0,0 +1,43 @@
+from prefect import flow, get_run_logger
+
+from drp.config.settings import get_settings
+from drp.core.logging import configure_logging
+from drp.observability.flow_monitor import FlowMonitor
+from drp.storage.object_store.raw_tiering_service import RawTieringService
+
+
+@flow(name="tier-raw-orders")
+def tier_raw_orders_flow() -> dict[str, int | list[str]]:
+    configure_logging(service_name="drp-pipeline")
+    settings = get_settings()
+    logger = get_run_logger()
+    monitor = FlowMonitor(settings)
+    ctx = monitor.start(flow_name="tier-raw-orders")
+    retention_days = settings.raw_hot_retention_days
+
+    logger.info("Starting raw tiering hot_retention_days=%s", retention_days)
+    try:
+        partitions = RawTieringService(settings).offload_cold_partitions()
+        rows_offloaded = sum(partition.row_count for partition in partitions)
+        metadata = {
+            "hot_retention_days": retention_days,
+            "partitions_offloaded": len(partitions),
+            "ingest_dates": [partition.ingest_date.isoformat() for partition in partitions],
+            "cold_uris": [partition.uri for partition in partitions],
+        }
+        monitor.success(ctx=ctx, records_processed=rows_offloaded, metadata=metadata)
+        logger.info("Finished raw tiering partitions=%s rows=%s", len(partitions), rows_offloaded)
+    except Exception as exc:  # noqa: BLE001
+        monitor.failure(ctx=ctx, error=exc, metadata={"hot_retention_days": retention_days})
+        logger.exception("Raw tiering flow failed")
+        raise
+
+    return {
+        "partitions_offloaded": len(partitions),
+        "rows_offloaded": rows_offloaded,
+        "cold_uris": metadata["cold_uris"],
+    }
+
+
+if __name__ == "__main__":
+    tier_raw_orders_flow()
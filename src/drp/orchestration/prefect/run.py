@@ -0,0 +1,33 @@
+import argparse
+import importlib
+from collections.abc import Callable, Sequence
+from typing import Any
+
+# Keyed by deployment name; modules are imported only for the flows that are actually run.
+FLOW_ENTRYPOINTS = {
+    "ingest-orders-to-raw": "drp.orchestration.prefect.flows.ingest_orders_flow:ingest_orders_to_raw_flow",
+    "ingest-datasets-to-raw": "drp.orchestration.prefect.flows.ingest_datasets_flow:ingest_datasets_to_raw_flow",
+    "stream-orders-to-raw": "drp.orchestration.prefect.flows.stream_orders_flow:stream_orders_to_raw_flow",
+    "tier-raw-orders": "drp.orchestration.prefect.flows.tier_raw_orders_flow:tier_raw_orders_flow",
+    "stage-and-validate-orders": (
+        "drp.orchestration.prefect.flows.stage_and_validate_orders_flow:stage_and_validate_orders_flow"
+    ),
+}
+
+
+def load_flow(name: str) -> Callable[..., Any]:
+    module_name, _, attribute = FLOW_ENTRYPOINTS[name].partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run one or more flows in a single interpreter.")
+    parser.add_argument("flows", nargs="+", choices=sorted(FLOW_ENTRYPOINTS))
+    args = parser.parse_args(argv)
+    # One process pays Prefect's start-up cost once for the whole sequence.
+    for name in args.flows:
+        load_flow(name)()
+
+
+if __name__ == "__main__":
+    main()
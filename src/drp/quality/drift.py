@@ -0,0 +1,209 @@
+import logging
+import math
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass
+from uuid import UUID
+
+from drp.config.settings import Settings
+from drp.core.column_profile import NUMERIC, ColumnProfile, profile_batch
+from drp.core.order_batch import OrderBatch
+from drp.datasets.registry import ORDERS, DatasetSpec
+from drp.storage.postgres.column_profile_repository import ColumnProfileRepository
+
+NULL_RATE = "null_rate"
+MEAN_ZSCORE = "mean_zscore"
+HISTOGRAM_PSI = "histogram_psi"
+
+# Laplace smoothing keeps buckets that one side has never seen from dominating the index.
+_PSI_SMOOTHING = 0.5
+
+
+@dataclass(frozen=True)
+class DriftThresholds:
+    null_rate_tolerance: float
+    mean_zscore: float
+    psi: float
+    min_baseline_batches: int
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DriftThresholds":
+        return cls(
+            null_rate_tolerance=settings.drift_null_rate_tolerance,
+            mean_zscore=settings.drift_mean_zscore,
+            psi=settings.drift_psi_threshold,
+            min_baseline_batches=settings.column_profile_min_baseline_batches,
+        )
+
+
+@dataclass(frozen=True)
+class DriftFinding:
+    column_name: str
+    metric: str
+    observed: float
+    expected: float
+    score: float
+    threshold: float
+
+
+@dataclass(frozen=True)
+class DriftReport:
+    batch_id: UUID
+    profiled_columns: int
+    baseline_batches: int
+    findings: tuple[DriftFinding, ...] = ()
+
+    @property
+    def drifted_columns(self) -> list[str]:
+        return sorted({finding.column_name for finding in self.findings})
+
+
+def check_drift(
+    profile: ColumnProfile,
+    baseline: Sequence[ColumnProfile],
+    thresholds: DriftThresholds,
+) -> list[DriftFinding]:
+    if len(baseline) < thresholds.min_baseline_batches:
+        return []
+    findings = []
+
+    baseline_rows = sum(item.row_count for item in baseline)
+    expected_null_rate = sum(item.null_count for item in baseline) / baseline_rows if baseline_rows else 0.0
+    null_rate_delta = abs(profile.null_rate - expected_null_rate)
+    if null_rate_delta > thresholds.null_rate_tolerance:
+        findings.append(
+            DriftFinding(
+                profile.column_name,
+                NULL_RATE,
+                observed=profile.null_rate,
+                expected=expected_null_rate,
+                score=null_rate_delta,
+                threshold=thresholds.null_rate_tolerance,
+            )
+        )
+
+    # Timestamps move forward by design, so only numeric columns are held to a stable mean and shape.
+    if profile.kind != NUMERIC:
+        return findings
+
+    described = [item for item in baseline if item.mean is not None and item.stddev is not None and item.row_count]
+    if profile.mean is not None and len(described) >= thresholds.min_baseline_batches:
+        expected_mean, spread = _batch_mean_spread(described, profile.row_count - profile.null_count)
+        if spread > 0:
+            zscore = abs(profile.mean - expected_mean) / spread
+            if zscore > thresholds.mean_zscore:
+                findings.append(
+                    DriftFinding(
+                        profile.column_name,
+                        MEAN_ZSCORE,
+                        observed=profile.mean,
+                        expected=expected_mean,
+                        score=zscore,
+                        threshold=thresholds.mean_zscore,
+                    )
+                )
+
+    expected_histogram: Counter[str] = Counter()
+    for item in baseline:
+        expected_histogram.update(item.histogram)
+    if profile.histogram and expected_histogram:
+        psi = population_stability_index(expected_histogram, profile.histogram)
+        if psi > thresholds.psi:
+            findings.append(
+                DriftFinding(
+                    profile.column_name,
+                    HISTOGRAM_PSI,
+                    observed=float(sum(profile.histogram.values())),
+                    expected=float(sum(expected_histogram.values())),
+                    score=psi,
+                    threshold=thresholds.psi,
+                )
+            )
+    return findings
+
+
+def population_stability_index(expected: Mapping[str, int], observed: Mapping[str, int]) -> float:
+    buckets = set(expected) | set(observed)
+    expected_total = sum(expected.values()) + _PSI_SMOOTHING * len(buckets)
+    observed_total = sum(observed.values()) + _PSI_SMOOTHING * len(buckets)
+    psi = 0.0
+    for bucket in buckets:
+        expected_share = (expected.get(bucket, 0) + _PSI_SMOOTHING) / expected_total
+        observed_share = (observed.get(bucket, 0) + _PSI_SMOOTHING) / observed_total
+        psi += (observed_share - expected_share) * math.log(observed_share / expected_share)
+    return psi
+
+
+def _batch_mean_spread(baseline: Sequence[ColumnProfile], observed_values: int) -> tuple[float, float]:
+    # Batch means vary more than sampling alone explains (load profiles, time of day), so the spread
+    # is the larger of the baseline's own batch-to-batch spread and the standard error at this size.
+    weights = [item.row_count - item.null_count for item in baseline]
+    total = sum(weights)
+    if total <= 0 or observed_values <= 0:
+        return 0.0, 0.0
+    means = [item.mean or 0.0 for item in baseline]
+    expected_mean = sum(weight * mean for weight, mean in zip(weights, means, strict=True)) / total
+    pooled_variance = (
+        sum(
+            weight * ((item.stddev or 0.0) ** 2 + (mean - expected_mean) ** 2)
+            for weight, item, mean in zip(weights, baseline, means, strict=True)
+        )
+        / total
+    )
+    between_batches = math.sqrt(sum((mean - expected_mean) ** 2 for mean in means) / len(means))
+    return expected_mean, max(between_batches, math.sqrt(pooled_variance / observed_values))
+
+
+class BatchDriftMonitor:
+    def __init__(
+        self,
+        settings: Settings,
+        repository: ColumnProfileRepository | None = None,
+        dataset: DatasetSpec = ORDERS,
+    ) -> None:
+        self._settings = settings
+        self._dataset = dataset
+        self._repository = repository if repository is not None else ColumnProfileRepository(settings)
+        self._thresholds = DriftThresholds.from_settings(settings)
+        self._logger = logging.getLogger(__name__)
+
+    def observe(self, batch_id: UUID, records: OrderBatch) -> DriftReport:
+        if not records:
+            return DriftReport(batch_id=batch_id, profiled_columns=0, baseline_batches=0)
+        profiles = profile_batch(records, schema=self._dataset.source_schema)
+        self._repository.ensure_table()
+        baseline = self._repository.recent_profiles(
+            source_system=self._settings.source_system,
+            batches=self._settings.column_profile_baseline_batches,
+            exclude_batch_id=batch_id,
+        )
+        findings = [
+            finding
+            for profile in profiles
+            for finding in check_drift(profile, baseline.get(profile.column_name, []), self._thresholds)
+        ]
+        by_column: dict[str, list[dict[str, object]]] = {}
+        for finding in findings:
+            record = asdict(finding)
+            by_column.setdefault(str(record.pop("column_name")), []).append(record)
+        self._repository.insert_profiles(
+            batch_id=batch_id,
+            source_system=self._settings.source_system,
+            profiles=profiles,
+            drift_findings=by_column,
+        )
+
+        report = DriftReport(
+            batch_id=batch_id,
+            profiled_columns=len(profiles),
+            baseline_batches=max((len(items) for items in baseline.values()), default=0),
+            findings=tuple(findings),
+        )
+        if findings:
+            self._logger.warning(
+                "Column drift detected batch_id=%s columns=%s findings=%s",
+                batch_id,
+                report.drifted_columns,
+                [(finding.column_name, finding.metric, round(finding.score, 3)) for finding in findings],
+            )
+        return report
@@ -0,0 +1,137 @@
+import logging
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from uuid import UUID
+
+from drp.config.settings import Settings
+from drp.core.batch_fingerprint import BatchFingerprint
+from drp.datasets.registry import ORDERS, DatasetSpec
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository, StagingFingerprint
+from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+
+MATCHED = "matched"
+MISMATCHED = "mismatched"
+MISSING_IN_STAGING = "missing_in_staging"
+UNFINGERPRINTED = "unfingerprinted"
+
+# Mart amounts are float sums; row counts are exact and catch any lost order on their own.
+_MART_AMOUNT_RELATIVE_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class BatchReconciliation:
+    batch_id: UUID
+    status: str
+    raw: BatchFingerprint | None = None
+    staging: BatchFingerprint | None = None
+
+
+@dataclass(frozen=True)
+class MartReconciliation:
+    table: str
+    expected_rows: int
+    rows: int
+    expected_amount_cents: int
+    amount_cents: int
+
+    @property
+    def matched(self) -> bool:
+        tolerance = max(1.0, abs(self.expected_amount_cents) * _MART_AMOUNT_RELATIVE_TOLERANCE)
+        return self.rows == self.expected_rows and abs(self.amount_cents - self.expected_amount_cents) <= tolerance
+
+
+@dataclass(frozen=True)
+class ReconciliationReport:
+    batches: tuple[BatchReconciliation, ...] = ()
+    marts: tuple[MartReconciliation, ...] = ()
+
+    @property
+    def mismatched_batches(self) -> list[str]:
+        return sorted(str(item.batch_id) for item in self.batches if item.status in (MISMATCHED, MISSING_IN_STAGING))
+
+    @property
+    def mismatched_marts(self) -> list[str]:
+        return [item.table for item in self.marts if not item.matched]
+
+    @property
+    def success(self) -> bool:
+        return not self.mismatched_batches and not self.mismatched_marts
+
+    def status_counts(self) -> dict[str, int]:
+        return dict(Counter(item.status for item in self.batches))
+
+
+def reconcile_batches(
+    raw: Mapping[UUID, BatchFingerprint],
+    staging: Mapping[UUID, StagingFingerprint],
+) -> list[BatchReconciliation]:
+    results = []
+    for batch_id in sorted(set(raw) | set(staging), key=str):
+        raw_fingerprint = raw.get(batch_id)
+        staged = staging.get(batch_id)
+        if staged is None:
+            results.append(BatchReconciliation(batch_id, MISSING_IN_STAGING, raw=raw_fingerprint))
+        elif raw_fingerprint is None:
+            # Loaded before raw fingerprints were recorded; nothing to compare against.
+            results.append(BatchReconciliation(batch_id, UNFINGERPRINTED, staging=staged.accounted))
+        else:
+            status = MATCHED if raw_fingerprint.matches(staged.accounted) else MISMATCHED
+            results.append(BatchReconciliation(batch_id, status, raw=raw_fingerprint, staging=staged.accounted))
+    return results
+
+
+def reconcile_marts(
+    staging: Mapping[UUID, StagingFingerprint],
+    mart_totals: Mapping[str, tuple[int, float]],
+) -> list[MartReconciliation]:
+    expected_rows = sum(item.staged.row_count for item in staging.values())
+    expected_cents = sum(item.staged.amount_cents for item in staging.values())
+    return [
+        MartReconciliation(
+            table=table,
+            expected_rows=expected_rows,
+            rows=rows,
+            expected_amount_cents=expected_cents,
+            amount_cents=round(amount * 100),
+        )
+        for table, (rows, amount) in sorted(mart_totals.items())
+    ]
+
+
+class LayerReconciler:
+    def __init__(
+        self,
+        settings: Settings,
+        raw_repository: RawOrdersRepository | None = None,
+        warehouse: DuckDbWarehouseRepository | None = None,
+        dataset: DatasetSpec = ORDERS,
+    ) -> None:
+        self._settings = settings
+        self._raw = raw_repository if raw_repository is not None else RawOrdersRepository(settings)
+        self._warehouse = warehouse if warehouse is not None else DuckDbWarehouseRepository(settings, dataset=dataset)
+        self._logger = logging.getLogger(__name__)
+
+    def reconcile(self, shadow: bool = False, source_system: str | None = None) -> ReconciliationReport:
+        # Only the stored per-batch fingerprints and mart totals are read, never the rows they describe.
+        staging = self._warehouse.staging_fingerprints(shadow=shadow)
+        loaded = [item.loaded_at for item in staging.values() if item.loaded_at is not None]
+        if not loaded:
+            return ReconciliationReport()
+        raw = self._raw.batch_fingerprints(
+            batch_ids=list(staging),
+            ingested_from=min(loaded),
+            ingested_to=max(loaded),
+            source_system=source_system,
+        )
+        report = ReconciliationReport(
+            batches=tuple(reconcile_batches(raw, staging)),
+            marts=tuple(reconcile_marts(staging, self._warehouse.mart_totals(shadow=shadow))),
+        )
+        if not report.success:
+            self._logger.warning(
+                "Layer reconciliation failed mismatched_batches=%s mismatched_marts=%s",
+                report.mismatched_batches,
+                report.mismatched_marts,
+            )
+        return report
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MartDimension:
+    name: str
+    expression: str
+    sql_type: str
+
+
+@dataclass(frozen=True)
+class MartGrain:
+    table: str
+    dimensions: tuple[MartDimension, ...]
+
+
+ORDER_DATE = MartDimension("order_date", "CAST(order_created_at AS DATE)", "DATE")
+ORDER_HOUR = MartDimension("order_hour", "date_trunc('hour', order_created_at)", "TIMESTAMP")
+CUSTOMER_ID = MartDimension("customer_id", "customer_id", "VARCHAR")
+SOURCE_SYSTEM = MartDimension("source_system", "source_system", "VARCHAR")
+
+DAILY_ORDER_METRICS = MartGrain("daily_order_metrics", (ORDER_DATE,))
+HOURLY_ORDER_METRICS = MartGrain("hourly_order_metrics", (ORDER_HOUR,))
+CUSTOMER_ORDER_METRICS = MartGrain("customer_order_metrics", (CUSTOMER_ID,))
+SOURCE_SYSTEM_DAILY_METRICS = MartGrain("source_system_daily_metrics", (ORDER_DATE, SOURCE_SYSTEM))
+
+ORDER_MART_GRAINS = (
+    DAILY_ORDER_METRICS,
+    HOURLY_ORDER_METRICS,
+    CUSTOMER_ORDER_METRICS,
+    SOURCE_SYSTEM_DAILY_METRICS,
+)
@@ -0,0 +1,296 @@
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Literal
+
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from drp.config.settings import Settings
+from drp.core.exceptions import StorageError
+from drp.core.sketches import HyperLogLog, TDigest
+from drp.storage.duckdb.warehouse_access import snapshot_connection, warehouse_connection
+from drp.storage.duckdb.warehouse_repository import STAGING_ORDERS
+
+SketchGrain = Literal["day", "week", "month"]
+
+_SKETCH_QUANTILES = {"amount_p50": 0.5, "amount_p95": 0.95, "amount_p99": 0.99}
+
+_CREATE_SKETCH_TABLES = """
+CREATE SCHEMA IF NOT EXISTS analytics;
+
+CREATE TABLE IF NOT EXISTS analytics.order_batch_sketches (
+    order_date DATE,
+    batch_id VARCHAR,
+    order_count BIGINT,
+    total_amount DOUBLE,
+    customer_hll BLOB,
+    amount_digest BLOB,
+    built_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS analytics.daily_order_sketches (
+    order_date DATE,
+    order_count BIGINT,
+    customer_hll BLOB,
+    amount_digest BLOB,
+    distinct_customers BIGINT,
+    amount_p50 DOUBLE,
+    amount_p95 DOUBLE,
+    amount_p99 DOUBLE,
+    last_refreshed_at TIMESTAMP
+);
+"""
+
+# A (day, batch) sketch is rebuilt when its fingerprint moves: new batches, batches whose
+# rows were superseded in staging, and batches that disappeared from staging entirely.
+_FIND_CHANGED_BATCHES = """
+CREATE OR REPLACE TEMP TABLE sketch_changes AS
+WITH current_batches AS (
+    SELECT
+        CAST(order_created_at AS DATE) AS order_date,
+        batch_id,
+        COUNT(*) AS order_count,
+        ROUND(SUM(amount), 6) AS total_amount
+    FROM {source}
+    GROUP BY 1, 2
+)
+SELECT
+    COALESCE(c.order_date, s.order_date) AS order_date,
+    COALESCE(c.batch_id, s.batch_id) AS batch_id,
+    c.order_count,
+    c.total_amount
+FROM current_batches AS c
+FULL OUTER JOIN analytics.order_batch_sketches AS s
+    ON c.order_date = s.order_date AND c.batch_id = s.batch_id
+WHERE c.batch_id IS NULL
+    OR s.batch_id IS NULL
+    OR c.order_count <> s.order_count
+    OR c.total_amount <> s.total_amount
+"""
+
+_READ_CHANGED_ORDERS = """
+SELECT
+    o.order_date,
+    o.batch_id,
+    o.amount,
+    CAST(md5_number(o.customer_id) & CAST(18446744073709551615 AS UHUGEINT) AS UBIGINT) AS customer_hash
+FROM (
+    SELECT CAST(order_created_at AS DATE) AS order_date, batch_id, amount, customer_id
+    FROM {source}
+) AS o
+JOIN sketch_changes AS c ON o.order_date = c.order_date AND o.batch_id = c.batch_id
+ORDER BY o.order_date, o.batch_id
+"""
+
+
+@dataclass(frozen=True)
+class SketchRefresh:
+    batch_sketches: int
+    days_refreshed: int
+
+
+@dataclass(frozen=True)
+class OrderSketch:
+    order_count: int
+    customers: HyperLogLog
+    amounts: TDigest
+
+    def merge(self, other: "OrderSketch") -> "OrderSketch":
+        return OrderSketch(
+            order_count=self.order_count + other.order_count,
+            customers=self.customers.merge(other.customers),
+            amounts=self.amounts.merge(other.amounts),
+        )
+
+    def as_metrics(self) -> dict[str, Any]:
+        metrics: dict[str, Any] = {
+            "order_count": self.order_count,
+            "distinct_customers": int(round(self.customers.estimate())),
+        }
+        for column, q in _SKETCH_QUANTILES.items():
+            metrics[column] = self.amounts.quantile(q)
+        return metrics
+
+
+class OrderSketchRepository:
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    def _connect(self) -> AbstractContextManager[duckdb.DuckDBPyConnection]:
+        return warehouse_connection(
+            self._settings.duckdb_path,
+            lock_timeout_seconds=self._settings.duckdb_writer_lock_timeout_seconds,
+        )
+
+    def ensure_tables(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(_CREATE_SKETCH_TABLES)
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed ensuring order sketch tables: {exc}") from exc
+
+    def refresh(self, source: str = STAGING_ORDERS) -> SketchRefresh:
+        self.ensure_tables()
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN TRANSACTION")
+                conn.execute(_FIND_CHANGED_BATCHES.format(source=source))
+                changed = pa.table(conn.execute(_READ_CHANGED_ORDERS.format(source=source)).arrow())
+                fingerprints = {
+                    (row[0], row[1]): row[2]
+                    for row in conn.execute(
+                        "SELECT order_date, batch_id, total_amount FROM sketch_changes WHERE order_count IS NOT NULL"
+                    ).fetchall()
+                }
+                batch_rows = [
+                    (order_date, batch_id, sketch, fingerprints[(order_date, batch_id)])
+                    for order_date, batch_id, sketch in _batch_sketches(changed)
+                ]
+
+                conn.execute(
+                    """
+                    DELETE FROM analytics.order_batch_sketches AS s
+                    USING sketch_changes AS c
+                    WHERE s.order_date = c.order_date AND s.batch_id = c.batch_id
+                    """
+                )
+                if batch_rows:
+                    conn.executemany(
+                        "INSERT INTO analytics.order_batch_sketches VALUES (?, ?, ?, ?, ?, ?, NOW())",
+                        [
+                            [
+                                order_date,
+                                batch_id,
+                                sketch.order_count,
+                                total_amount,
+                                sketch.customers.to_bytes(),
+                                sketch.amounts.to_bytes(),
+                            ]
+                            for order_date, batch_id, sketch, total_amount in batch_rows
+                        ],
+                    )
+
+                # Touched days are re-merged from their batch sketches; staging is never rescanned.
+                stored = conn.execute(
+                    """
+                    SELECT order_date, order_count, customer_hll, amount_digest
+                    FROM analytics.order_batch_sketches
+                    WHERE order_date IN (SELECT DISTINCT order_date FROM sketch_changes)
+                    ORDER BY order_date, batch_id
+                    """
+                ).fetchall()
+                days = _merge_by_period([(row[0], _decode(row[1:])) for row in stored], grain="day")
+                conn.execute(
+                    """
+                    DELETE FROM analytics.daily_order_sketches
+                    WHERE order_date IN (SELECT DISTINCT order_date FROM sketch_changes)
+                    """
+                )
+                if days:
+                    conn.executemany(
+                        "INSERT INTO analytics.daily_order_sketches VALUES (?, ?, ?, ?, ?, ?, ?, ?, NOW())",
+                        [_daily_row(day, sketch) for day, sketch in days.items()],
+                    )
+                days_refreshed = int(
+                    conn.execute("SELECT COUNT(DISTINCT order_date) FROM sketch_changes").fetchone()[0]
+                )
+                conn.execute("DROP TABLE sketch_changes")
+                conn.execute("COMMIT")
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed refreshing order sketches: {exc}") from exc
+        return SketchRefresh(batch_sketches=len(batch_rows), days_refreshed=days_refreshed)
+
+    def read_rollup(self, start: date, end: date, grain: SketchGrain = "week") -> list[dict[str, Any]]:
+        # Readers stay off the writer lock, so the tables are not created here; a snapshot published before
+        # the first sketch refresh simply has nothing to roll up.
+        try:
+            with snapshot_connection(self._settings.duckdb_path) as conn:
+                built = conn.execute(
+                    """
+                    SELECT COUNT(*) FROM duckdb_tables()
+                    WHERE schema_name = 'analytics' AND table_name = 'daily_order_sketches'
+                    """
+                ).fetchone()
+                if not built or not built[0]:
+                    return []
+                rows = conn.execute(
+                    """
+                    SELECT order_date, order_count, customer_hll, amount_digest
+                    FROM analytics.daily_order_sketches
+                    WHERE order_date BETWEEN ? AND ?
+                    ORDER BY order_date
+                    """,
+                    [start, end],
+                ).fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading order sketch rollup: {exc}") from exc
+
+        periods = _merge_by_period([(row[0], _decode(row[1:])) for row in rows], grain=grain)
+        return [{"period_start": period, **sketch.as_metrics()} for period, sketch in periods.items()]
+
+
+def _batch_sketches(table: pa.Table) -> Iterator[tuple[date, str, OrderSketch]]:
+    if table.num_rows == 0:
+        return
+    keys = list(zip(table.column("order_date").to_pylist(), table.column("batch_id").to_pylist(), strict=True))
+    amounts = table.column("amount")
+    hashes = table.column("customer_hash")
+    start = 0
+    for index in range(1, len(keys) + 1):
+        if index < len(keys) and keys[index] == keys[start]:
+            continue
+        group_amounts = pc.drop_null(amounts.slice(start, index - start)).to_numpy()
+        group_hashes = pc.drop_null(hashes.slice(start, index - start)).to_numpy()
+        yield (
+            keys[start][0],
+            keys[start][1],
+            OrderSketch(
+                order_count=index - start,
+                customers=HyperLogLog.from_hashes(group_hashes),
+                amounts=TDigest.from_values(np.asarray(group_amounts, dtype=np.float64)),
+            ),
+        )
+        start = index
+
+
+def _decode(row: tuple[Any, ...]) -> OrderSketch:
+    order_count, customer_hll, amount_digest = row
+    return OrderSketch(
+        order_count=int(order_count),
+        customers=HyperLogLog.from_bytes(bytes(customer_hll)),
+        amounts=TDigest.from_bytes(bytes(amount_digest)),
+    )
+
+
+def _period_start(day: date, grain: SketchGrain) -> date:
+    if grain == "day":
+        return day
+    if grain == "week":
+        return day - timedelta(days=day.weekday())
+    if grain == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported sketch grain: {grain}")
+
+
+def _merge_by_period(sketches: list[tuple[date, OrderSketch]], grain: SketchGrain) -> dict[date, OrderSketch]:
+    periods: dict[date, OrderSketch] = {}
+    for day, sketch in sketches:
+        period = _period_start(day, grain)
+        periods[period] = periods[period].merge(sketch) if period in periods else sketch
+    return periods
+
+
+def _daily_row(day: date, sketch: OrderSketch) -> list[Any]:
+    metrics = sketch.as_metrics()
+    return [
+        day,
+        sketch.order_count,
+        sketch.customers.to_bytes(),
+        sketch.amounts.to_bytes(),
+        metrics["distinct_customers"],
+        *(metrics[column] for column in _SKETCH_QUANTILES),
+    ]
@@ -0,0 +1,228 @@
+import fcntl
+import logging
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+from uuid import uuid4
+
+import duckdb
+
+from drp.core.exceptions import StorageError
+
+WRITER_LOCK_TIMEOUT_SECONDS = 600.0
+SNAPSHOT_RETAIN = 3
+
+_FILE_LOCKS: dict[str, threading.Lock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+_READERS: dict[str, "_SharedReader"] = {}
+_WRITER_LOCK_SUFFIX = ".writer-lock"
+_SNAPSHOT_DIR_SUFFIX = ".snapshots"
+_CURRENT_SNAPSHOT = "CURRENT"
+_METRICS_VERSION_SUFFIX = ".metrics-version"
+_LOCK_POLL_SECONDS = 0.02
+_LOCK_POLL_MAX_SECONDS = 1.0
+
+_logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def writer_lock(db_path: str, timeout_seconds: float = WRITER_LOCK_TIMEOUT_SECONDS) -> Iterator[None]:
+    # DuckDB admits one read-write process per file; an flock beside it queues writers from every
+    # process (flows, workers, the API) instead of letting the loser fail with a lock error.
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = Path(f"{db_path}{_WRITER_LOCK_SUFFIX}")
+    deadline = time.monotonic() + timeout_seconds
+    thread_lock = _file_lock(path)
+    if not thread_lock.acquire(timeout=max(timeout_seconds, 0.0)):
+        raise StorageError(f"Timed out after {timeout_seconds}s waiting for DuckDB writer lock {lock_path}")
+    try:
+        with lock_path.open("a+", encoding="utf-8") as handle:
+            _acquire_flock(handle, lock_path, deadline, timeout_seconds)
+            try:
+                handle.seek(0)
+                handle.truncate()
+                handle.write(f"pid={os.getpid()} thread={threading.current_thread().name}\n")
+                handle.flush()
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    finally:
+        thread_lock.release()
+
+
+@contextmanager
+def warehouse_connection(
+    db_path: str,
+    read_only: bool = False,
+    lock_timeout_seconds: float = WRITER_LOCK_TIMEOUT_SECONDS,
+) -> Iterator[duckdb.DuckDBPyConnection]:
+    path = Path(db_path)
+    if read_only:
+        with _read_only_connection(path) as conn:
+            yield conn
+        return
+    with writer_lock(db_path, lock_timeout_seconds), duckdb.connect(str(path)) as conn:
+        yield conn
+
+
+@contextmanager
+def snapshot_connection(db_path: str) -> Iterator[duckdb.DuckDBPyConnection]:
+    # Readers open the latest published copy, which no writer ever touches, so they never wait on
+    # or block a writer. Before the first publish they fall back to the live file.
+    snapshot = current_snapshot(db_path)
+    if snapshot is None:
+        with warehouse_connection(db_path, read_only=True) as conn:
+            yield conn
+        return
+    with _read_only_connection(snapshot) as conn:
+        yield conn
+
+
+def snapshot_dir(db_path: str) -> Path:
+    return Path(f"{db_path}{_SNAPSHOT_DIR_SUFFIX}")
+
+
+def current_snapshot(db_path: str) -> Path | None:
+    directory = snapshot_dir(db_path)
+    try:
+        name = (directory / _CURRENT_SNAPSHOT).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return directory / name if name else None
+
+
+def publish_snapshot(
+    db_path: str,
+    retain: int = SNAPSHOT_RETAIN,
+    lock_timeout_seconds: float = WRITER_LOCK_TIMEOUT_SECONDS,
+) -> Path:
+    directory = snapshot_dir(db_path)
+    version = uuid4().hex
+    # A zero-padded clock prefix keeps snapshot names in publish order for pruning.
+    snapshot = directory / f"warehouse-{time.time_ns():020d}-{version}.duckdb"
+    tmp_snapshot = snapshot.with_name(f"{snapshot.name}.tmp")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with writer_lock(db_path, lock_timeout_seconds):
+            # Closing the only connection checkpoints the WAL into the main file, so a byte copy
+            # taken while the writer lock is still held is a consistent database.
+            with duckdb.connect(db_path) as conn:
+                conn.execute("CHECKPOINT")
+            shutil.copyfile(db_path, tmp_snapshot)
+            tmp_snapshot.replace(snapshot)
+            _write_atomically(directory / _CURRENT_SNAPSHOT, snapshot.name)
+            publish_metrics_version(db_path, version)
+    except (OSError, duckdb.Error) as exc:
+        tmp_snapshot.unlink(missing_ok=True)
+        raise StorageError(f"Failed publishing DuckDB snapshot for {db_path}: {exc}") from exc
+
+    # Superseded copies stay for a few publishes so readers that opened them just before can finish.
+    published = sorted(directory.glob("warehouse-*.duckdb"))
+    for stale in published[: max(len(published) - max(retain, 1), 0)]:
+        stale.unlink(missing_ok=True)
+    return snapshot
+
+
+def metrics_version(db_path: str) -> str:
+    try:
+        return Path(f"{db_path}{_METRICS_VERSION_SUFFIX}").read_text(encoding="utf-8").strip() or "0"
+    except FileNotFoundError:
+        return "0"
+
+
+def publish_metrics_version(db_path: str, version: str | None = None) -> str:
+    # A marker next to the database file lets readers in other processes notice a refresh with one small read.
+    version = version or uuid4().hex
+    marker = Path(f"{db_path}{_METRICS_VERSION_SUFFIX}")
+    try:
+        _write_atomically(marker, version)
+    except OSError as exc:
+        raise StorageError(f"Failed publishing metrics version marker {marker}: {exc}") from exc
+    return version
+
+
+class _SharedReader:
+    def __init__(self) -> None:
+        self.guard = threading.Lock()
+        self.conn: duckdb.DuckDBPyConnection | None = None
+        self.readers = 0
+
+
+@contextmanager
+def _read_only_connection(path: Path) -> Iterator[duckdb.DuckDBPyConnection]:
+    # Readers of a file share one read-only database and each query through its own cursor, so they
+    # run side by side. DuckDB refuses a read-only and a read-write instance of one file in the same
+    # process, so the first reader in and the last reader out hold the file lock that writers take.
+    file_lock = _file_lock(path)
+    with _FILE_LOCKS_GUARD:
+        shared = _READERS.setdefault(str(path.resolve()), _SharedReader())
+    with shared.guard:
+        if shared.conn is None:
+            file_lock.acquire()
+            try:
+                shared.conn = duckdb.connect(str(path), read_only=True)
+            except BaseException:
+                file_lock.release()
+                raise
+        shared.readers += 1
+        cursor = shared.conn.cursor()
+    try:
+        with cursor:
+            yield cursor
+    finally:
+        with shared.guard:
+            shared.readers -= 1
+            if shared.readers == 0 and shared.conn is not None:
+                shared.conn.close()
+                shared.conn = None
+                file_lock.release()
+
+
+def _file_lock(path: Path) -> threading.Lock:
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(str(path.resolve()), threading.Lock())
+
+
+def _acquire_flock(handle: IO[str], lock_path: Path, deadline: float, timeout_seconds: float) -> None:
+    delay = _LOCK_POLL_SECONDS
+    waiting_since: float | None = None
+    while True:
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            pass
+        else:
+            if waiting_since is not None:
+                _logger.info("Acquired DuckDB writer lock %s after %.2fs", lock_path, time.monotonic() - waiting_since)
+            return
+
+        now = time.monotonic()
+        if now >= deadline:
+            raise StorageError(
+                f"Timed out after {timeout_seconds}s waiting for DuckDB writer lock {lock_path} "
+                f"held by {_lock_holder(lock_path)}"
+            )
+        if waiting_since is None:
+            waiting_since = now
+            _logger.info("Waiting for DuckDB writer lock %s held by %s", lock_path, _lock_holder(lock_path))
+        time.sleep(min(delay, deadline - now))
+        delay = min(delay * 2, _LOCK_POLL_MAX_SECONDS)
+
+
+def _lock_holder(lock_path: Path) -> str:
+    try:
+        return lock_path.read_text(encoding="utf-8").strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def _write_atomically(path: Path, content: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    tmp_path.replace(path)
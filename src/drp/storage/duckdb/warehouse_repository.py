@@ -1,125 +1,542 @@
-from collections.abc import Sequence
-from datetime import datetime
-from decimal import Decimal
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 from uuid import UUID
 
 import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from drp.config.settings import Settings
+from drp.core.batch_fingerprint import BatchFingerprint, amount_cents, fingerprint_rows, key_hashes, signed_hash
 from drp.core.exceptions import StorageError
+from drp.core.order_batch import OrderBatch, as_order_batch
+from drp.datasets.registry import ORDERS, DatasetSpec
+from drp.storage.duckdb.order_marts import DAILY_ORDER_METRICS, MartDimension, MartGrain
+from drp.storage.duckdb.warehouse_access import publish_snapshot, snapshot_connection, warehouse_connection
+
+_READ_LOCK_RETRIES = 3
+_READ_LOCK_BACKOFF_SECONDS = 0.05
+
+STAGING_ORDERS = ORDERS.staging_table
+SHADOW_SUFFIX = "__next"
+PREVIOUS_SUFFIX = "__previous"
+BLUE_GREEN_TABLES = ORDERS.blue_green_tables
+
+_DUCKDB_TYPES = {
+    pa.string(): "VARCHAR",
+    pa.large_string(): "VARCHAR",
+    pa.float64(): "DOUBLE",
+    pa.int64(): "BIGINT",
+    pa.int32(): "INTEGER",
+    pa.bool_(): "BOOLEAN",
+    pa.date32(): "DATE",
+}
+
+
+@dataclass(frozen=True)
+class PartitionRefresh:
+    staged_rows: int
+    metric_days: int
+
+
+@dataclass(frozen=True)
+class StagingFingerprint:
+    loaded_at: datetime | None
+    staged: BatchFingerprint
+    excluded: BatchFingerprint
+
+    @property
+    def accounted(self) -> BatchFingerprint:
+        # Every raw row read by the build is either staged or deliberately excluded (superseded or filtered).
+        return self.staged + self.excluded
 
 
 class DuckDbWarehouseRepository:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, dataset: DatasetSpec = ORDERS) -> None:
         self._settings = settings
+        self._dataset = dataset
 
-    def _connect(self) -> duckdb.DuckDBPyConnection:
-        db_path = Path(self._settings.duckdb_path)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        return duckdb.connect(str(db_path))
+    def _connect(self) -> AbstractContextManager[duckdb.DuckDBPyConnection]:
+        return warehouse_connection(
+            self._settings.duckdb_path,
+            lock_timeout_seconds=self._settings.duckdb_writer_lock_timeout_seconds,
+        )
 
-    def ensure_tables(self) -> None:
-        statement = """
-        CREATE SCHEMA IF NOT EXISTS staging;
-        CREATE SCHEMA IF NOT EXISTS analytics;
-
-        CREATE TABLE IF NOT EXISTS staging.orders (
-            source_order_id VARCHAR,
-            customer_id VARCHAR,
-            amount DOUBLE,
-            order_created_at TIMESTAMP,
-            ingested_at TIMESTAMP,
-            batch_id VARCHAR,
-            source_system VARCHAR
-        );
+    def publish_snapshot(self) -> Path:
+        # Writes never publish on their own: each flow publishes once when it is done, so a run pays for one
+        # CHECKPOINT and file copy under the writer lock instead of one per write.
+        return publish_snapshot(
+            self._settings.duckdb_path,
+            retain=self._settings.duckdb_snapshot_retain,
+            lock_timeout_seconds=self._settings.duckdb_writer_lock_timeout_seconds,
+        )
 
-        CREATE TABLE IF NOT EXISTS analytics.daily_order_metrics (
-            order_date DATE,
-            total_orders BIGINT,
-            total_amount DOUBLE,
-            avg_amount DOUBLE,
-            last_refreshed_at TIMESTAMP
-        );
-        """
+    def ensure_tables(self) -> None:
+        fingerprint_table = self._dataset.fingerprint_table
+        statement = (
+            """
+            CREATE SCHEMA IF NOT EXISTS staging;
+            CREATE SCHEMA IF NOT EXISTS analytics;
+            """
+            + _staging_table_ddl(self._dataset, self._dataset.staging_table)
+            + ("" if fingerprint_table is None else _fingerprint_table_ddl(fingerprint_table))
+            + "".join(_mart_table_ddl(grain, f"analytics.{grain.table}") for grain in self._dataset.marts)
+        )
         try:
             with self._connect() as conn:
                 conn.execute(statement)
         except Exception as exc:  # noqa: BLE001
             raise StorageError(f"Failed ensuring DuckDB tables: {exc}") from exc
 
-    def replace_staging_orders(self, records: Sequence[dict[str, Any]]) -> int:
+    def replace_staging_orders(self, records: OrderBatch | Sequence[Mapping[str, Any]]) -> int:
         self.ensure_tables()
+        staged = _staging_table(self._dataset, records)
+
+        try:
+            with self._connect() as conn:
+                conn.register("staged_orders_batch", staged)
+                conn.execute("BEGIN TRANSACTION")
+                conn.execute(f"DELETE FROM {self._dataset.staging_table}")
+                conn.execute(_insert_staged(self._dataset))
+                if self._dataset.fingerprint_table is not None:
+                    # Already-cleaned rows say nothing about what was excluded, so no fingerprints describe them.
+                    conn.execute(f"DELETE FROM {self._dataset.fingerprint_table}")
+                conn.execute("COMMIT")
+                conn.unregister("staged_orders_batch")
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed writing staging orders in DuckDB: {exc}") from exc
+
+        return staged.num_rows
 
-        if not records:
+    def replace_staging_orders_chunked(
+        self,
+        chunks: Iterable[OrderBatch | Sequence[Mapping[str, Any]]],
+        memory_limit: str | None = None,
+        shadow: bool = False,
+    ) -> int:
+        self.ensure_tables()
+        dataset = self._dataset
+        target = shadow_table(dataset.staging_table) if shadow else dataset.staging_table
+        try:
             with self._connect() as conn:
-                conn.execute("DELETE FROM staging.orders")
-            return 0
+                if memory_limit is not None:
+                    conn.execute(f"SET memory_limit = '{memory_limit}'")
+                # Raw chunks land in an on-disk table; DuckDB then dedups with a window that spills
+                # to its temp directory instead of holding every raw row and key in Python.
+                conn.execute(_create_spill(dataset))
+                offset = 0
+                for chunk in chunks:
+                    staged = _staging_table(dataset, chunk)
+                    conn.register("staged_orders_chunk", _spill_chunk(dataset, staged, offset))
+                    conn.execute(f"INSERT INTO {dataset.spill_table} SELECT * FROM staged_orders_chunk")
+                    conn.unregister("staged_orders_chunk")
+                    offset += staged.num_rows
 
-        insert_rows: list[tuple[Any, ...]] = []
-        for record in records:
-            insert_rows.append(
-                (
-                    str(record["source_order_id"]),
-                    str(record["customer_id"]),
-                    float(record["amount"]),
-                    _to_datetime(record["order_created_at"]),
-                    _to_datetime(record["ingested_at"]),
-                    _to_str(record["batch_id"]),
-                    str(record["source_system"]),
-                )
+                conn.execute("BEGIN TRANSACTION")
+                if shadow:
+                    conn.execute(_staging_table_ddl(dataset, target, replace=True))
+                else:
+                    conn.execute(f"DELETE FROM {target}")
+                # The window runs once; only the (usually few) excluded rows are materialised.
+                conn.execute(_create_spill_excluded(dataset))
+                conn.execute(_insert_deduped_spill(dataset, target))
+                staged_rows = int(conn.execute(f"SELECT COUNT(*) FROM {target}").fetchone()[0])
+                if dataset.fingerprint_table is not None:
+                    self._write_fingerprints(conn, shadow=shadow)
+                conn.execute(f"DROP TABLE {dataset.spill_table}_excluded")
+                conn.execute(f"DROP TABLE {dataset.spill_table}")
+                conn.execute("COMMIT")
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed writing chunked staging orders in DuckDB: {exc}") from exc
+
+        return staged_rows
+
+    def _write_fingerprints(self, conn: duckdb.DuckDBPyConnection, shadow: bool) -> None:
+        dataset = self._dataset
+        table = shadow_table(dataset.fingerprint_table) if shadow else dataset.fingerprint_table
+        # Hash sums leave DuckDB as HUGEINT and are wrapped to signed 64 bits here, as on the raw side.
+        rows = conn.execute(
+            f"""
+            SELECT
+                spill.batch_id,
+                MAX(spill.{dataset.version_column}),
+                COUNT(*),
+                COALESCE(SUM(spill.amount_cents), 0),
+                COALESCE(SUM(spill.key_hash::HUGEINT), 0),
+                COUNT(excluded.spill_seq),
+                COALESCE(SUM(spill.amount_cents) FILTER (WHERE excluded.spill_seq IS NOT NULL), 0),
+                COALESCE(SUM(spill.key_hash::HUGEINT) FILTER (WHERE excluded.spill_seq IS NOT NULL), 0)
+            FROM {dataset.spill_table} AS spill
+            LEFT JOIN {dataset.spill_table}_excluded AS excluded USING (spill_seq)
+            WHERE spill.batch_id IS NOT NULL
+            GROUP BY spill.batch_id
+            """
+        ).fetchall()
+        if shadow:
+            conn.execute(_fingerprint_table_ddl(table, replace=True))
+        else:
+            conn.execute(f"DELETE FROM {table}")
+        if rows:
+            # Staged = read - excluded; the sums are additive, so no second pass over the staged rows is needed.
+            conn.executemany(
+                f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        row[0],
+                        row[1],
+                        row[2] - row[5],
+                        int(row[3]) - int(row[6]),
+                        signed_hash(int(row[4]) - int(row[7])),
+                        row[5],
+                        int(row[6]),
+                        signed_hash(int(row[7])),
+                    )
+                    for row in rows
+                ],
+            )
+
+    def staging_fingerprints(self, shadow: bool = False) -> dict[UUID, StagingFingerprint]:
+        if self._dataset.fingerprint_table is None:
+            return {}
+        table = shadow_table(self._dataset.fingerprint_table) if shadow else self._dataset.fingerprint_table
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT
+                        batch_id,
+                        loaded_at,
+                        staged_rows,
+                        staged_amount_cents,
+                        staged_key_hash,
+                        excluded_rows,
+                        excluded_amount_cents,
+                        excluded_key_hash
+                    FROM {table}
+                    """
+                ).fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading staging fingerprints: {exc}") from exc
+
+        fingerprints = {}
+        for row in rows:
+            batch_id = UUID(row[0])
+            fingerprints[batch_id] = StagingFingerprint(
+                # Staging stores naive UTC; raw compares against timestamptz.
+                loaded_at=None if row[1] is None else row[1].replace(tzinfo=UTC),
+                staged=BatchFingerprint(batch_id, int(row[2]), int(row[3]), int(row[4])),
+                excluded=BatchFingerprint(batch_id, int(row[5]), int(row[6]), int(row[7])),
             )
+        return fingerprints
+
+    def mart_totals(self, shadow: bool = False) -> dict[str, tuple[int, float]]:
+        # Each grain partitions every staged row, so each mart must add up to the staging totals.
+        statements = [
+            f"SELECT '{grain.table}', COALESCE(SUM(total_orders), 0), COALESCE(SUM(total_amount), 0) "
+            f"FROM analytics.{grain.table}{SHADOW_SUFFIX if shadow else ''}"
+            for grain in self._dataset.marts
+        ]
+        if not statements:
+            return {}
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(" UNION ALL ".join(statements)).fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading mart totals: {exc}") from exc
+        return {row[0]: (int(row[1]), float(row[2])) for row in rows}
+
+    def merge_staging_partition(
+        self,
+        records: OrderBatch | Sequence[Mapping[str, Any]],
+        start: date,
+        end: date,
+        replaced_keys: pa.Table | None = None,
+    ) -> PartitionRefresh:
+        self.ensure_tables()
+        staged = _staging_table(self._dataset, records)
+        # Keys whose staged versions are replaced; wider than the staged rows when the latest version of
+        # a key is excluded from staging (e.g. a negative amount) and its older version must go too.
+        replaced = staged.select(list(self._dataset.key_columns)) if replaced_keys is None else replaced_keys
+        table = self._dataset.staging_table
+        partition_day = f"CAST({self._dataset.partition_column} AS DATE)"
+        keys = ", ".join(self._dataset.key_columns)
+        # Partitions keep daily metrics current themselves; datasets without the daily mart only restage.
+        daily_metrics = DAILY_ORDER_METRICS in self._dataset.marts
 
         try:
             with self._connect() as conn:
+                conn.register("staged_orders_batch", staged)
+                conn.register("replaced_keys", replaced)
                 conn.execute("BEGIN TRANSACTION")
-                conn.execute("DELETE FROM staging.orders")
-                conn.executemany(
+                # Replace the partition's days and every staged version of the rows being merged, then
+                # recompute metrics for each day either side touched, all in one commit per partition.
+                outside = conn.execute(
+                    f"""
+                    SELECT {partition_day} AS partition_day
+                    FROM {table}
+                    WHERE ({keys}) IN (SELECT {keys} FROM replaced_keys)
+                    UNION
+                    SELECT {partition_day} AS partition_day
+                    FROM staged_orders_batch
                     """
-                    INSERT INTO staging.orders (
-                        source_order_id,
-                        customer_id,
-                        amount,
-                        order_created_at,
-                        ingested_at,
-                        batch_id,
-                        source_system
+                ).fetchall()
+                replaced_rows = f"""
+                    FROM {table}
+                    WHERE {partition_day} BETWEEN ? AND ?
+                        OR ({keys}) IN (SELECT {keys} FROM replaced_keys)
+                    """
+                removed = None
+                if self._dataset.fingerprint_table is not None:
+                    removed = pa.table(
+                        conn.execute(
+                            f"SELECT batch_id, {self._dataset.fingerprint_key}, {self._dataset.fingerprint_amount} "
+                            + replaced_rows,
+                            [start, end],
+                        ).arrow()
                     )
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    insert_rows,
-                )
+                conn.execute("DELETE " + replaced_rows, [start, end])
+                conn.execute(_insert_staged(self._dataset))
+                if removed is not None:
+                    self._merge_fingerprints(conn, removed=removed, added=staged)
+                row = None
+                if daily_metrics:
+                    touched = {start + timedelta(days=offset) for offset in range((end - start).days + 1)}
+                    touched.update(day for (day,) in outside)
+                    conn.register("refreshed_days", pa.table({"order_date": pa.array(sorted(touched), pa.date32())}))
+                    conn.execute(
+                        """
+                        DELETE FROM analytics.daily_order_metrics
+                        WHERE order_date IN (SELECT order_date FROM refreshed_days)
+                        """
+                    )
+                    conn.execute(
+                        f"""
+                        INSERT INTO analytics.daily_order_metrics
+                        SELECT
+                            {partition_day} AS order_date,
+                            COUNT(*) AS total_orders,
+                            SUM(amount) AS total_amount,
+                            AVG(amount) AS avg_amount,
+                            NOW() AS last_refreshed_at
+                        FROM {table}
+                        WHERE {partition_day} IN (SELECT order_date FROM refreshed_days)
+                        GROUP BY 1
+                        ORDER BY 1
+                        """
+                    )
+                    row = conn.execute(
+                        """
+                        SELECT COUNT(*) FROM analytics.daily_order_metrics
+                        WHERE order_date IN (SELECT order_date FROM refreshed_days)
+                        """
+                    ).fetchone()
+                    conn.unregister("refreshed_days")
                 conn.execute("COMMIT")
+                conn.unregister("staged_orders_batch")
+                conn.unregister("replaced_keys")
         except Exception as exc:  # noqa: BLE001
-            raise StorageError(f"Failed writing staging orders in DuckDB: {exc}") from exc
+            raise StorageError(f"Failed merging staging partition {start}..{end} in DuckDB: {exc}") from exc
+
+        return PartitionRefresh(staged_rows=staged.num_rows, metric_days=int(row[0] if row else 0))
 
-        return len(insert_rows)
+    def _merge_fingerprints(self, conn: duckdb.DuckDBPyConnection, removed: pa.Table, added: pa.Table) -> None:
+        dataset = self._dataset
+        table = dataset.fingerprint_table
+        current = {
+            str(UUID(row[0])): row
+            for row in conn.execute(
+                f"""
+                SELECT
+                    batch_id,
+                    staged_rows,
+                    staged_amount_cents,
+                    staged_key_hash,
+                    excluded_rows,
+                    excluded_amount_cents,
+                    excluded_key_hash
+                FROM {table}
+                """
+            ).fetchall()
+        }
+        gained = _batch_fingerprints(dataset, added)
+        lost = _batch_fingerprints(dataset, removed)
+        if not (gained.keys() | lost.keys()) <= current.keys():
+            # Rows from a batch the last full build never read have no raw accounting to carry forward; as with
+            # replace_staging_orders, no fingerprints beat ones that report the batch as mismatched.
+            conn.execute(f"DELETE FROM {table}")
+            return
+
+        # A merge re-reads raw rows each batch already accounted for, so it only moves rows between a batch's
+        # staged and excluded sums and the batch still adds up to its raw fingerprint.
+        updates = []
+        for batch_id in sorted(gained.keys() | lost.keys()):
+            plus = gained.get(batch_id, BatchFingerprint(UUID(batch_id)))
+            minus = lost.get(batch_id, BatchFingerprint(UUID(batch_id)))
+            rows = plus.row_count - minus.row_count
+            cents = plus.amount_cents - minus.amount_cents
+            key_hash = plus.key_hash - minus.key_hash
+            stored_id, staged_rows, staged_cents, staged_hash, excluded_rows, excluded_cents, excluded_hash = current[
+                batch_id
+            ]
+            updates.append(
+                (
+                    staged_rows + rows,
+                    staged_cents + cents,
+                    signed_hash(staged_hash + key_hash),
+                    excluded_rows - rows,
+                    excluded_cents - cents,
+                    signed_hash(excluded_hash - key_hash),
+                    stored_id,
+                )
+            )
+        conn.executemany(
+            f"""
+            UPDATE {table}
+            SET
+                staged_rows = ?,
+                staged_amount_cents = ?,
+                staged_key_hash = ?,
+                excluded_rows = ?,
+                excluded_amount_cents = ?,
+                excluded_key_hash = ?
+            WHERE batch_id = ?
+            """,
+            updates,
+        )
 
     def refresh_daily_metrics(self) -> int:
+        return self.refresh_marts([DAILY_ORDER_METRICS])[DAILY_ORDER_METRICS.table]
+
+    def refresh_marts(self, grains: Sequence[MartGrain] | None = None, shadow: bool = False) -> dict[str, int]:
         self.ensure_tables()
-        statement = """
-        INSERT INTO analytics.daily_order_metrics
+        grains = self._dataset.marts if grains is None else grains
+        if not grains:
+            # Datasets declared in a registry file have no marts of their own.
+            return {}
+        source = shadow_table(self._dataset.staging_table) if shadow else self._dataset.staging_table
+        targets = {grain.table: f"analytics.{grain.table}{SHADOW_SUFFIX if shadow else ''}" for grain in grains}
+        dimensions = _mart_dimensions(grains)
+        names = [dimension.name for dimension in dimensions]
+        projection = ", ".join(f"{dimension.expression} AS {dimension.name}" for dimension in dimensions)
+        grouping_sets = ", ".join(f"({', '.join(d.name for d in grain.dimensions)})" for grain in grains)
+        # One scan of staging.orders feeds every grain; GROUPING() tags which grouping set each row came from.
+        rollup_statement = f"""
+        CREATE OR REPLACE TEMP TABLE mart_rollup AS
         SELECT
-            CAST(order_created_at AS DATE) AS order_date,
+            {", ".join(names)},
+            GROUPING({", ".join(names)}) AS grouping_id,
             COUNT(*) AS total_orders,
             SUM(amount) AS total_amount,
-            AVG(amount) AS avg_amount,
-            NOW() AS last_refreshed_at
-        FROM staging.orders
-        GROUP BY 1
-        ORDER BY 1;
+            AVG(amount) AS avg_amount
+        FROM (SELECT {projection}, amount FROM {source})
+        GROUP BY GROUPING SETS ({grouping_sets})
         """
-        count_statement = "SELECT COUNT(*) AS cnt FROM analytics.daily_order_metrics"
         try:
             with self._connect() as conn:
-                conn.execute("DELETE FROM analytics.daily_order_metrics")
-                conn.execute(statement)
-                row = conn.execute(count_statement).fetchone()
+                conn.execute("BEGIN TRANSACTION")
+                conn.execute(rollup_statement)
+                for grain in grains:
+                    columns = ", ".join(dimension.name for dimension in grain.dimensions)
+                    if shadow:
+                        conn.execute(_mart_table_ddl(grain, targets[grain.table], replace=True))
+                    else:
+                        conn.execute(f"DELETE FROM {targets[grain.table]}")
+                    conn.execute(
+                        f"""
+                        INSERT INTO {targets[grain.table]} (
+                            {columns},
+                            total_orders,
+                            total_amount,
+                            avg_amount,
+                            last_refreshed_at
+                        )
+                        SELECT {columns}, total_orders, total_amount, avg_amount, NOW()
+                        FROM mart_rollup
+                        WHERE grouping_id = ?
+                        ORDER BY {columns}
+                        """,
+                        [_grouping_id(grain, names)],
+                    )
+                counts = {
+                    table: int(conn.execute(f"SELECT COUNT(*) FROM {target}").fetchone()[0])
+                    for table, target in targets.items()
+                }
+                conn.execute("DROP TABLE mart_rollup")
+                conn.execute("COMMIT")
         except Exception as exc:  # noqa: BLE001
-            raise StorageError(f"Failed refreshing analytics metrics: {exc}") from exc
+            raise StorageError(f"Failed refreshing analytics marts: {exc}") from exc
 
-        return int(row[0] if row else 0)
+        return counts
+
+    def promote_shadow_tables(self, tables: Sequence[str] | None = None) -> None:
+        self.ensure_tables()
+        tables = self._dataset.blue_green_tables if tables is None else tables
+        try:
+            with self._connect() as conn:
+                missing = [table for table in tables if not _table_exists(conn, shadow_table(table))]
+                if not missing:
+                    # Every live table steps aside and its shadow takes the name in one commit, so readers
+                    # see either all old or all new versions; the displaced ones stay for rollback.
+                    conn.execute("BEGIN TRANSACTION")
+                    for table in tables:
+                        conn.execute(f"DROP TABLE IF EXISTS {previous_table(table)}")
+                        conn.execute(_rename(table, previous_table(table)))
+                        conn.execute(_rename(shadow_table(table), table))
+                    conn.execute("COMMIT")
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed promoting shadow tables: {exc}") from exc
+        if missing:
+            raise StorageError(f"No shadow build to promote for {', '.join(missing)}")
+
+    def rollback_promotion(self, tables: Sequence[str] | None = None) -> None:
+        tables = self._dataset.blue_green_tables if tables is None else tables
+        try:
+            with self._connect() as conn:
+                missing = [table for table in tables if not _table_exists(conn, previous_table(table))]
+                if not missing:
+                    # The rejected version moves back to the shadow name, where it can still be inspected.
+                    conn.execute("BEGIN TRANSACTION")
+                    for table in tables:
+                        conn.execute(f"DROP TABLE IF EXISTS {shadow_table(table)}")
+                        conn.execute(_rename(table, shadow_table(table)))
+                        conn.execute(_rename(previous_table(table), table))
+                    conn.execute("COMMIT")
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed rolling back promoted tables: {exc}") from exc
+        if missing:
+            raise StorageError(f"No previous version to roll back to for {', '.join(missing)}")
+
+    def read_daily_metrics(self, start: date, end: date) -> list[dict[str, Any]]:
+        statement = """
+        SELECT
+            order_date,
+            total_orders,
+            total_amount,
+            avg_amount,
+            last_refreshed_at
+        FROM analytics.daily_order_metrics
+        WHERE order_date BETWEEN ? AND ?
+        ORDER BY order_date
+        """
+        for attempt in range(1, _READ_LOCK_RETRIES + 1):
+            try:
+                with snapshot_connection(self._settings.duckdb_path) as conn:
+                    cursor = conn.execute(statement, [start, end])
+                    columns = [column[0] for column in cursor.description]
+                    return [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+            except duckdb.IOException as exc:
+                # Only the live-file fallback can collide with a writer process; back off briefly.
+                if attempt == _READ_LOCK_RETRIES:
+                    raise StorageError(f"Analytics warehouse is busy: {exc}") from exc
+                time.sleep(_READ_LOCK_BACKOFF_SECONDS * attempt)
+            except Exception as exc:  # noqa: BLE001
+                raise StorageError(f"Failed reading daily metrics: {exc}") from exc
+        return []
 
     def export_daily_metrics_to_parquet(self, output_path: str) -> None:
         self.ensure_tables()
@@ -137,21 +554,173 @@ class DuckDbWarehouseRepository:
         TO ? (FORMAT PARQUET);
         """
         try:
-            with self._connect() as conn:
+            with snapshot_connection(self._settings.duckdb_path) as conn:
                 conn.execute(statement, [output_path])
         except Exception as exc:  # noqa: BLE001
             raise StorageError(f"Failed exporting analytics parquet snapshot: {exc}") from exc
 
 
-def _to_datetime(value: Any) -> datetime:
-    if isinstance(value, datetime):
-        return value
-    return datetime.fromisoformat(str(value))
+def shadow_table(table: str) -> str:
+    return f"{table}{SHADOW_SUFFIX}"
+
+
+def previous_table(table: str) -> str:
+    return f"{table}{PREVIOUS_SUFFIX}"
+
+
+def _staging_table_ddl(dataset: DatasetSpec, table: str, replace: bool = False) -> str:
+    columns = ",\n".join(f"{field.name} {_duckdb_type(field.type)}" for field in dataset.staging_schema)
+    return f"""
+        {"CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"} {table} (
+            {columns}
+        );
+        """
+
+
+def _fingerprint_table_ddl(table: str, replace: bool = False) -> str:
+    return f"""
+        {"CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"} {table} (
+            batch_id VARCHAR,
+            loaded_at TIMESTAMP,
+            staged_rows BIGINT,
+            staged_amount_cents BIGINT,
+            staged_key_hash BIGINT,
+            excluded_rows BIGINT,
+            excluded_amount_cents BIGINT,
+            excluded_key_hash BIGINT
+        );
+        """
+
+
+def _mart_table_ddl(grain: MartGrain, table: str, replace: bool = False) -> str:
+    dimensions = "".join(f"{dimension.name} {dimension.sql_type},\n" for dimension in grain.dimensions)
+    return f"""
+        {"CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"} {table} (
+            {dimensions}total_orders BIGINT,
+            total_amount DOUBLE,
+            avg_amount DOUBLE,
+            last_refreshed_at TIMESTAMP
+        );
+        """
+
+
+def _table_exists(conn: duckdb.DuckDBPyConnection, table: str) -> bool:
+    schema, name = table.split(".", 1)
+    row = conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = ? AND table_name = ?",
+        [schema, name],
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def _rename(table: str, target: str) -> str:
+    # DuckDB keeps a renamed table in its schema, so the new name is given unqualified.
+    return f"ALTER TABLE {table} RENAME TO {target.split('.', 1)[1]}"
+
+
+def _mart_dimensions(grains: Sequence[MartGrain]) -> list[MartDimension]:
+    dimensions: dict[str, MartDimension] = {}
+    for grain in grains:
+        for dimension in grain.dimensions:
+            if dimensions.setdefault(dimension.name, dimension) != dimension:
+                raise StorageError(f"Mart dimension '{dimension.name}' is declared with conflicting definitions")
+    return list(dimensions.values())
+
+
+def _grouping_id(grain: MartGrain, names: Sequence[str]) -> int:
+    # GROUPING(a, b, c) sets a bit, most significant first, for every column aggregated away.
+    grouped = {dimension.name for dimension in grain.dimensions}
+    return sum(1 << (len(names) - 1 - index) for index, name in enumerate(names) if name not in grouped)
+
+
+def _batch_fingerprints(dataset: DatasetSpec, rows: pa.Table) -> dict[str, BatchFingerprint]:
+    rows = rows.filter(pc.is_valid(rows.column("batch_id")))
+    fingerprints = fingerprint_rows(
+        rows.column("batch_id").to_pylist(),
+        rows.column(dataset.fingerprint_key).to_pylist(),
+        rows.column(dataset.fingerprint_amount).to_pylist(),
+    )
+    return {str(batch_id): fingerprint for batch_id, fingerprint in fingerprints.items()}
+
+
+def _insert_staged(dataset: DatasetSpec) -> str:
+    columns = ", ".join(dataset.staging_schema.names)
+    return f"INSERT INTO {dataset.staging_table} ({columns}) SELECT {columns} FROM staged_orders_batch"
+
+
+def _create_spill(dataset: DatasetSpec) -> str:
+    columns = "".join(f"{field.name} {_duckdb_type(field.type)},\n" for field in dataset.staging_schema)
+    if dataset.fingerprint_key is not None:
+        columns += "key_hash UBIGINT,\namount_cents BIGINT,\n"
+    return f"CREATE OR REPLACE TABLE {dataset.spill_table} (\n{columns}spill_seq BIGINT\n)"
+
+
+def _spill_chunk(dataset: DatasetSpec, staged: pa.Table, offset: int) -> pa.Table:
+    if dataset.fingerprint_key is not None:
+        # Hashed on the way in, while the chunk is in memory anyway, so fingerprints cost no extra scan.
+        staged = staged.append_column(
+            "key_hash", pa.array(key_hashes(staged.column(dataset.fingerprint_key).to_pylist()), type=pa.uint64())
+        ).append_column(
+            "amount_cents",
+            pa.array(amount_cents(staged.column(dataset.fingerprint_amount).to_pylist()), type=pa.int64()),
+        )
+    return staged.append_column("spill_seq", pa.array(range(offset, offset + staged.num_rows), type=pa.int64()))
+
+
+def _create_spill_excluded(dataset: DatasetSpec) -> str:
+    # Same rule as OrdersStagingService.clean: the latest version per key (first seen on ties) is kept, and
+    # rows with a negative (or missing) value in a non-negative column are dropped.
+    keys = ", ".join(dataset.key_columns)
+    key_is_null = " OR ".join(f"{key} IS NULL" for key in dataset.key_columns)
+    row_filter = "".join(f" AND {column} >= 0" for column in dataset.non_negative_columns)
+    return f"""
+    CREATE OR REPLACE TABLE {dataset.spill_table}_excluded AS
+    SELECT spill_seq
+    FROM (
+        SELECT
+            *,
+            ROW_NUMBER() OVER (
+                PARTITION BY {keys}
+                ORDER BY {dataset.version_column} DESC NULLS LAST, spill_seq
+            ) AS version_rank
+        FROM {dataset.spill_table}
+    )
+    WHERE NOT COALESCE((version_rank = 1 OR {key_is_null}){row_filter}, FALSE)
+    """
+
+
+def _insert_deduped_spill(dataset: DatasetSpec, target: str) -> str:
+    columns = ", ".join(dataset.staging_schema.names)
+    return f"""
+    INSERT INTO {target} ({columns})
+    SELECT {columns}
+    FROM {dataset.spill_table}
+    ANTI JOIN {dataset.spill_table}_excluded USING (spill_seq)
+    """
+
+
+def _staging_table(dataset: DatasetSpec, records: OrderBatch | Sequence[Mapping[str, Any]]) -> pa.Table:
+    try:
+        batch = as_order_batch(records, dataset.staging_schema)
+        # Staging tables store naive UTC timestamps; drop the zone in Arrow so DuckDB's session zone never applies.
+        return pa.table(
+            {
+                field.name: (
+                    pc.cast(batch.column(field.name), pa.timestamp("us"))
+                    if pa.types.is_timestamp(field.type)
+                    else batch.column(field.name)
+                )
+                for field in dataset.staging_schema
+            }
+        )
+    except (pa.ArrowException, KeyError, TypeError, ValueError) as exc:
+        raise StorageError(f"Invalid staging batch for dataset {dataset.name}: {exc}") from exc
 
 
-def _to_str(value: Any) -> str:
-    if isinstance(value, UUID):
-        return str(value)
-    if isinstance(value, Decimal):
-        return str(value)
-    return str(value)
+def _duckdb_type(data_type: pa.DataType) -> str:
+    if pa.types.is_timestamp(data_type):
+        return "TIMESTAMP"
+    try:
+        return _DUCKDB_TYPES[data_type]
+    except KeyError:
+        raise StorageError(f"No DuckDB column type for Arrow type {data_type}") from None
@@ -0,0 +1 @@
+"""Local-disk storage adapters."""
@@ -0,0 +1,83 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import pyarrow as pa
+
+from drp.config.settings import Settings
+from drp.core.exceptions import StorageError
+from drp.core.order_batch import OrderBatch
+
+
+@dataclass(frozen=True)
+class BatchHandle:
+    path: str
+    row_count: int
+    size_bytes: int
+
+
+class ArrowBatchSpool:
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    def write_records(self, records: list[dict[str, Any]], name: str) -> BatchHandle:
+        try:
+            batch = OrderBatch.from_records(records)
+        except (pa.ArrowException, TypeError, ValueError) as exc:
+            raise StorageError(f"Cannot convert records to an Arrow batch: {exc}") from exc
+        return self.write_batch(batch, name=name)
+
+    def write_batch(self, batch: OrderBatch, name: str) -> BatchHandle:
+        return self.write_table(batch.table, name=name)
+
+    def write_table(self, table: pa.Table, name: str) -> BatchHandle:
+        return self.write_chunks([table], name=name, schema=table.schema)
+
+    def write_batches(self, batches: Iterable[OrderBatch], name: str, schema: pa.Schema) -> BatchHandle:
+        return self.write_chunks((batch.conform(schema).table.select(schema.names) for batch in batches), name=name, schema=schema)
+
+    def write_chunks(self, tables: Iterable[pa.Table], name: str, schema: pa.Schema) -> BatchHandle:
+        root = Path(self._settings.batch_spool_dir)
+        path = root / f"{name}-{uuid4().hex}.arrow"
+        tmp_path = path.with_suffix(".arrow.tmp")
+        row_count = 0
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            # Uncompressed IPC file format so consumers can memory-map buffers without copying.
+            with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                for table in tables:
+                    writer.write_table(table)
+                    row_count += table.num_rows
+            tmp_path.replace(path)
+        except (OSError, pa.ArrowException) as exc:
+            tmp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed spooling batch '{name}' to {root}: {exc}") from exc
+        return BatchHandle(path=str(path), row_count=row_count, size_bytes=path.stat().st_size)
+
+    def open_table(self, handle: BatchHandle) -> pa.Table:
+        try:
+            source = pa.memory_map(handle.path, "r")
+            return pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowException) as exc:
+            raise StorageError(f"Failed opening spooled batch {handle.path}: {exc}") from exc
+
+    def open_batch(self, handle: BatchHandle) -> OrderBatch:
+        return OrderBatch(self.open_table(handle))
+
+    def iter_batches(self, handle: BatchHandle) -> Iterator[OrderBatch]:
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(handle.path, "r"))
+            # Record batches are mapped one at a time, so resident memory tracks a single chunk.
+            for index in range(reader.num_record_batches):
+                yield OrderBatch(pa.Table.from_batches([reader.get_batch(index)]))
+        except (OSError, pa.ArrowException) as exc:
+            raise StorageError(f"Failed reading spooled batch {handle.path}: {exc}") from exc
+
+    def read_records(self, handle: BatchHandle) -> list[dict[str, Any]]:
+        return self.open_table(handle).to_pylist()
+
+    def release(self, handle: BatchHandle) -> None:
+        Path(handle.path).unlink(missing_ok=True)
+
@@ -1,3 +1,4 @@
+from collections.abc import Mapping, Sequence
 from datetime import UTC, datetime
 import logging
 from pathlib import Path
@@ -6,27 +7,52 @@ from typing import Any
 
 from drp.config.settings import Settings
 from drp.core.exceptions import StorageError
+from drp.core.order_batch import OrderBatch
 from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
 from drp.storage.object_store.s3_repository import S3Repository
+from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
 
 
 class ObjectStoreArchiveService:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, repository: S3Repository | None = None) -> None:
         self._settings = settings
-        self._repo = S3Repository(settings)
+        self._repo = repository if repository is not None else S3Repository(settings)
         self._logger = logging.getLogger(__name__)
 
-    def archive_raw_batch(self, batch_id: str, records: list[dict[str, Any]]) -> str | None:
+    def archive_raw_batch(
+        self,
+        batch_id: str,
+        records: OrderBatch | Sequence[Mapping[str, Any]],
+        ingested_at: datetime | None = None,
+    ) -> str | None:
         if not self._settings.object_store_enabled:
             return None
 
-        key = (
-            f"{self._settings.object_store_raw_prefix}/"
-            f"ingest_date={datetime.now(UTC).date().isoformat()}/batch_id={batch_id}.json"
-        )
-        payload = {"batch_id": batch_id, "record_count": len(records), "records": records}
+        ingest_date = (ingested_at or datetime.now(UTC)).astimezone(UTC).date()
+        key = f"{self._settings.object_store_raw_prefix}/ingest_date={ingest_date.isoformat()}/batch_id={batch_id}.json"
+        json_records = records.to_json_records() if isinstance(records, OrderBatch) else list(records)
+        payload = {"batch_id": batch_id, "record_count": len(json_records), "records": json_records}
         return self._put_json_safe(key=key, payload=payload)
 
+    def archive_unarchived_batches(self, repository: RawOrdersRepository, source_system: str, limit: int) -> list[str]:
+        # Pages are checkpointed before they are archived, so a failed upload leaves a committed page that
+        # resuming skips; it is rebuilt from its stored payloads and archived here instead.
+        if not self._settings.object_store_enabled:
+            return []
+
+        uris = []
+        for pending in repository.unarchived_batches(source_system, limit=limit):
+            uri = self.archive_raw_batch(
+                batch_id=str(pending.batch_id),
+                records=repository.fetch_batch_payloads(pending.batch_id),
+                ingested_at=pending.committed_at,
+            )
+            if uri is None:
+                break
+            repository.mark_archived(pending.batch_id)
+            uris.append(uri)
+        return uris
+
     def archive_analytics_snapshot(self, warehouse: DuckDbWarehouseRepository) -> str | None:
         if not self._settings.object_store_enabled:
             return None
@@ -42,6 +68,16 @@ class ObjectStoreArchiveService:
             warehouse.export_daily_metrics_to_parquet(output_path)
             return self._upload_file_safe(local_path=output_path, key=key)
 
+    def archive_profiles(self, flow_run_id: str, artifacts: Sequence[Path]) -> str | None:
+        if not self._settings.object_store_enabled or not artifacts:
+            return None
+
+        prefix = f"{self._settings.object_store_profiles_prefix}/flow_run_id={flow_run_id}"
+        for path in artifacts:
+            if self._upload_file_safe(local_path=str(path), key=f"{prefix}/{path.name}") is None:
+                return None
+        return f"s3://{self._settings.object_store_bucket}/{prefix}/"
+
     def _put_json_safe(self, key: str, payload: dict[str, Any]) -> str | None:
         try:
             return self._repo.put_json(key=key, payload=payload)
@@ -57,5 +93,5 @@ class ObjectStoreArchiveService:
         except StorageError as exc:
             if self._settings.object_store_required:
                 raise
-            self._logger.warning("Skipping analytics archive upload key=%s error=%s", key, exc)
+            self._logger.warning("Skipping file archive upload key=%s error=%s", key, exc)
             return None
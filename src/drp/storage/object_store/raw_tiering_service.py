@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from drp.config.settings import Settings
+from drp.core.exceptions import StorageError
+from drp.core.order_batch import RAW_ORDER_SCHEMA, OrderBatch
+from drp.storage.object_store.s3_repository import S3Repository
+from drp.storage.postgres.raw_orders_repository import RawOrdersRepository
+
+COLD_RAW_ORDER_SCHEMA = pa.schema(
+    [
+        *RAW_ORDER_SCHEMA,
+        pa.field("batch_hash", pa.string()),
+        pa.field("raw_payload", pa.string()),
+    ]
+)
+
+_READ_COLUMNS = [*RAW_ORDER_SCHEMA.names, "batch_hash"]
+# A raw row is identified by its order and the page it was loaded with, in Postgres and in Parquet alike.
+_ROW_KEY = ("source_order_id", "batch_hash")
+_PARTITION_KEY_PATTERN = re.compile(r"/ingest_date=(\d{4}-\d{2}-\d{2})/[^/]+\.parquet$")
+
+
+@dataclass(frozen=True)
+class OffloadedPartition:
+    ingest_date: date
+    row_count: int
+    uri: str
+
+
+class RawTieringService:
+    def __init__(
+        self,
+        settings: Settings,
+        raw_repository: RawOrdersRepository | None = None,
+        object_repository: S3Repository | None = None,
+    ) -> None:
+        self._settings = settings
+        self._raw = raw_repository if raw_repository is not None else RawOrdersRepository(settings)
+        self._objects = object_repository if object_repository is not None else S3Repository(settings)
+        self._logger = logging.getLogger(__name__)
+
+    def offload_cold_partitions(self, as_of: date | None = None) -> list[OffloadedPartition]:
+        if not self._settings.object_store_enabled:
+            self._logger.warning("Skipping raw tiering because the object store is disabled")
+            return []
+
+        today = as_of if as_of is not None else datetime.now(UTC).date()
+        cutoff = today - timedelta(days=self._settings.raw_hot_retention_days)
+        offloaded = []
+        for ingest_date, row_count in self._raw.list_raw_partitions(before=cutoff):
+            offloaded.append(self._offload_partition(ingest_date, row_count))
+            self._logger.info("Offloaded raw partition ingest_date=%s rows=%s", ingest_date, row_count)
+        return offloaded
+
+    def read_raw_orders(self, start: date, end: date) -> OrderBatch:
+        # Hot rows come from Postgres and cold ones from the days' Parquet partitions. A day can be in both
+        # tiers (a backfill replayed an offloaded day), so every day reads both and rows in both count once.
+        hot = self._raw.fetch_raw_orders_between(_day_start(start), _day_start(end + timedelta(days=1)))
+        hot_table = hot.conform(COLD_RAW_ORDER_SCHEMA).table.select(_READ_COLUMNS)
+        cold_files = self._cold_files(start, end)
+
+        columns = ", ".join(_READ_COLUMNS)
+        sources = [f"SELECT {columns}, 0 AS tier FROM hot_raw_orders"]
+        if cold_files:
+            sources.append(f"SELECT {columns}, 1 AS tier FROM read_parquet(?)")
+        query = f"""
+        SELECT {columns}
+        FROM ({" UNION ALL ".join(sources)})
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY {", ".join(_ROW_KEY)} ORDER BY tier) = 1
+        ORDER BY ingested_at, source_order_id
+        """
+        try:
+            with duckdb.connect() as conn:
+                conn.register("hot_raw_orders", hot_table)
+                # .arrow() returns a Table on older DuckDB and a RecordBatchReader on newer releases.
+                table = pa.table(conn.execute(query, [cold_files] if cold_files else []).arrow())
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading tiered raw orders between {start} and {end}: {exc}") from exc
+        return OrderBatch(table).conform(COLD_RAW_ORDER_SCHEMA)
+
+    def read_raw_order_versions(self, created_from: datetime, created_to: datetime) -> OrderBatch:
+        # Versions are ingested after the order is created, so only cold days from created_from on can hold them.
+        cold_files = self._cold_files(created_from.date(), date.max)
+        if not cold_files:
+            return self._raw.fetch_raw_order_versions(created_from, created_to)
+
+        columns = ", ".join(RAW_ORDER_SCHEMA.names)
+        try:
+            with duckdb.connect() as conn:
+                cold_ids = [
+                    row[0]
+                    for row in conn.execute(
+                        """
+                        SELECT DISTINCT source_order_id FROM read_parquet(?)
+                        WHERE order_created_at >= ? AND order_created_at < ?
+                        """,
+                        [cold_files, created_from, created_to],
+                    ).fetchall()
+                ]
+                hot = self._raw.fetch_raw_order_versions(created_from, created_to, source_order_ids=cold_ids)
+                conn.register("hot_raw_orders", hot.conform(RAW_ORDER_SCHEMA).table)
+                # A version is the same row in both tiers (same page and ingest time); a replayed day keeps the
+                # hot copy of it.
+                query = f"""
+                SELECT {columns}
+                FROM (
+                    SELECT {columns}, 0 AS tier FROM hot_raw_orders
+                    UNION ALL
+                    SELECT {columns}, 1 AS tier FROM read_parquet(?)
+                    WHERE source_order_id IN (SELECT source_order_id FROM hot_raw_orders)
+                        OR source_order_id IN (SELECT UNNEST(?::VARCHAR[]))
+                )
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY source_order_id, batch_id, ingested_at ORDER BY tier) = 1
+                ORDER BY ingested_at, source_order_id
+                """
+                table = pa.table(conn.execute(query, [cold_files, cold_ids]).arrow())
+        except StorageError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(
+                f"Failed reading tiered raw order versions created {created_from}..{created_to}: {exc}"
+            ) from exc
+        return OrderBatch(table).conform(RAW_ORDER_SCHEMA)
+
+    def _offload_partition(self, ingest_date: date, expected_rows: int) -> OffloadedPartition:
+        prefix = f"{self._settings.object_store_raw_cold_prefix}/ingest_date={ingest_date.isoformat()}/"
+        # A day offloaded before (and partly replayed into Postgres since) is rewritten as one object that
+        # holds its existing cold rows plus the hot rows not already among them.
+        existing_keys = sorted(key for key in self._objects.list_keys(prefix=prefix) if key.endswith(".parquet"))
+        with TemporaryDirectory(prefix="drp-raw-tier-") as tmp_dir:
+            path = Path(tmp_dir) / "orders_raw.parquet"
+            digest = hashlib.sha256()
+            seen: set[tuple[str, str]] = set()
+            row_count = 0
+            try:
+                with pq.ParquetWriter(str(path), COLD_RAW_ORDER_SCHEMA, compression="zstd") as writer:
+                    for index, existing_key in enumerate(existing_keys):
+                        local_path = f"{tmp_dir}/existing-{index}.parquet"
+                        self._objects.download_file(key=existing_key, local_path=local_path)
+                        for batch in pq.ParquetFile(local_path).iter_batches(columns=COLD_RAW_ORDER_SCHEMA.names):
+                            table = _new_rows(pa.Table.from_batches([batch]).cast(COLD_RAW_ORDER_SCHEMA), seen)
+                            writer.write_table(table)
+                        digest.update(existing_key.encode("utf-8"))
+                    for chunk in self._raw.iter_raw_partition(ingest_date):
+                        table = chunk.conform(COLD_RAW_ORDER_SCHEMA).table.select(COLD_RAW_ORDER_SCHEMA.names)
+                        row_count += table.num_rows
+                        writer.write_table(_new_rows(table, seen))
+                        digest.update(chunk.content_hash().encode("utf-8"))
+            except (OSError, pa.ArrowException) as exc:
+                raise StorageError(f"Failed writing Parquet for raw partition {ingest_date}: {exc}") from exc
+            if row_count != expected_rows:
+                raise StorageError(
+                    f"Raw partition {ingest_date} changed during export: expected {expected_rows} rows, read {row_count}"
+                )
+
+            # Content-addressed name: the same cold objects and hot rows always produce the same object.
+            key = f"{prefix}part-{digest.hexdigest()[:16]}.parquet"
+            uri = self._objects.upload_file(local_path=str(path), key=key)
+
+        # The merged object supersedes the day's earlier ones; readers dedupe rows if a delete fails midway.
+        for stale in existing_keys:
+            if stale != key:
+                self._objects.delete_object(key=stale)
+        self._raw.delete_raw_partition(ingest_date, expected_rows=row_count)
+        return OffloadedPartition(ingest_date=ingest_date, row_count=row_count, uri=uri)
+
+    def _cold_files(self, start: date, end: date) -> list[str]:
+        if not self._settings.object_store_enabled:
+            return []
+
+        cache_dir = Path(self._settings.raw_cold_cache_dir)
+        files = []
+        for key in sorted(self._objects.list_keys(prefix=f"{self._settings.object_store_raw_cold_prefix}/")):
+            match = _PARTITION_KEY_PATTERN.search(key)
+            if match is None:
+                continue
+            if not start <= date.fromisoformat(match.group(1)) <= end:
+                continue
+            local_path = cache_dir / key
+            if not local_path.exists():
+                self._objects.download_file(key=key, local_path=str(local_path))
+            files.append(str(local_path))
+        return files
+
+
+def _new_rows(table: pa.Table, seen: set[tuple[str, str]]) -> pa.Table:
+    keys = list(zip(*(table.column(name).to_pylist() for name in _ROW_KEY), strict=True))
+    keep = []
+    for key in keys:
+        keep.append(key not in seen)
+        seen.add(key)
+    return table.filter(pa.array(keep, type=pa.bool_()))
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=UTC)
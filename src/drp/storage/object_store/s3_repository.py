@@ -1,21 +1,25 @@
 import json
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import boto3
-from botocore.client import BaseClient
 from botocore.exceptions import ClientError
 
 from drp.config.settings import Settings
 from drp.core.exceptions import StorageError
 
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+
 
 class S3Repository:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._client = self._build_client()
 
-    def _build_client(self) -> BaseClient:
+    def _build_client(self) -> "BaseClient":
+        # boto3 builds its service model registry on import; defer it until a client is needed.
+        import boto3
+
         session = boto3.session.Session()
         return session.client(
             "s3",
@@ -45,6 +49,16 @@ class S3Repository:
         body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
         return self.put_bytes(key=key, payload=body, content_type="application/json")
 
+    def get_json(self, key: str) -> Any:
+        bucket = self._settings.object_store_bucket
+        try:
+            response = self._client.get_object(Bucket=bucket, Key=key)
+            return json.loads(response["Body"].read())
+        except ClientError as exc:
+            raise StorageError(f"Failed downloading object s3://{bucket}/{key}: {exc}") from exc
+        except ValueError as exc:
+            raise StorageError(f"Object s3://{bucket}/{key} is not valid JSON: {exc}") from exc
+
     def put_bytes(self, key: str, payload: bytes, content_type: str = "application/octet-stream") -> str:
         self.ensure_bucket()
         bucket = self._settings.object_store_bucket
@@ -71,3 +85,34 @@ class S3Repository:
         except ClientError as exc:
             raise StorageError(f"Failed uploading file to s3://{bucket}/{key}: {exc}") from exc
         return f"s3://{bucket}/{key}"
+
+    def list_keys(self, prefix: str) -> list[str]:
+        bucket = self._settings.object_store_bucket
+        keys: list[str] = []
+        try:
+            paginator = self._client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                keys.extend(item["Key"] for item in page.get("Contents", []))
+        except ClientError as exc:
+            raise StorageError(f"Failed listing objects under s3://{bucket}/{prefix}: {exc}") from exc
+        return keys
+
+    def delete_object(self, key: str) -> None:
+        bucket = self._settings.object_store_bucket
+        try:
+            self._client.delete_object(Bucket=bucket, Key=key)
+        except ClientError as exc:
+            raise StorageError(f"Failed deleting object s3://{bucket}/{key}: {exc}") from exc
+
+    def download_file(self, key: str, local_path: str) -> str:
+        bucket = self._settings.object_store_bucket
+        path = Path(local_path)
+        tmp_path = path.with_name(f"{path.name}.part")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._client.download_file(bucket, key, str(tmp_path))
+            tmp_path.replace(path)
+        except (ClientError, OSError) as exc:
+            tmp_path.unlink(missing_ok=True)
+            raise StorageError(f"Failed downloading s3://{bucket}/{key}: {exc}") from exc
+        return str(path)
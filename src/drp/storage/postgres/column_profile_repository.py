@@ -0,0 +1,159 @@
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from drp.config.settings import Settings
+from drp.core.column_profile import ColumnProfile
+from drp.core.exceptions import StorageError
+from drp.storage.postgres.connection import connect, json_param
+
+_PROFILE_COLUMNS = (
+    "column_name",
+    "column_kind",
+    "row_count",
+    "null_count",
+    "distinct_count",
+    "min_value",
+    "max_value",
+    "mean",
+    "stddev",
+    "histogram",
+)
+
+
+class ColumnProfileRepository:
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    def ensure_table(self) -> None:
+        schema = self._settings.observability_schema
+        table = self._settings.column_profile_table
+        statement = f"""
+        CREATE SCHEMA IF NOT EXISTS {schema};
+        CREATE TABLE IF NOT EXISTS {schema}.{table} (
+            batch_id UUID NOT NULL,
+            source_system TEXT NOT NULL,
+            column_name TEXT NOT NULL,
+            column_kind TEXT NOT NULL,
+            profiled_at TIMESTAMPTZ NOT NULL,
+            row_count INTEGER NOT NULL,
+            null_count INTEGER NOT NULL,
+            distinct_count INTEGER NOT NULL,
+            min_value DOUBLE PRECISION,
+            max_value DOUBLE PRECISION,
+            mean DOUBLE PRECISION,
+            stddev DOUBLE PRECISION,
+            histogram JSONB NOT NULL,
+            drift_findings JSONB NOT NULL,
+            PRIMARY KEY (batch_id, column_name)
+        );
+        CREATE INDEX IF NOT EXISTS {table}_source_profiled_at_idx
+            ON {schema}.{table} (source_system, profiled_at DESC);
+        """
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement)
+                conn.commit()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed ensuring column profile table: {exc}") from exc
+
+    def insert_profiles(
+        self,
+        batch_id: UUID,
+        source_system: str,
+        profiles: Sequence[ColumnProfile],
+        drift_findings: Mapping[str, Sequence[dict[str, Any]]],
+    ) -> int:
+        schema = self._settings.observability_schema
+        table = self._settings.column_profile_table
+        # A replayed batch keeps the profile and findings recorded when it was first observed.
+        statement = f"""
+        INSERT INTO {schema}.{table} (
+            batch_id,
+            source_system,
+            profiled_at,
+            {", ".join(_PROFILE_COLUMNS)},
+            drift_findings
+        )
+        VALUES ({", ".join(["%s"] * (len(_PROFILE_COLUMNS) + 4))})
+        ON CONFLICT (batch_id, column_name) DO NOTHING
+        """
+        profiled_at = datetime.now(UTC)
+        rows = [
+            (
+                batch_id,
+                source_system,
+                profiled_at,
+                profile.column_name,
+                profile.kind,
+                profile.row_count,
+                profile.null_count,
+                profile.distinct_count,
+                profile.min_value,
+                profile.max_value,
+                profile.mean,
+                profile.stddev,
+                json_param(profile.histogram),
+                json_param(list(drift_findings.get(profile.column_name, ()))),
+            )
+            for profile in profiles
+        ]
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.executemany(statement, rows)
+                    inserted = cur.rowcount
+                conn.commit()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed writing column profiles: {exc}") from exc
+        return max(inserted, 0)
+
+    def recent_profiles(
+        self,
+        source_system: str,
+        batches: int,
+        exclude_batch_id: UUID | None = None,
+    ) -> dict[str, list[ColumnProfile]]:
+        schema = self._settings.observability_schema
+        table = self._settings.column_profile_table
+        # The baseline is read from stored profiles only, never from the raw rows they describe.
+        statement = f"""
+        WITH recent AS (
+            SELECT batch_id
+            FROM {schema}.{table}
+            WHERE source_system = %s AND batch_id IS DISTINCT FROM %s::uuid
+            GROUP BY batch_id
+            ORDER BY MAX(profiled_at) DESC
+            LIMIT %s
+        )
+        SELECT {", ".join(_PROFILE_COLUMNS)}
+        FROM {schema}.{table}
+        JOIN recent USING (batch_id)
+        ORDER BY profiled_at
+        """
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (source_system, exclude_batch_id, batches))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading column profile baseline: {exc}") from exc
+
+        baseline: dict[str, list[ColumnProfile]] = {}
+        for row in rows:
+            profile = ColumnProfile(
+                column_name=row[0],
+                kind=row[1],
+                row_count=int(row[2]),
+                null_count=int(row[3]),
+                distinct_count=int(row[4]),
+                min_value=row[5],
+                max_value=row[6],
+                mean=row[7],
+                stddev=row[8],
+                histogram={str(key): int(value) for key, value in (row[9] or {}).items()},
+            )
+            baseline.setdefault(profile.column_name, []).append(profile)
+        return baseline
@@ -0,0 +1,18 @@
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import psycopg
+    from psycopg.types.json import Json
+
+
+def connect(dsn: str) -> "psycopg.Connection[Any]":
+    # psycopg is loaded on first use so importing flows and repositories stays cheap.
+    import psycopg
+
+    return psycopg.connect(dsn)
+
+
+def json_param(value: Any) -> "Json":
+    from psycopg.types.json import Json
+
+    return Json(value)
@@ -1,14 +1,61 @@
-from datetime import UTC, datetime
-from decimal import Decimal
-from typing import Any
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-import psycopg
-from psycopg.rows import dict_row
-from psycopg.types.json import Json
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from drp.config.settings import Settings
+from drp.core.batch_fingerprint import BatchFingerprint, fingerprint_rows
 from drp.core.exceptions import StorageError
+from drp.core.order_batch import (
+    QUARANTINE_REASONS_COLUMN,
+    RAW_ORDER_SCHEMA,
+    SOURCE_ORDER_SCHEMA,
+    OrderBatch,
+    as_order_batch,
+)
+from drp.storage.postgres.connection import connect, json_param
+
+if TYPE_CHECKING:
+    import psycopg
+
+_PARTITION_FETCH_ROWS = 50_000
+
+_RAW_COLUMNS = (
+    "source_order_id",
+    "customer_id",
+    "amount",
+    "order_created_at",
+    "ingested_at",
+    "batch_id",
+    "batch_hash",
+    "source_system",
+    "raw_payload",
+)
+
+
+@dataclass(frozen=True)
+class IngestionCheckpoint:
+    source_system: str
+    cursor_start: int
+    cursor_end: int
+    batch_id: UUID
+    batch_hash: str
+
+
+@dataclass(frozen=True)
+class PageCommit:
+    inserted: int
+    quarantined: int
+
+
+@dataclass(frozen=True)
+class UnarchivedBatch:
+    batch_id: UUID
+    committed_at: datetime
 
 
 class RawOrdersRepository:
@@ -18,6 +65,10 @@ class RawOrdersRepository:
     def ensure_table(self) -> None:
         schema = self._settings.raw_schema
         table = self._settings.raw_orders_table
+        quarantine_table = self._settings.raw_quarantine_table
+        checkpoint_table = self._settings.raw_checkpoint_table
+        backfill_table = self._settings.raw_backfill_table
+        fingerprint_table = self._settings.raw_fingerprint_table
 
         statement = f"""
         CREATE SCHEMA IF NOT EXISTS {schema};
@@ -32,65 +83,305 @@ class RawOrdersRepository:
             source_system TEXT NOT NULL,
             raw_payload JSONB NOT NULL
         );
+        ALTER TABLE {schema}.{table} ADD COLUMN IF NOT EXISTS batch_hash TEXT;
+        CREATE UNIQUE INDEX IF NOT EXISTS {table}_source_order_batch_hash_key
+            ON {schema}.{table} (source_order_id, batch_hash);
+        CREATE INDEX IF NOT EXISTS {table}_order_created_at_idx
+            ON {schema}.{table} (order_created_at);
+        CREATE INDEX IF NOT EXISTS {table}_ingested_at_idx
+            ON {schema}.{table} (ingested_at);
+        CREATE TABLE IF NOT EXISTS {schema}.{quarantine_table} (
+            id BIGSERIAL PRIMARY KEY,
+            source_order_id TEXT,
+            reasons TEXT NOT NULL,
+            quarantined_at TIMESTAMPTZ NOT NULL,
+            batch_id UUID NOT NULL,
+            source_system TEXT NOT NULL,
+            raw_payload JSONB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS {schema}.{checkpoint_table} (
+            source_system TEXT NOT NULL,
+            cursor_start BIGINT NOT NULL,
+            cursor_end BIGINT NOT NULL,
+            batch_id UUID NOT NULL,
+            batch_hash TEXT NOT NULL,
+            inserted_records INTEGER NOT NULL,
+            quarantined_records INTEGER NOT NULL,
+            committed_at TIMESTAMPTZ NOT NULL,
+            PRIMARY KEY (source_system, cursor_start)
+        );
+        ALTER TABLE {schema}.{checkpoint_table} ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ;
+        CREATE INDEX IF NOT EXISTS {checkpoint_table}_unarchived_idx
+            ON {schema}.{checkpoint_table} (source_system, cursor_start) WHERE archived_at IS NULL;
+        CREATE TABLE IF NOT EXISTS {schema}.{backfill_table} (
+            object_key TEXT PRIMARY KEY,
+            batch_id UUID NOT NULL,
+            inserted_records INTEGER NOT NULL DEFAULT 0,
+            quarantined_records INTEGER NOT NULL DEFAULT 0,
+            loaded_at TIMESTAMPTZ NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS {schema}.{fingerprint_table} (
+            batch_id UUID PRIMARY KEY,
+            source_system TEXT NOT NULL,
+            ingested_at TIMESTAMPTZ NOT NULL,
+            row_count BIGINT NOT NULL,
+            amount_cents BIGINT NOT NULL,
+            key_hash BIGINT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS {fingerprint_table}_ingested_at_idx
+            ON {schema}.{fingerprint_table} (ingested_at);
         """
 
         try:
-            with psycopg.connect(self._settings.postgres_dsn) as conn:
+            with connect(self._settings.postgres_dsn) as conn:
                 with conn.cursor() as cur:
                     cur.execute(statement)
                 conn.commit()
         except Exception as exc:  # noqa: BLE001
             raise StorageError(f"Failed creating raw orders table: {exc}") from exc
 
-    def insert_raw_orders(self, records: list[dict[str, Any]], batch_id: UUID) -> int:
+    def insert_raw_orders(
+        self,
+        records: OrderBatch | Sequence[Mapping[str, Any]],
+        batch_id: UUID,
+        batch_hash: str | None = None,
+    ) -> int:
         if not records:
             return 0
 
-        now = datetime.now(UTC)
+        batch = _source_batch(records)
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    inserted = self._copy_raw(
+                        cur, batch, batch_id, batch_hash or batch.content_hash(), ingested_at=datetime.now(UTC)
+                    )
+                conn.commit()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed inserting raw orders: {exc}") from exc
+
+        return inserted
+
+    def commit_page(self, valid: OrderBatch, quarantined: OrderBatch, checkpoint: IngestionCheckpoint) -> PageCommit | None:
+        batch = _source_batch(valid) if valid else valid
+        schema = self._settings.raw_schema
+        table = self._settings.raw_checkpoint_table
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    # Serialize commits per source so the overlap check below cannot race another runner.
+                    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"{table}:{checkpoint.source_system}",))
+                    cur.execute(
+                        f"""
+                        SELECT cursor_start, cursor_end, batch_hash
+                        FROM {schema}.{table}
+                        WHERE source_system = %s AND cursor_start < %s AND cursor_end > %s
+                        """,
+                        (checkpoint.source_system, checkpoint.cursor_end, checkpoint.cursor_start),
+                    )
+                    overlapping = cur.fetchall()
+                    if overlapping:
+                        if overlapping == [(checkpoint.cursor_start, checkpoint.cursor_end, checkpoint.batch_hash)]:
+                            conn.rollback()
+                            return None
+                        raise StorageError(
+                            f"Source range [{checkpoint.cursor_start}, {checkpoint.cursor_end}) overlaps committed "
+                            f"ranges {[(row[0], row[1]) for row in overlapping]}"
+                        )
+
+                    committed_at = datetime.now(UTC)
+                    committed = self._write_page(
+                        cur, batch, quarantined, checkpoint.batch_id, checkpoint.batch_hash, ingested_at=committed_at
+                    )
+                    cur.execute(
+                        f"""
+                        INSERT INTO {schema}.{table} (
+                            source_system,
+                            cursor_start,
+                            cursor_end,
+                            batch_id,
+                            batch_hash,
+                            inserted_records,
+                            quarantined_records,
+                            committed_at
+                        )
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                        """,
+                        (
+                            checkpoint.source_system,
+                            checkpoint.cursor_start,
+                            checkpoint.cursor_end,
+                            checkpoint.batch_id,
+                            checkpoint.batch_hash,
+                            committed.inserted,
+                            committed.quarantined,
+                            committed_at,
+                        ),
+                    )
+                conn.commit()
+        except StorageError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed committing raw orders page: {exc}") from exc
+
+        return committed
+
+    def commit_archived_batch(
+        self,
+        valid: OrderBatch,
+        quarantined: OrderBatch,
+        batch_id: UUID,
+        object_key: str,
+        ingested_at: datetime,
+    ) -> PageCommit | None:
+        batch = _source_batch(valid) if valid else valid
+        schema = self._settings.raw_schema
+        backfill_table = self._settings.raw_backfill_table
+        checkpoint_table = self._settings.raw_checkpoint_table
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    # Claiming the object key first makes the load idempotent and blocks concurrent loaders of it.
+                    cur.execute(
+                        f"""
+                        INSERT INTO {schema}.{backfill_table} (object_key, batch_id, loaded_at)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT (object_key) DO NOTHING
+                        RETURNING object_key
+                        """,
+                        (object_key, batch_id, datetime.now(UTC)),
+                    )
+                    if cur.fetchone() is None:
+                        conn.rollback()
+                        return None
+                    # Reuse the original hash when the batch was checkpointed, so surviving raw rows are not duplicated,
+                    # and its original commit time, so a replayed version never outranks a later correction in staging.
+                    cur.execute(
+                        f"SELECT batch_hash, committed_at FROM {schema}.{checkpoint_table} WHERE batch_id = %s LIMIT 1",
+                        (batch_id,),
+                    )
+                    row = cur.fetchone()
+                    batch_hash, ingested_at = row if row is not None else (batch.content_hash(), ingested_at)
+                    committed = self._write_page(cur, batch, quarantined, batch_id, batch_hash, ingested_at=ingested_at)
+                    cur.execute(
+                        f"""
+                        UPDATE {schema}.{backfill_table}
+                        SET inserted_records = %s, quarantined_records = %s
+                        WHERE object_key = %s
+                        """,
+                        (committed.inserted, committed.quarantined, object_key),
+                    )
+                conn.commit()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed loading archived batch {object_key}: {exc}") from exc
+
+        return committed
+
+    def loaded_archive_keys(self, object_keys: Sequence[str]) -> set[str]:
+        if not object_keys:
+            return set()
+
+        schema = self._settings.raw_schema
+        table = self._settings.raw_backfill_table
+        statement = f"SELECT object_key FROM {schema}.{table} WHERE object_key = ANY(%s)"
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (list(object_keys),))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading backfill progress: {exc}") from exc
+
+        return {row[0] for row in rows}
+
+    def latest_checkpoint(self, source_system: str) -> IngestionCheckpoint | None:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_checkpoint_table
+        statement = f"""
+            SELECT source_system, cursor_start, cursor_end, batch_id, batch_hash
+            FROM {schema}.{table}
+            WHERE source_system = %s
+            ORDER BY cursor_end DESC
+            LIMIT 1
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (source_system,))
+                    row = cur.fetchone()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading ingestion checkpoint: {exc}") from exc
+
+        if row is None:
+            return None
+        return IngestionCheckpoint(
+            source_system=row[0],
+            cursor_start=int(row[1]),
+            cursor_end=int(row[2]),
+            batch_id=row[3],
+            batch_hash=row[4],
+        )
+
+    def unarchived_batches(self, source_system: str, limit: int) -> list[UnarchivedBatch]:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_checkpoint_table
+        statement = f"""
+            SELECT batch_id, committed_at
+            FROM {schema}.{table}
+            WHERE source_system = %s AND archived_at IS NULL
+            ORDER BY cursor_start
+            LIMIT %s
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (source_system, limit))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading unarchived batches: {exc}") from exc
+
+        return [UnarchivedBatch(batch_id=row[0], committed_at=row[1]) for row in rows]
+
+    def fetch_batch_payloads(self, batch_id: UUID) -> list[dict[str, Any]]:
+        # Valid and quarantined rows both keep their source payload, so together they rebuild the page as fetched.
         schema = self._settings.raw_schema
         table = self._settings.raw_orders_table
+        quarantine_table = self._settings.raw_quarantine_table
         statement = f"""
-            INSERT INTO {schema}.{table} (
-                source_order_id,
-                customer_id,
-                amount,
-                order_created_at,
-                ingested_at,
-                batch_id,
-                source_system,
-                raw_payload
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            SELECT raw_payload FROM {schema}.{table} WHERE batch_id = %s
+            UNION ALL
+            SELECT raw_payload FROM {schema}.{quarantine_table} WHERE batch_id = %s
         """
 
-        rows: list[tuple[Any, ...]] = []
         try:
-            for record in records:
-                rows.append(
-                    (
-                        record["order_id"],
-                        record["customer_id"],
-                        Decimal(str(record["amount"])),
-                        datetime.fromisoformat(str(record["created_at"])),
-                        now,
-                        batch_id,
-                        self._settings.source_system,
-                        Json(record),
-                    )
-                )
-        except (KeyError, ValueError, TypeError) as exc:
-            raise StorageError(f"Invalid order payload shape for raw load: {exc}") from exc
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (batch_id, batch_id))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading payloads of batch {batch_id}: {exc}") from exc
+
+        return [row[0] for row in rows]
+
+    def mark_archived(self, batch_id: UUID) -> None:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_checkpoint_table
+        statement = f"UPDATE {schema}.{table} SET archived_at = %s WHERE batch_id = %s AND archived_at IS NULL"
 
         try:
-            with psycopg.connect(self._settings.postgres_dsn) as conn:
+            with connect(self._settings.postgres_dsn) as conn:
                 with conn.cursor() as cur:
-                    cur.executemany(statement, rows)
+                    cur.execute(statement, (datetime.now(UTC), batch_id))
                 conn.commit()
         except Exception as exc:  # noqa: BLE001
-            raise StorageError(f"Failed inserting raw orders: {exc}") from exc
-
-        return len(rows)
+            raise StorageError(f"Failed marking batch {batch_id} archived: {exc}") from exc
 
-    def fetch_recent_raw_orders(self, limit: int) -> list[dict[str, Any]]:
+    def fetch_recent_raw_orders(self, limit: int) -> OrderBatch:
         schema = self._settings.raw_schema
         table = self._settings.raw_orders_table
         statement = f"""
@@ -108,11 +399,357 @@ class RawOrdersRepository:
         """
 
         try:
-            with psycopg.connect(self._settings.postgres_dsn, row_factory=dict_row) as conn:
+            with connect(self._settings.postgres_dsn) as conn:
                 with conn.cursor() as cur:
                     cur.execute(statement, (limit,))
                     rows = cur.fetchall()
         except Exception as exc:  # noqa: BLE001
             raise StorageError(f"Failed reading raw orders: {exc}") from exc
 
-        return list(reversed(rows))
+        rows.reverse()
+        return _rows_to_batch(rows, RAW_ORDER_SCHEMA.names, RAW_ORDER_SCHEMA)
+
+    def iter_recent_raw_orders(
+        self,
+        limit: int,
+        chunk_rows: int = _PARTITION_FETCH_ROWS,
+        source_system: str | None = None,
+    ) -> Iterator[OrderBatch]:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        # WITH TIES: a page's rows share ingested_at, so the window never cuts a batch in two and every
+        # batch it holds can be reconciled whole.
+        statement = f"""
+            SELECT {", ".join(RAW_ORDER_SCHEMA.names)}
+            FROM {schema}.{table}
+            {"" if source_system is None else "WHERE source_system = %s"}
+            ORDER BY ingested_at DESC
+            FETCH FIRST %s ROWS WITH TIES
+        """
+        params = (limit,) if source_system is None else (source_system, limit)
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                # Server-side cursor so only one chunk of the window is ever held by the driver.
+                with conn.cursor(name="raw_recent_export") as cur:
+                    cur.execute(statement, params)
+                    while rows := cur.fetchmany(chunk_rows):
+                        yield _rows_to_batch(rows, RAW_ORDER_SCHEMA.names, RAW_ORDER_SCHEMA)
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading raw orders: {exc}") from exc
+
+    def fetch_raw_orders_between(self, start: datetime, end: datetime) -> OrderBatch:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        statement = f"""
+            SELECT {", ".join(RAW_ORDER_SCHEMA.names)}, batch_hash
+            FROM {schema}.{table}
+            WHERE ingested_at >= %s AND ingested_at < %s
+            ORDER BY ingested_at, id
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (start, end))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading raw orders between {start} and {end}: {exc}") from exc
+
+        return _rows_to_batch(rows, [*RAW_ORDER_SCHEMA.names, "batch_hash"], RAW_ORDER_SCHEMA)
+
+    def fetch_raw_order_versions(
+        self,
+        created_from: datetime,
+        created_to: datetime,
+        source_order_ids: Sequence[str] = (),
+    ) -> OrderBatch:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        # Every version of each order created in the window, wherever later corrections moved it, plus every
+        # version of the named orders (created in the window according to rows already offloaded).
+        statement = f"""
+            SELECT {", ".join(RAW_ORDER_SCHEMA.names)}
+            FROM {schema}.{table}
+            WHERE source_order_id IN (
+                SELECT source_order_id
+                FROM {schema}.{table}
+                WHERE order_created_at >= %s AND order_created_at < %s
+            )
+                OR source_order_id = ANY(%s)
+            ORDER BY id
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (created_from, created_to, list(source_order_ids)))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading raw order versions created {created_from}..{created_to}: {exc}") from exc
+
+        return _rows_to_batch(rows, RAW_ORDER_SCHEMA.names, RAW_ORDER_SCHEMA)
+
+    def list_raw_partitions(self, before: date) -> list[tuple[date, int]]:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        statement = f"""
+            SELECT (ingested_at AT TIME ZONE 'UTC')::date AS ingest_date, count(*)
+            FROM {schema}.{table}
+            WHERE ingested_at < %s
+            GROUP BY ingest_date
+            ORDER BY ingest_date
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (_day_start(before),))
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed listing raw partitions: {exc}") from exc
+
+        return [(row[0], int(row[1])) for row in rows]
+
+    def iter_raw_partition(self, ingest_date: date, chunk_rows: int = _PARTITION_FETCH_ROWS) -> Iterator[OrderBatch]:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        names = [*RAW_ORDER_SCHEMA.names, "batch_hash", "raw_payload"]
+        columns = ", ".join(name if name != "raw_payload" else "raw_payload::text AS raw_payload" for name in names)
+        statement = f"""
+            SELECT {columns}
+            FROM {schema}.{table}
+            WHERE ingested_at >= %s AND ingested_at < %s
+            ORDER BY id
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                # Server-side cursor: a whole day of payloads never has to fit in memory at once.
+                with conn.cursor(name="raw_partition_export") as cur:
+                    cur.execute(statement, (_day_start(ingest_date), _day_start(ingest_date + timedelta(days=1))))
+                    while rows := cur.fetchmany(chunk_rows):
+                        yield _rows_to_batch(rows, names, RAW_ORDER_SCHEMA)
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed exporting raw partition {ingest_date}: {exc}") from exc
+
+    def delete_raw_partition(self, ingest_date: date, expected_rows: int) -> int:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        statement = f"""
+            DELETE FROM {schema}.{table}
+            WHERE ingested_at >= %s AND ingested_at < %s
+        """
+
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(statement, (_day_start(ingest_date), _day_start(ingest_date + timedelta(days=1))))
+                    deleted = cur.rowcount
+                    # Only drop exactly what was exported; anything else means the partition changed underneath us.
+                    if deleted != expected_rows:
+                        conn.rollback()
+                        raise StorageError(
+                            f"Refusing to delete raw partition {ingest_date}: "
+                            f"expected {expected_rows} rows, found {deleted}"
+                        )
+                conn.commit()
+        except StorageError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed deleting raw partition {ingest_date}: {exc}") from exc
+
+        return deleted
+
+    def _write_page(
+        self,
+        cur: "psycopg.Cursor[Any]",
+        batch: OrderBatch,
+        quarantined: OrderBatch,
+        batch_id: UUID,
+        batch_hash: str,
+        ingested_at: datetime,
+    ) -> PageCommit:
+        quarantined_count = self._copy_quarantined(cur, quarantined, batch_id) if quarantined else 0
+        inserted = self._copy_raw(cur, batch, batch_id, batch_hash, ingested_at) if batch else 0
+        return PageCommit(inserted=inserted, quarantined=quarantined_count)
+
+    def _copy_raw(
+        self,
+        cur: "psycopg.Cursor[Any]",
+        batch: OrderBatch,
+        batch_id: UUID,
+        batch_hash: str,
+        ingested_at: datetime,
+    ) -> int:
+        # COPY cannot skip conflicts, so stage the page in a temp table and merge it idempotently.
+        schema = self._settings.raw_schema
+        table = self._settings.raw_orders_table
+        columns = ", ".join(_RAW_COLUMNS)
+        cur.execute(
+            f"""
+            CREATE TEMP TABLE raw_orders_incoming ON COMMIT DROP AS
+            SELECT {columns} FROM {schema}.{table} WITH NO DATA
+            """
+        )
+        with cur.copy(f"COPY raw_orders_incoming ({columns}) FROM STDIN") as copy:
+            for order_id, customer_id, amount, created_at, payload in zip(
+                batch.column("order_id").to_pylist(),
+                batch.column("customer_id").to_pylist(),
+                pc.round(batch.column("amount"), 2).to_pylist(),
+                batch.column("created_at").to_pylist(),
+                batch.to_json_records(),
+                strict=True,
+            ):
+                copy.write_row(
+                    (
+                        order_id,
+                        customer_id,
+                        amount,
+                        created_at,
+                        ingested_at,
+                        batch_id,
+                        batch_hash,
+                        self._settings.source_system,
+                        json_param(payload),
+                    )
+                )
+        cur.execute(
+            f"""
+            INSERT INTO {schema}.{table} ({columns})
+            SELECT {columns} FROM raw_orders_incoming
+            ON CONFLICT (source_order_id, batch_hash) DO NOTHING
+            RETURNING source_order_id, amount
+            """
+        )
+        inserted = cur.fetchall()
+        if inserted:
+            self._record_fingerprint(cur, inserted, batch_id, ingested_at)
+        return len(inserted)
+
+    def _record_fingerprint(
+        self,
+        cur: "psycopg.Cursor[Any]",
+        inserted: list[tuple[Any, ...]],
+        batch_id: UUID,
+        ingested_at: datetime,
+    ) -> None:
+        # Written with the rows it describes, from what was actually inserted, so it cannot drift from raw.
+        # A replay or backfill keeps the fingerprint of the batch as first loaded.
+        fingerprint = fingerprint_rows(
+            [batch_id] * len(inserted),
+            [row[0] for row in inserted],
+            [row[1] for row in inserted],
+        )[batch_id]
+        cur.execute(
+            f"""
+            INSERT INTO {self._settings.raw_schema}.{self._settings.raw_fingerprint_table} (
+                batch_id, source_system, ingested_at, row_count, amount_cents, key_hash
+            )
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (batch_id) DO NOTHING
+            """,
+            (
+                batch_id,
+                self._settings.source_system,
+                ingested_at,
+                fingerprint.row_count,
+                fingerprint.amount_cents,
+                fingerprint.key_hash,
+            ),
+        )
+
+    def batch_fingerprints(
+        self,
+        batch_ids: Sequence[UUID],
+        ingested_from: datetime,
+        ingested_to: datetime,
+        source_system: str | None = None,
+    ) -> dict[UUID, BatchFingerprint]:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_fingerprint_table
+        # The named batches plus every batch loaded inside the window, so batches that never reached
+        # staging are found too.
+        statement = f"""
+            SELECT batch_id, row_count, amount_cents, key_hash
+            FROM {schema}.{table}
+            WHERE batch_id = ANY(%s)
+               OR (ingested_at BETWEEN %s AND %s AND (%s::text IS NULL OR source_system = %s))
+        """
+        try:
+            with connect(self._settings.postgres_dsn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        statement,
+                        (list(batch_ids), ingested_from, ingested_to, source_system, source_system),
+                    )
+                    rows = cur.fetchall()
+        except Exception as exc:  # noqa: BLE001
+            raise StorageError(f"Failed reading raw batch fingerprints: {exc}") from exc
+        return {
+            row[0]: BatchFingerprint(batch_id=row[0], row_count=row[1], amount_cents=row[2], key_hash=row[3])
+            for row in rows
+        }
+
+    def _copy_quarantined(self, cur: "psycopg.Cursor[Any]", quarantined: OrderBatch, batch_id: UUID) -> int:
+        schema = self._settings.raw_schema
+        table = self._settings.raw_quarantine_table
+        statement = f"""
+            COPY {schema}.{table} (
+                source_order_id,
+                reasons,
+                quarantined_at,
+                batch_id,
+                source_system,
+                raw_payload
+            ) FROM STDIN
+        """
+
+        now = datetime.now(UTC)
+        # Rows quarantined for NUL characters must still fit text and JSONB columns.
+        payloads = [_escape_nul(payload) for payload in quarantined.to_json_records()]
+        with cur.copy(statement) as copy:
+            for payload in payloads:
+                reasons = payload.pop(QUARANTINE_REASONS_COLUMN)
+                order_id = payload.get("order_id")
+                copy.write_row(
+                    (
+                        None if order_id is None else str(order_id),
+                        reasons,
+                        now,
+                        batch_id,
+                        self._settings.source_system,
+                        json_param(payload),
+                    )
+                )
+        return len(payloads)
+
+
+def _source_batch(records: OrderBatch | Sequence[Mapping[str, Any]]) -> OrderBatch:
+    try:
+        batch = as_order_batch(records, SOURCE_ORDER_SCHEMA)
+        missing = [name for name in SOURCE_ORDER_SCHEMA.names if batch.column(name).null_count]
+    except (pa.ArrowException, KeyError, ValueError, TypeError) as exc:
+        raise StorageError(f"Invalid order payload shape for raw load: {exc}") from exc
+    if missing:
+        raise StorageError(f"Invalid order payload shape for raw load: null or missing source fields {missing}")
+    return batch
+
+
+def _escape_nul(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.replace("\x00", "\\u0000")
+    if isinstance(value, dict):
+        return {key: _escape_nul(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_escape_nul(item) for item in value]
+    return value
+
+
+def _rows_to_batch(rows: list[tuple[Any, ...]], names: Sequence[str], schema: pa.Schema) -> OrderBatch:
+    columns = list(zip(*rows, strict=True)) if rows else [() for _ in names]
+    return OrderBatch.from_columns(dict(zip(names, columns, strict=True)), schema)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=UTC)
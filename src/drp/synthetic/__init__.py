@@ -0,0 +1 @@
+"""Synthetic order data generation for load tests and benchmarks."""
@@ -0,0 +1,313 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_INGEST_LAG_US = 60_000_000
+_NDJSON_TEMPLATE = '{"order_id":"ord_%09d","customer_id":"cus_%06d","amount":%.2f,"created_at":"%s+00:00"}\n'
+SOURCE_ARROW_SCHEMA = pa.schema(
+    [
+        ("order_id", pa.string()),
+        ("customer_id", pa.string()),
+        ("amount", pa.float64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+_DUPLICATE_PICK_ATTEMPTS = 16
+_DUPLICATE_STREAM = 1
+_CUSTOMER_STREAM = 2
+_AMOUNT_STREAM = 3
+_LATE_STREAM = 4
+_LATE_OFFSET_STREAM = 5
+_NEGATIVE_STREAM = 6
+_PICK_STREAM = 16
+
+
+@dataclass(frozen=True)
+class SyntheticOrdersConfig:
+    rows: int
+    seed: int = 42
+    duplicate_ratio: float = 0.0
+    customer_skew: float = 0.0
+    customer_count: int = 10_000
+    days: int = 7
+    start_at: datetime = datetime(2026, 1, 1, tzinfo=UTC)
+    order_interval_us: int | None = None
+    late_arrival_ratio: float = 0.0
+    late_arrival_max_hours: float = 0.0
+    negative_amount_ratio: float = 0.0
+    source_system: str = "synthetic-orders"
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    name: str
+    duplicate_ratio: float = 0.0
+    late_arrival_ratio: float = 0.0
+    late_arrival_max_hours: float = 0.0
+    customer_skew: float = 0.0
+    negative_amount_ratio: float = 0.0
+
+    def to_config(self, rows: int, seed: int = 42, **overrides: Any) -> SyntheticOrdersConfig:
+        return SyntheticOrdersConfig(
+            rows=rows,
+            seed=seed,
+            duplicate_ratio=self.duplicate_ratio,
+            late_arrival_ratio=self.late_arrival_ratio,
+            late_arrival_max_hours=self.late_arrival_max_hours,
+            customer_skew=self.customer_skew,
+            negative_amount_ratio=self.negative_amount_ratio,
+            **overrides,
+        )
+
+
+LOAD_PROFILES: dict[str, LoadProfile] = {
+    profile.name: profile
+    for profile in (
+        LoadProfile(name="steady"),
+        LoadProfile(name="dedup-pressure", duplicate_ratio=0.3),
+        LoadProfile(name="late-arrivals", late_arrival_ratio=0.2, late_arrival_max_hours=72.0),
+        LoadProfile(name="hot-customers", customer_skew=1.3),
+        LoadProfile(name="dirty-amounts", negative_amount_ratio=0.02),
+        LoadProfile(
+            name="production-like",
+            duplicate_ratio=0.05,
+            late_arrival_ratio=0.05,
+            late_arrival_max_hours=48.0,
+            customer_skew=1.1,
+            negative_amount_ratio=0.001,
+        ),
+    )
+}
+
+
+def get_load_profile(name: str) -> LoadProfile:
+    try:
+        return LOAD_PROFILES[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown load profile '{name}'; expected one of {sorted(LOAD_PROFILES)}") from exc
+
+
+@dataclass(frozen=True)
+class SyntheticOrderChunk:
+    row_offset: int
+    order_index: np.ndarray
+    customer_index: np.ndarray
+    amount: np.ndarray
+    created_at_us: np.ndarray
+    ingested_at_us: np.ndarray
+    batch_id: str
+
+    def __len__(self) -> int:
+        return int(self.order_index.shape[0])
+
+    def to_source_records(self) -> list[dict[str, Any]]:
+        created_at = _iso_strings(self.created_at_us)
+        return [
+            {
+                "order_id": f"ord_{order_idx + 1:09d}",
+                "customer_id": f"cus_{customer_idx + 1:06d}",
+                "amount": amount,
+                "created_at": created,
+            }
+            for order_idx, customer_idx, amount, created in zip(
+                self.order_index.tolist(),
+                self.customer_index.tolist(),
+                self.amount.tolist(),
+                created_at,
+                strict=True,
+            )
+        ]
+
+    def to_ndjson(self) -> bytes:
+        created_at = np.datetime_as_string(self.created_at_us.astype("datetime64[us]"), unit="us").tolist()
+        lines = [
+            _NDJSON_TEMPLATE % row
+            for row in zip(
+                (self.order_index + 1).tolist(),
+                (self.customer_index + 1).tolist(),
+                self.amount.tolist(),
+                created_at,
+                strict=True,
+            )
+        ]
+        return "".join(lines).encode("utf-8")
+
+    def to_arrow(self) -> pa.RecordBatch:
+        return pa.RecordBatch.from_arrays(
+            [
+                _prefixed_ids("ord_", self.order_index + 1, 9),
+                _prefixed_ids("cus_", self.customer_index + 1, 6),
+                pa.array(self.amount, type=pa.float64()),
+                pa.array(self.created_at_us, type=pa.int64()).cast(pa.timestamp("us", tz="UTC")),
+            ],
+            schema=SOURCE_ARROW_SCHEMA,
+        )
+
+    def to_raw_records(self, source_system: str) -> list[dict[str, Any]]:
+        created_at = _iso_strings(self.created_at_us)
+        ingested_at = _iso_strings(self.ingested_at_us)
+        return [
+            {
+                "source_order_id": f"ord_{order_idx + 1:09d}",
+                "customer_id": f"cus_{customer_idx + 1:06d}",
+                "amount": amount,
+                "order_created_at": created,
+                "ingested_at": ingested,
+                "batch_id": self.batch_id,
+                "source_system": source_system,
+            }
+            for order_idx, customer_idx, amount, created, ingested in zip(
+                self.order_index.tolist(),
+                self.customer_index.tolist(),
+                self.amount.tolist(),
+                created_at,
+                ingested_at,
+                strict=True,
+            )
+        ]
+
+
+class SyntheticOrdersGenerator:
+    def __init__(self, config: SyntheticOrdersConfig) -> None:
+        if config.rows < 0:
+            raise ValueError("rows must be >= 0")
+        if not 0.0 <= config.duplicate_ratio < 1.0:
+            raise ValueError("duplicate_ratio must be in [0, 1)")
+        if config.customer_skew < 0.0:
+            raise ValueError("customer_skew must be >= 0")
+        if config.customer_count < 1 or config.days < 1:
+            raise ValueError("customer_count and days must be >= 1")
+        for name in ("late_arrival_ratio", "negative_amount_ratio"):
+            if not 0.0 <= getattr(config, name) <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1]")
+        if config.order_interval_us is not None and config.order_interval_us < 1:
+            raise ValueError("order_interval_us must be >= 1")
+
+        self._config = config
+        self._customer_cdf = _zipf_cdf(config.customer_count, config.customer_skew)
+        self._start_us = int((config.start_at - _EPOCH) / timedelta(microseconds=1))
+        if config.order_interval_us is not None:
+            self._step_us = config.order_interval_us
+        else:
+            self._step_us = (config.days * 86_400_000_000) // max(config.rows, 1)
+
+    @property
+    def config(self) -> SyntheticOrdersConfig:
+        return self._config
+
+    def iter_chunks(self, chunk_size: int = 100_000, start: int = 0) -> Iterator[SyntheticOrderChunk]:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        for offset in range(start, self._config.rows, chunk_size):
+            yield self.page(cursor=offset, size=min(chunk_size, self._config.rows - offset))
+
+    def page(self, cursor: int, size: int) -> SyntheticOrderChunk:
+        if cursor < 0 or size < 0:
+            raise ValueError("cursor and size must be >= 0")
+        return self._build_chunk(cursor, size)
+
+    def source_records(self, chunk_size: int = 100_000) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        for chunk in self.iter_chunks(chunk_size):
+            records.extend(chunk.to_source_records())
+        return records
+
+    def raw_records(self, chunk_size: int = 100_000) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        for chunk in self.iter_chunks(chunk_size):
+            records.extend(chunk.to_raw_records(self._config.source_system))
+        return records
+
+    def _build_chunk(self, offset: int, size: int) -> SyntheticOrderChunk:
+        config = self._config
+        seed = config.seed
+        row_index = np.arange(offset, offset + size, dtype=np.int64)
+        order_index = self._order_index(row_index)
+
+        if self._customer_cdf is None:
+            customer_index = (_uniform(seed, _CUSTOMER_STREAM, order_index) * config.customer_count).astype(np.int64)
+        else:
+            customer_index = np.searchsorted(self._customer_cdf, _uniform(seed, _CUSTOMER_STREAM, order_index))
+        customer_index = np.minimum(customer_index, config.customer_count - 1)
+
+        amount = np.round(5.0 + 495.0 * _uniform(seed, _AMOUNT_STREAM, order_index), 2)
+        if config.negative_amount_ratio > 0.0:
+            is_negative = _uniform(seed, _NEGATIVE_STREAM, order_index) < config.negative_amount_ratio
+            amount = np.where(is_negative, -amount, amount)
+
+        created_at_us = self._start_us + order_index * self._step_us
+        if config.late_arrival_ratio > 0.0:
+            is_late = _uniform(seed, _LATE_STREAM, order_index) < config.late_arrival_ratio
+            max_delay_us = config.late_arrival_max_hours * 3_600_000_000
+            delay_us = (_uniform(seed, _LATE_OFFSET_STREAM, order_index) * max_delay_us).astype(np.int64)
+            created_at_us = np.where(is_late, created_at_us - delay_us, created_at_us)
+
+        ingested_at_us = self._start_us + row_index * self._step_us + _INGEST_LAG_US
+        batch_id = str(UUID(bytes=np.random.default_rng([seed, offset]).bytes(16), version=4))
+
+        return SyntheticOrderChunk(
+            row_offset=offset,
+            order_index=order_index,
+            customer_index=customer_index,
+            amount=amount,
+            created_at_us=created_at_us,
+            ingested_at_us=ingested_at_us,
+            batch_id=batch_id,
+        )
+
+    def _is_duplicate(self, row_index: np.ndarray) -> np.ndarray:
+        ratio = self._config.duplicate_ratio
+        return (_uniform(self._config.seed, _DUPLICATE_STREAM, row_index) < ratio) & (row_index > 0)
+
+    def _order_index(self, row_index: np.ndarray) -> np.ndarray:
+        # Every row is a pure function of (seed, row index): duplicates re-deliver an earlier
+        # original row, found by rejection sampling so no state is carried between chunks.
+        order_index = row_index.copy()
+        pending = self._is_duplicate(row_index)
+        for attempt in range(_DUPLICATE_PICK_ATTEMPTS):
+            if not pending.any():
+                break
+            candidates = (_uniform(self._config.seed, _PICK_STREAM + attempt, row_index) * row_index).astype(np.int64)
+            accepted = pending & ~self._is_duplicate(candidates)
+            order_index = np.where(accepted, candidates, order_index)
+            pending &= ~accepted
+        return np.where(pending, 0, order_index)
+
+
+def _zipf_cdf(count: int, skew: float) -> np.ndarray | None:
+    if skew == 0.0:
+        return None
+    weights = 1.0 / np.power(np.arange(1, count + 1, dtype=np.float64), skew)
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _prefixed_ids(prefix: str, values: np.ndarray, width: int) -> pa.Array:
+    digits = pc.utf8_lpad(pc.cast(pa.array(values, type=pa.int64()), pa.string()), width=width, padding="0")
+    return pc.binary_join_element_wise(prefix, digits, "")
+
+
+def _iso_strings(values_us: np.ndarray) -> list[str]:
+    strings = np.datetime_as_string(values_us.astype("datetime64[us]"), unit="us")
+    return [f"{value}+00:00" for value in strings.tolist()]
+
+
+def _uniform(seed: int, stream: int, index: np.ndarray) -> np.ndarray:
+    key = np.uint64((seed * 0x9E3779B97F4A7C15 + stream * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF)
+    with np.errstate(over="ignore"):
+        mixed = _splitmix64(index.astype(np.uint64) ^ key)
+    return (mixed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
@@ -1,3 +1,6 @@
+from collections.abc import Sequence
+
+from drp.storage.duckdb.order_marts import ORDER_MART_GRAINS, MartGrain
 from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
 
 
@@ -7,3 +10,6 @@ class OrdersAnalyticsService:
 
     def refresh_daily_metrics(self) -> int:
         return self._warehouse.refresh_daily_metrics()
+
+    def refresh_marts(self, grains: Sequence[MartGrain] = ORDER_MART_GRAINS, shadow: bool = False) -> dict[str, int]:
+        return self._warehouse.refresh_marts(grains, shadow=shadow)
@@ -0,0 +1 @@
+"""Partitioned recompute of staging and analytics."""
@@ -1,20 +1,69 @@
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date
 from typing import Any
 
-from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from drp.core.order_batch import OrderBatch, as_order_batch
+from drp.datasets.registry import ORDERS, DatasetSpec
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository, PartitionRefresh
 
 
 class OrdersStagingService:
-    def __init__(self, warehouse: DuckDbWarehouseRepository) -> None:
+    def __init__(self, warehouse: DuckDbWarehouseRepository, dataset: DatasetSpec = ORDERS) -> None:
         self._warehouse = warehouse
+        self._dataset = dataset
+
+    def build_staging(self, raw_records: OrderBatch | Sequence[Mapping[str, Any]]) -> int:
+        return self._warehouse.replace_staging_orders(self.clean(raw_records))
+
+    def build_staging_chunked(
+        self,
+        raw_chunks: Iterable[OrderBatch | Sequence[Mapping[str, Any]]],
+        memory_limit: str | None = None,
+        shadow: bool = False,
+    ) -> int:
+        return self._warehouse.replace_staging_orders_chunked(raw_chunks, memory_limit=memory_limit, shadow=shadow)
+
+    def merge_partition(
+        self,
+        raw_records: OrderBatch | Sequence[Mapping[str, Any]],
+        start: date,
+        end: date,
+    ) -> PartitionRefresh:
+        # raw_records carries every version of the partition's orders, so the latest one is staged even
+        # when a correction moved it to a day outside [start, end]. Every key in it is replaced, including
+        # keys whose latest version clean() drops, so an older version cannot stay staged in its place.
+        batch = as_order_batch(raw_records, self._dataset.staging_schema)
+        return self._warehouse.merge_staging_partition(
+            self.clean(batch),
+            start=start,
+            end=end,
+            replaced_keys=batch.table.select(list(self._dataset.key_columns)),
+        )
+
+    def clean(self, raw_records: OrderBatch | Sequence[Mapping[str, Any]]) -> OrderBatch:
+        dataset = self._dataset
+        batch = as_order_batch(raw_records, dataset.staging_schema)
+        if not batch:
+            return batch
+
+        # Keep latest version of each key; the stable sort keeps the first-seen row on ties.
+        order = pc.sort_indices(
+            batch.table,
+            sort_keys=[*((key, "ascending") for key in dataset.key_columns), (dataset.version_column, "descending")],
+        )
+        ordered = batch.take(order)
+        key_changed = pa.array([False] * (len(ordered) - 1), type=pa.bool_())
+        for key in dataset.key_columns:
+            values = ordered.column(key).combine_chunks()
+            changed = pc.fill_null(pc.not_equal(values.slice(1), values.slice(0, len(values) - 1)), True)
+            key_changed = pc.or_(key_changed, changed)
+        first_of_key = pa.concat_arrays([pa.array([True]), key_changed])
+        deduped = ordered.filter(first_of_key)
+
+        for column in dataset.non_negative_columns:
+            deduped = deduped.filter(pc.greater_equal(deduped.column(column), 0))
+        return deduped
 
-    def build_staging(self, raw_records: list[dict[str, Any]]) -> int:
-        # Keep latest version of each source order ID.
-        deduped: dict[str, dict[str, Any]] = {}
-        for row in raw_records:
-            key = str(row["source_order_id"])
-            existing = deduped.get(key)
-            if existing is None or str(row["ingested_at"]) > str(existing["ingested_at"]):
-                deduped[key] = row
-
-        cleaned = [record for record in deduped.values() if float(record["amount"]) >= 0]
-        return self._warehouse.replace_staging_orders(cleaned)
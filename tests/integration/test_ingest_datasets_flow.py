@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pytest
+
+from drp.config.settings import Settings
+from drp.core.batch_fingerprint import fingerprint_rows
+from drp.core.order_batch import RAW_ORDER_SCHEMA, OrderBatch
+from drp.orchestration.prefect.flows import ingest_datasets_flow as flow_module
+from drp.quality import reconciliation
+from drp.storage.local.batch_spool import ArrowBatchSpool
+
+RAW_RECORDS = [
+    {
+        "source_order_id": f"ord_{idx:03d}",
+        "customer_id": f"cus_{idx % 2:03d}",
+        "amount": 5.0 + idx,
+        "order_created_at": f"2026-02-2{idx % 2}T08:00:00+00:00",
+        "ingested_at": "2026-02-21T09:00:00+00:00",
+        "batch_id": "22222222-2222-2222-2222-222222222222",
+        "source_system": "partner-api",
+    }
+    for idx in range(4)
+]
+
+
+class FakeRawOrdersRepository:
+    def __init__(self, settings: Any) -> None:
+        self._settings = settings
+
+    def batch_fingerprints(
+        self, batch_ids: Any, ingested_from: Any, ingested_to: Any, source_system: Any = None
+    ) -> dict:
+        return fingerprint_rows(
+            [record["batch_id"] for record in RAW_RECORDS],
+            [record["source_order_id"] for record in RAW_RECORDS],
+            [record["amount"] for record in RAW_RECORDS],
+        )
+
+
+def test_stage_dataset_stages_a_registry_file_dataset(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    registry_path = tmp_path / "datasets.json"
+    registry_path.write_text(
+        json.dumps([{"name": "partner_orders", "extends": "orders", "source_system": "partner-api"}]),
+        encoding="utf-8",
+    )
+    settings = Settings(
+        DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"),
+        BATCH_SPOOL_DIR=str(tmp_path / "spool"),
+        DATASET_REGISTRY_PATH=str(registry_path),
+        OBJECT_STORE_ENABLED=False,
+    )
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(reconciliation, "RawOrdersRepository", FakeRawOrdersRepository)
+    raw_batch = ArrowBatchSpool(settings).write_batches(
+        [OrderBatch.from_raw_records(RAW_RECORDS)], name="partner_orders-raw", schema=RAW_ORDER_SCHEMA
+    )
+
+    summary = flow_module.stage_dataset.fn("partner_orders", raw_batch=raw_batch)
+
+    # The dataset has no marts, so only its own staging table is built, gated and promoted.
+    assert summary == {"staged_rows": 4, "mart_rows": 0, "checked_rows": 4, "mismatched_batches": []}
+    with duckdb.connect(settings.duckdb_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM staging.partner_orders").fetchone() == (4,)
+        tables = {row[0] for row in conn.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+    assert "orders" not in tables
+    assert "partner_orders__next" not in tables
+
+
+def test_stage_dataset_refuses_a_dataset_that_owns_marts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(
+        DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"),
+        BATCH_SPOOL_DIR=str(tmp_path / "spool"),
+        OBJECT_STORE_ENABLED=False,
+    )
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    raw_batch = ArrowBatchSpool(settings).write_batches(
+        [OrderBatch.from_raw_records(RAW_RECORDS)], name="orders-raw", schema=RAW_ORDER_SCHEMA
+    )
+
+    # Orders and their marts are staged by stage-and-validate only, so the live tables are never touched here.
+    with pytest.raises(ValueError, match="stage-and-validate"):
+        flow_module.stage_dataset.fn("orders", raw_batch=raw_batch)
+    assert not Path(settings.duckdb_path).exists()
@@ -0,0 +1,106 @@
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from drp.storage.duckdb.order_sketch_repository import OrderSketchRepository
+from drp.storage.duckdb.warehouse_access import writer_lock
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+
+
+class DummySettings:
+    duckdb_writer_lock_timeout_seconds = 30.0
+    duckdb_snapshot_retain = 3
+
+    def __init__(self, duckdb_path: str) -> None:
+        self.duckdb_path = duckdb_path
+
+
+def _orders(batch: int, day: int, count: int, offset: int = 0) -> list[dict]:
+    return [
+        {
+            "source_order_id": f"ord_{batch}_{index}",
+            "customer_id": f"cus_{index % 40 + offset}",
+            "amount": float(index % 100),
+            "order_created_at": f"2026-02-{day:02d}T08:00:00+00:00",
+            "ingested_at": f"2026-02-{day:02d}T09:00:00+00:00",
+            "batch_id": f"00000000-0000-0000-0000-00000000000{batch}",
+            "source_system": "test-source",
+        }
+        for index in range(count)
+    ]
+
+
+def _daily(settings: DummySettings) -> dict[date, tuple]:
+    with duckdb.connect(settings.duckdb_path) as conn:
+        rows = conn.execute(
+            "SELECT order_date, order_count, distinct_customers, amount_p50, amount_p99 FROM analytics.daily_order_sketches"
+        ).fetchall()
+    return {row[0]: row[1:] for row in rows}
+
+
+def test_sketch_refresh_merges_only_new_batches_into_existing_days(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    sketches = OrderSketchRepository(settings)  # type: ignore[arg-type]
+    first = _orders(1, day=2, count=200) + _orders(2, day=4, count=100)
+    warehouse.replace_staging_orders(first)
+
+    initial = sketches.refresh()
+    unchanged = sketches.refresh()
+    warehouse.replace_staging_orders(first + _orders(3, day=2, count=100, offset=20))
+    incremental = sketches.refresh()
+
+    assert (initial.batch_sketches, initial.days_refreshed) == (2, 2)
+    assert (unchanged.batch_sketches, unchanged.days_refreshed) == (0, 0)
+    assert (incremental.batch_sketches, incremental.days_refreshed) == (1, 1)
+    daily = _daily(settings)
+    assert daily[date(2026, 2, 2)][:2] == (300, 60)
+    assert daily[date(2026, 2, 2)][2] == pytest.approx(49.5, abs=2)
+    assert daily[date(2026, 2, 4)][:2] == (100, 40)
+    assert daily[date(2026, 2, 4)][3] == pytest.approx(98, abs=1.5)
+
+
+def test_sketch_rollups_merge_days_and_drop_batches_gone_from_staging(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    sketches = OrderSketchRepository(settings)  # type: ignore[arg-type]
+    warehouse.replace_staging_orders(
+        _orders(1, day=1, count=50) + _orders(2, day=4, count=50, offset=30) + _orders(3, day=9, count=10)
+    )
+    sketches.refresh()
+
+    weekly = sketches.read_rollup(date(2026, 2, 1), date(2026, 2, 28), grain="week")
+    monthly = sketches.read_rollup(date(2026, 2, 1), date(2026, 2, 28), grain="month")
+    warehouse.replace_staging_orders(_orders(1, day=1, count=50))
+    refreshed = sketches.refresh()
+
+    assert [(row["period_start"], row["order_count"], row["distinct_customers"]) for row in weekly] == [
+        (date(2026, 1, 26), 50, 40),
+        (date(2026, 2, 2), 50, 40),
+        (date(2026, 2, 9), 10, 10),
+    ]
+    assert [(row["period_start"], row["order_count"]) for row in monthly] == [(date(2026, 2, 1), 110)]
+    assert monthly[0]["distinct_customers"] == pytest.approx(70, abs=2)
+    assert refreshed.days_refreshed == 2
+    assert list(_daily(settings)) == [date(2026, 2, 1)]
+
+
+def test_sketch_rollup_reads_without_the_writer_lock(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    settings.duckdb_writer_lock_timeout_seconds = 0.2
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    sketches = OrderSketchRepository(settings)  # type: ignore[arg-type]
+    warehouse.replace_staging_orders(_orders(1, day=1, count=10))
+    warehouse.publish_snapshot()
+
+    # A snapshot published before the first sketch refresh has nothing to roll up, even mid-write.
+    with writer_lock(settings.duckdb_path, timeout_seconds=1.0):
+        assert sketches.read_rollup(date(2026, 2, 1), date(2026, 2, 28)) == []
+
+    sketches.refresh()
+    warehouse.publish_snapshot()
+    with writer_lock(settings.duckdb_path, timeout_seconds=1.0):
+        [week] = sketches.read_rollup(date(2026, 2, 1), date(2026, 2, 28))
+    assert week["order_count"] == 10
@@ -0,0 +1,164 @@
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pytest
+
+from drp.config.settings import Settings
+from drp.core.order_batch import OrderBatch
+from drp.observability.flow_monitor import FlowExecutionContext
+from drp.orchestration.prefect.flows import recompute_orders_flow as flow_module
+from drp.orchestration.prefect.flows import stage_and_validate_orders_flow as stage_module
+from drp.quality.great_expectations.orders_quality_validator import QualityResult
+from drp.storage.duckdb.warehouse_access import snapshot_dir
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+from drp.transform.staging.orders_staging_service import OrdersStagingService
+
+
+def _raw(order_id: str, created_day: int, amount: float, ingested_hour: int) -> dict[str, Any]:
+    return {
+        "source_order_id": order_id,
+        "customer_id": "cus_001",
+        "amount": amount,
+        "order_created_at": f"2026-02-{created_day:02d}T08:00:00+00:00",
+        "ingested_at": f"2026-02-22T{ingested_hour:02d}:00:00+00:00",
+        "batch_id": "11111111-1111-1111-1111-111111111111",
+        "source_system": "test-source",
+    }
+
+
+ORIGINAL = [_raw("ord_1", 20, 10.0, 1), _raw("ord_2", 20, 20.0, 1), _raw("ord_3", 21, 30.0, 1), _raw("ord_4", 22, 40.0, 1)]
+# Late corrections: ord_1 moved from the 20th to the 21st, ord_4 repriced.
+CORRECTIONS = [_raw("ord_1", 21, 15.0, 5), _raw("ord_4", 22, 45.0, 5)]
+
+
+class FakeRawOrdersRepository:
+    failing_days: set[date] = set()
+    versions: list[dict[str, Any]] = ORIGINAL + CORRECTIONS
+
+    def __init__(self, settings: Any) -> None:
+        self._settings = settings
+
+    def fetch_raw_order_versions(
+        self, created_from: datetime, created_to: datetime, source_order_ids: Any = ()
+    ) -> OrderBatch:
+        if created_from.date() in self.failing_days:
+            raise RuntimeError("raw store unavailable")
+        versions = OrderBatch.from_raw_records(self.versions)
+        touched = {
+            row["source_order_id"] for row in versions if created_from <= row["order_created_at"] < created_to
+        } | set(source_order_ids)
+        return OrderBatch.from_raw_records([row for row in versions if row["source_order_id"] in touched])
+
+
+class FakeFlowMonitor:
+    events: list[tuple[str, dict[str, Any]]] = []
+
+    def __init__(self, settings: Any) -> None:
+        self._settings = settings
+
+    def start(self, flow_name: str) -> FlowExecutionContext:
+        return FlowExecutionContext(flow_name=flow_name, flow_run_id="test-run", started_at="2026-02-22T00:00:00+00:00")
+
+    def success(self, ctx: FlowExecutionContext, records_processed: int | None, metadata: dict[str, Any]) -> None:
+        self.events.append(("success", metadata))
+
+    def failure(self, ctx: FlowExecutionContext, error: Exception, metadata: dict[str, Any]) -> None:
+        self.events.append(("failure", metadata))
+
+
+@pytest.fixture
+def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Settings:
+    settings = Settings(DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"), OBJECT_STORE_ENABLED=False)
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(stage_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", FakeRawOrdersRepository)
+    monkeypatch.setattr(flow_module, "FlowMonitor", FakeFlowMonitor)
+    monkeypatch.setattr(
+        flow_module,
+        "recompute_orders_partition",
+        flow_module.recompute_orders_partition.with_options(retries=0),
+    )
+    warehouse = DuckDbWarehouseRepository(settings)
+    OrdersStagingService(warehouse=warehouse).build_staging(OrderBatch.from_raw_records(ORIGINAL))
+    warehouse.refresh_daily_metrics()
+    return settings
+
+
+def _metrics(settings: Settings) -> dict[date, tuple[int, float]]:
+    with duckdb.connect(settings.duckdb_path) as conn:
+        rows = conn.execute("SELECT order_date, total_orders, total_amount FROM analytics.daily_order_metrics").fetchall()
+    return {row[0]: (int(row[1]), float(row[2])) for row in rows}
+
+
+def test_recompute_applies_corrections_for_the_requested_partitions(settings: Settings) -> None:
+    result = flow_module.recompute_orders_flow(start_date=date(2026, 2, 20), end_date=date(2026, 2, 20))
+
+    assert result["partitions"] == 1
+    assert result["failed_partitions"] == []
+    assert FakeFlowMonitor.events[-1][1]["quality"]["success"] is True
+    assert len(list(snapshot_dir(settings.duckdb_path).glob("warehouse-*.duckdb"))) == 1
+    with duckdb.connect(settings.duckdb_path) as conn:
+        staged = conn.execute("SELECT source_order_id, amount, order_created_at FROM staging.orders ORDER BY 1").fetchall()
+    assert staged[0] == ("ord_1", 15.0, datetime(2026, 2, 21, 8))
+    assert len(staged) == 4
+    # The moved order updates the day it left and the day it landed on; the 22nd is outside the range.
+    assert _metrics(settings) == {
+        date(2026, 2, 20): (1, 20.0),
+        date(2026, 2, 21): (2, 45.0),
+        date(2026, 2, 22): (1, 40.0),
+    }
+
+
+def test_failed_partition_is_reported_and_successful_ones_stay_committed(settings: Settings) -> None:
+    FakeRawOrdersRepository.failing_days = {date(2026, 2, 21)}
+    try:
+        with pytest.raises(RuntimeError, match="2026-02-21"):
+            flow_module.recompute_orders_flow(start_date=date(2026, 2, 20), end_date=date(2026, 2, 22))
+    finally:
+        FakeRawOrdersRepository.failing_days = set()
+
+    assert FakeFlowMonitor.events[-1][0] == "failure"
+    assert FakeFlowMonitor.events[-1][1]["failed_partitions"] == ["2026-02-21"]
+    assert _metrics(settings)[date(2026, 2, 22)] == (1, 45.0)
+
+    flow_module.recompute_orders_flow(start_date=date(2026, 2, 21), end_date=date(2026, 2, 21))
+
+    assert FakeFlowMonitor.events[-1][0] == "success"
+    assert _metrics(settings)[date(2026, 2, 21)] == (2, 45.0)
+
+
+def test_order_whose_latest_version_is_rejected_leaves_no_stale_version_staged(settings: Settings) -> None:
+    # ord_1 is corrected onto the 21st with a negative amount, which staging rejects.
+    FakeRawOrdersRepository.versions = [*ORIGINAL, _raw("ord_1", 21, -5.0, 5)]
+    try:
+        flow_module.recompute_orders_flow(start_date=date(2026, 2, 21), end_date=date(2026, 2, 21))
+    finally:
+        FakeRawOrdersRepository.versions = ORIGINAL + CORRECTIONS
+
+    with duckdb.connect(settings.duckdb_path) as conn:
+        staged = conn.execute("SELECT source_order_id FROM staging.orders ORDER BY 1").fetchall()
+    assert staged == [("ord_2",), ("ord_3",), ("ord_4",)]
+    # Its old version on the 20th, outside the partition, is gone from the metrics too.
+    assert _metrics(settings)[date(2026, 2, 20)] == (1, 20.0)
+
+
+def test_recompute_failing_the_quality_gate_is_not_published(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class FailingValidator:
+        def __init__(self, settings: Any) -> None:
+            self._settings = settings
+
+        def validate_staging_orders(self, table: str | None = None) -> QualityResult:
+            assert table == "staging.orders"
+            return QualityResult(success=False, checked_rows=4, failed_expectations=1)
+
+    monkeypatch.setattr(stage_module, "OrdersQualityValidator", FailingValidator)
+
+    with pytest.raises(RuntimeError, match="Data quality gate failed"):
+        flow_module.recompute_orders_flow(start_date=date(2026, 2, 20), end_date=date(2026, 2, 20))
+
+    assert FakeFlowMonitor.events[-1][0] == "failure"
+    assert not list(snapshot_dir(settings.duckdb_path).glob("warehouse-*.duckdb"))
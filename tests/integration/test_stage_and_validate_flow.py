@@ -0,0 +1,188 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pytest
+
+from drp.config.settings import Settings
+from drp.core.batch_fingerprint import fingerprint_rows
+from drp.core.order_batch import OrderBatch
+from drp.observability import task_profiler
+from drp.observability.flow_monitor import FlowExecutionContext
+from drp.orchestration.prefect.flows import stage_and_validate_orders_flow as flow_module
+from drp.storage.duckdb.warehouse_access import snapshot_dir
+
+RAW_RECORDS = [
+    {
+        "source_order_id": f"ord_{idx:03d}",
+        "customer_id": f"cus_{idx % 3:03d}",
+        "amount": 10.0 + idx,
+        "order_created_at": f"2026-02-2{idx % 2}T08:00:00+00:00",
+        "ingested_at": "2026-02-21T09:00:00+00:00",
+        "batch_id": "11111111-1111-1111-1111-111111111111",
+        "source_system": "test-source",
+    }
+    for idx in range(6)
+]
+
+
+class FakeRawOrdersRepository:
+    records = RAW_RECORDS
+
+    def __init__(self, settings: Any) -> None:
+        self._settings = settings
+
+    def iter_recent_raw_orders(self, limit: int, chunk_rows: int) -> Iterator[OrderBatch]:
+        # Smaller than any budget-derived chunk so the flow always sees several chunks.
+        step = min(chunk_rows, 4)
+        for offset in range(0, min(limit, len(self.records)), step):
+            yield OrderBatch.from_raw_records(self.records[offset : min(offset + step, limit)])
+
+    def batch_fingerprints(self, batch_ids: Any, ingested_from: Any, ingested_to: Any, source_system: Any = None) -> dict:
+        return fingerprint_rows(
+            [record["batch_id"] for record in RAW_RECORDS],
+            [record["source_order_id"] for record in RAW_RECORDS],
+            [record["amount"] for record in RAW_RECORDS],
+        )
+
+
+class NullCustomerRawOrdersRepository(FakeRawOrdersRepository):
+    records = [{**record, "customer_id": None} for record in RAW_RECORDS[:3]]
+
+
+class LossyRawOrdersRepository(FakeRawOrdersRepository):
+    # One committed raw row never reaches the warehouse; the raw fingerprint still counts it.
+    records = RAW_RECORDS[:2] + RAW_RECORDS[3:]
+
+
+class FakeFlowMonitor:
+    events: list[tuple[str, dict[str, Any]]] = []
+
+    def __init__(self, settings: Any) -> None:
+        self._settings = settings
+
+    def start(self, flow_name: str) -> FlowExecutionContext:
+        return FlowExecutionContext(flow_name=flow_name, flow_run_id="test-run", started_at="2026-02-21T00:00:00+00:00")
+
+    def success(self, ctx: FlowExecutionContext, records_processed: int | None, metadata: dict[str, Any]) -> None:
+        self.events.append(("success", metadata))
+
+    def failure(self, ctx: FlowExecutionContext, error: Exception, metadata: dict[str, Any]) -> None:
+        self.events.append(("failure", metadata))
+
+
+def test_stage_and_validate_flow_runs_task_dag(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(
+        DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"),
+        BATCH_SPOOL_DIR=str(tmp_path / "spool"),
+        OBJECT_STORE_ENABLED=False,
+    )
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", FakeRawOrdersRepository)
+    monkeypatch.setattr(flow_module, "FlowMonitor", FakeFlowMonitor)
+
+    result = flow_module.stage_and_validate_orders_flow(limit=6)
+
+    assert result["staged_rows"] == 6
+    assert result["analytics_rows"] == 2
+    assert result["quality_success"] is True
+    assert result["analytics_archive_uri"] is None
+    assert result["reconciliation"] == {
+        "success": True,
+        "batch_statuses": {"matched": 1},
+        "mismatched_batches": [],
+        "mismatched_marts": [],
+    }
+    assert FakeFlowMonitor.events[-1][0] == "success"
+    assert FakeFlowMonitor.events[-1][1]["raw_records"] == 6
+    assert FakeFlowMonitor.events[-1][1]["memory_budget_bytes"] == settings.stage_memory_budget_mb * 1024 * 1024
+    assert FakeFlowMonitor.events[-1][1]["peak_rss_bytes"] > 0
+
+    with duckdb.connect(settings.duckdb_path) as conn:
+        row = conn.execute("SELECT SUM(total_orders) FROM analytics.daily_order_metrics").fetchone()
+    assert row is not None
+    assert int(row[0]) == 6
+    assert len(list(snapshot_dir(settings.duckdb_path).glob("warehouse-*.duckdb"))) == 1
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_stage_and_validate_flow_profiles_each_task_when_requested(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(
+        DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"),
+        BATCH_SPOOL_DIR=str(tmp_path / "spool"),
+        OBJECT_STORE_ENABLED=False,
+        PROFILE_OUTPUT_DIR=str(tmp_path / "profiles"),
+        PROFILE_SAMPLE_INTERVAL_SECONDS=0.001,
+    )
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(task_profiler, "get_settings", lambda: settings)
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", FakeRawOrdersRepository)
+    monkeypatch.setattr(flow_module, "FlowMonitor", FakeFlowMonitor)
+
+    flow_module.stage_and_validate_orders_flow(limit=6, profile=True)
+
+    [run_dir] = (tmp_path / "profiles").iterdir()
+    assert run_dir.name.startswith("flow_run_id=")
+    artifacts = sorted(path.name for path in run_dir.iterdir())
+    # Every task is sampled; analytics, quality and reconcile can overlap, and only one of them gets cProfile.
+    pstats = {name.removesuffix(".pstats") for name in artifacts if name.endswith(".pstats")}
+    assert len([name for name in artifacts if name.endswith(".folded")]) == 7
+    assert {name.removesuffix(".stats.txt") for name in artifacts if name.endswith(".stats.txt")} == pstats
+    assert len(pstats) >= 5
+    [staging_stats] = [name for name in artifacts if name.startswith("build-staging-orders") and name.endswith(".txt")]
+    assert "build_staging" in (run_dir / staging_stats).read_text(encoding="utf-8")
+    assert {name.rsplit(".", 1)[-1] for name in artifacts} == {"pstats", "txt", "folded"}
+
+
+def test_failed_quality_gate_keeps_live_tables(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(
+        DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"),
+        BATCH_SPOOL_DIR=str(tmp_path / "spool"),
+        OBJECT_STORE_ENABLED=False,
+    )
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", FakeRawOrdersRepository)
+    monkeypatch.setattr(flow_module, "FlowMonitor", FakeFlowMonitor)
+    flow_module.stage_and_validate_orders_flow(limit=6)
+
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", NullCustomerRawOrdersRepository)
+    with pytest.raises(Exception, match="Data quality gate failed"):
+        flow_module.stage_and_validate_orders_flow(limit=3)
+
+    assert FakeFlowMonitor.events[-1][0] == "failure"
+    with duckdb.connect(settings.duckdb_path) as conn:
+        live = conn.execute("SELECT COUNT(*) FROM staging.orders").fetchone()
+        shadow = conn.execute("SELECT COUNT(*) FROM staging.orders__next WHERE customer_id IS NULL").fetchone()
+        metrics = conn.execute("SELECT SUM(total_orders) FROM analytics.daily_order_metrics").fetchone()
+    assert live == (6,)
+    assert shadow == (3,)
+    assert metrics == (6,)
+
+
+def test_reconciliation_mismatch_pinpoints_the_batch_and_keeps_live_tables(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(
+        DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"),
+        BATCH_SPOOL_DIR=str(tmp_path / "spool"),
+        OBJECT_STORE_ENABLED=False,
+    )
+    monkeypatch.setattr(flow_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", FakeRawOrdersRepository)
+    monkeypatch.setattr(flow_module, "FlowMonitor", FakeFlowMonitor)
+    flow_module.stage_and_validate_orders_flow(limit=6)
+
+    monkeypatch.setattr(flow_module, "RawOrdersRepository", LossyRawOrdersRepository)
+    with pytest.raises(Exception, match="Layer reconciliation failed.*11111111-1111-1111-1111-111111111111"):
+        flow_module.stage_and_validate_orders_flow(limit=6)
+
+    with duckdb.connect(settings.duckdb_path) as conn:
+        live = conn.execute("SELECT COUNT(*) FROM staging.orders").fetchone()
+        fingerprint = conn.execute(
+            "SELECT staged_rows, excluded_rows FROM staging.orders_fingerprints__next"
+        ).fetchone()
+    assert live == (6,)
+    assert fingerprint == (5, 0)
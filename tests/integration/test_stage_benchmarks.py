@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from drp.benchmarks.stage_benchmarks import StageBenchmarkRunner, build_report
+from drp.config.settings import Settings
+from drp.synthetic.orders_generator import SyntheticOrdersConfig
+
+
+def test_stage_benchmarks_report_local_stages(tmp_path: Path) -> None:
+    config = SyntheticOrdersConfig(rows=300, seed=11, duplicate_ratio=0.1)
+    runner = StageBenchmarkRunner(
+        settings=Settings(),
+        config=config,
+        work_dir=tmp_path,
+        include_postgres=False,
+        chunk_size=64,
+    )
+
+    results = runner.run()
+    by_stage = {result.stage: result for result in results}
+
+    assert by_stage["insert_raw_orders"].status == "skipped"
+    assert by_stage["fetch_recent_raw_orders"].status == "skipped"
+    for stage in (
+        "build_staging",
+        "replace_staging_orders",
+        "refresh_daily_metrics",
+        "validate_staging_orders",
+        "export_daily_metrics_to_parquet",
+        "archive_raw_batch",
+    ):
+        assert by_stage[stage].status == "ok", by_stage[stage].detail
+        assert by_stage[stage].rows > 0
+        assert by_stage[stage].peak_rss_mb > 0
+
+    # Each stage reports the rows it read or wrote, not the size of the generated dataset.
+    assert by_stage["build_staging"].rows == 300
+    assert by_stage["archive_raw_batch"].rows == 300
+    assert 0 < by_stage["replace_staging_orders"].rows < 300
+    assert by_stage["refresh_daily_metrics"].rows == by_stage["replace_staging_orders"].rows
+    assert by_stage["export_daily_metrics_to_parquet"].rows <= config.days + 1
+    assert not list((tmp_path / "spool").glob("*.arrow"))
+
+    report = build_report(config, results)
+    assert report["config"]["rows"] == 300
+    assert len(report["results"]) == len(results)
@@ -1,14 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date
 from pathlib import Path
 
 import duckdb
+import pytest
 
+from drp.core.batch_fingerprint import fingerprint_rows
+from drp.core.exceptions import StorageError
+from drp.datasets.registry import ORDERS
 from drp.quality.great_expectations.orders_quality_validator import OrdersQualityValidator
+from drp.quality.reconciliation import MATCHED, reconcile_batches, reconcile_marts
+from drp.storage.duckdb.warehouse_access import snapshot_connection
 from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
 from drp.transform.analytics.orders_analytics_service import OrdersAnalyticsService
 from drp.transform.staging.orders_staging_service import OrdersStagingService
 
 
 class DummySettings:
+    duckdb_writer_lock_timeout_seconds = 30.0
+    duckdb_snapshot_retain = 3
+    stage_memory_budget_mb = 512
+
     def __init__(self, duckdb_path: str) -> None:
         self.duckdb_path = duckdb_path
 
@@ -56,3 +69,248 @@ def test_stage_analytics_quality_integration(tmp_path: Path) -> None:
         ).fetchone()
     assert row is not None
     assert int(row[0]) == 2
+
+
+def test_concurrent_warehouse_writers_are_serialized(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    records = [
+        {
+            "source_order_id": f"ord_{idx:03d}",
+            "customer_id": "cus_001",
+            "amount": 1.0,
+            "order_created_at": "2026-02-20T08:00:00+00:00",
+            "ingested_at": "2026-02-20T08:01:00+00:00",
+            "batch_id": "11111111-1111-1111-1111-111111111111",
+            "source_system": "test-source",
+        }
+        for idx in range(50)
+    ]
+    warehouse.replace_staging_orders(records)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(warehouse.refresh_daily_metrics) for _ in range(4)]
+        futures += [pool.submit(warehouse.replace_staging_orders, records) for _ in range(4)]
+        results = [future.result() for future in futures]
+
+    assert results[:4] == [1, 1, 1, 1]
+    assert results[4:] == [50, 50, 50, 50]
+
+
+def test_refresh_marts_builds_every_grain_from_one_scan(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    records = [
+        {
+            "source_order_id": f"ord_{idx:03d}",
+            "customer_id": f"cus_{idx % 2}",
+            "amount": float(idx),
+            "order_created_at": f"2026-02-{20 + idx % 3}T0{idx % 2 + 8}:15:00+00:00",
+            "ingested_at": "2026-02-23T08:01:00+00:00",
+            "batch_id": "11111111-1111-1111-1111-111111111111",
+            "source_system": "api" if idx < 4 else "backfill",
+        }
+        for idx in range(6)
+    ]
+    warehouse.replace_staging_orders(records)
+
+    counts = OrdersAnalyticsService(warehouse=warehouse).refresh_marts()
+
+    assert counts == {
+        "daily_order_metrics": 3,
+        "hourly_order_metrics": 6,
+        "customer_order_metrics": 2,
+        "source_system_daily_metrics": 5,
+    }
+    with duckdb.connect(settings.duckdb_path) as conn:
+        totals = {
+            table: conn.execute(f"SELECT SUM(total_orders), SUM(total_amount) FROM analytics.{table}").fetchone()
+            for table in counts
+        }
+        customers = conn.execute(
+            "SELECT customer_id, total_orders, total_amount FROM analytics.customer_order_metrics ORDER BY 1"
+        ).fetchall()
+        refreshed = conn.execute(
+            "SELECT COUNT(DISTINCT last_refreshed_at) FROM ("
+            + " UNION ALL ".join(f"SELECT last_refreshed_at FROM analytics.{table}" for table in counts)
+            + ")"
+        ).fetchone()[0]
+    assert set(totals.values()) == {(6, 15.0)}
+    assert customers == [("cus_0", 3, 6.0), ("cus_1", 3, 9.0)]
+    # Every mart is written in the same transaction, so they share one refresh timestamp.
+    assert refreshed == 1
+
+
+def test_chunked_staging_matches_in_memory_dedup(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    service = OrdersStagingService(warehouse=warehouse)
+    raw_records = [
+        {
+            "source_order_id": f"ord_{idx % 7:03d}",
+            "customer_id": f"cus_{idx:03d}",
+            "amount": -1.0 if idx == 19 else float(idx),
+            "order_created_at": "2026-02-20T08:00:00+00:00",
+            "ingested_at": f"2026-02-20T{8 + idx // 8:02d}:00:00+00:00",
+            "batch_id": f"{1 + idx // 10}" * 8 + "-1111-1111-1111-111111111111",
+            "source_system": "test-source",
+        }
+        for idx in range(20)
+    ]
+    expected = sorted(tuple(row.values()) for row in service.clean(raw_records).to_records())
+
+    staged_rows = service.build_staging_chunked(
+        (raw_records[offset : offset + 3] for offset in range(0, len(raw_records), 3)),
+        memory_limit="64MB",
+    )
+
+    with duckdb.connect(settings.duckdb_path) as conn:
+        staged = conn.execute(
+            "SELECT source_order_id, customer_id, amount FROM staging.orders ORDER BY source_order_id"
+        ).fetchall()
+        leftovers = conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name LIKE 'orders_spill%'"
+        ).fetchone()[0]
+    assert staged_rows == len(expected) == 6
+    assert staged == [row[:3] for row in expected]
+    assert leftovers == 0
+
+    # Every raw row of each batch is accounted for as either staged or excluded (superseded or negative).
+    fingerprints = warehouse.staging_fingerprints()
+    assert {batch_id: item.accounted for batch_id, item in fingerprints.items()} == fingerprint_rows(
+        [record["batch_id"] for record in raw_records],
+        [record["source_order_id"] for record in raw_records],
+        [record["amount"] for record in raw_records],
+    )
+    with duckdb.connect(settings.duckdb_path) as conn:
+        staged_per_batch = dict(conn.execute("SELECT batch_id, COUNT(*) FROM staging.orders GROUP BY 1").fetchall())
+    assert {str(batch_id): item.staged.row_count for batch_id, item in fingerprints.items()} == {
+        str(batch_id): staged_per_batch.get(str(batch_id), 0) for batch_id in fingerprints
+    }
+    assert sum(item.excluded.row_count for item in fingerprints.values()) == 14
+
+    warehouse.refresh_marts()
+    for rows, amount in warehouse.mart_totals().values():
+        assert rows == 6
+        assert round(amount * 100) == sum(item.staged.amount_cents for item in fingerprints.values())
+
+
+def test_shadow_build_is_promoted_atomically_and_can_be_rolled_back(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    staging_service = OrdersStagingService(warehouse=warehouse)
+    analytics_service = OrdersAnalyticsService(warehouse=warehouse)
+    records = [
+        {
+            "source_order_id": f"ord_{idx:03d}",
+            "customer_id": "cus_001",
+            "amount": 1.0,
+            "order_created_at": f"2026-02-2{idx % 2}T08:00:00+00:00",
+            "ingested_at": "2026-02-20T08:01:00+00:00",
+            "batch_id": "11111111-1111-1111-1111-111111111111",
+            "source_system": "test-source",
+        }
+        for idx in range(4)
+    ]
+    staging_service.build_staging(records)
+    analytics_service.refresh_marts()
+    warehouse.publish_snapshot()
+
+    assert staging_service.build_staging_chunked([records[:1]], shadow=True) == 1
+    assert analytics_service.refresh_marts(shadow=True)["daily_order_metrics"] == 1
+    with snapshot_connection(settings.duckdb_path) as conn:
+        # Published snapshots keep serving the live version while the shadow is built.
+        assert conn.execute("SELECT SUM(total_orders) FROM analytics.daily_order_metrics").fetchone() == (4,)
+
+    warehouse.promote_shadow_tables()
+    with snapshot_connection(settings.duckdb_path) as conn:
+        # Writes are only visible to readers once they are published.
+        assert conn.execute("SELECT COUNT(*) FROM staging.orders").fetchone() == (4,)
+    warehouse.publish_snapshot()
+    with snapshot_connection(settings.duckdb_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM staging.orders").fetchone() == (1,)
+        assert conn.execute("SELECT SUM(total_orders) FROM analytics.daily_order_metrics").fetchone() == (1,)
+        assert conn.execute("SELECT COUNT(*) FROM analytics.customer_order_metrics__previous").fetchone() == (1,)
+    with pytest.raises(StorageError, match="No shadow build"):
+        warehouse.promote_shadow_tables()
+
+    warehouse.rollback_promotion()
+    warehouse.publish_snapshot()
+    with snapshot_connection(settings.duckdb_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM staging.orders").fetchone() == (4,)
+        assert conn.execute("SELECT SUM(total_orders) FROM analytics.daily_order_metrics").fetchone() == (4,)
+        assert conn.execute("SELECT COUNT(*) FROM staging.orders__next").fetchone() == (1,)
+
+
+def test_partition_merge_follows_the_dataset_spec(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    dataset = replace(ORDERS, name="partner_orders", staging_table="staging.partner_orders", marts=())
+    warehouse = DuckDbWarehouseRepository(settings=settings, dataset=dataset)
+    staging_service = OrdersStagingService(warehouse=warehouse, dataset=dataset)
+    records = [
+        {
+            "source_order_id": f"ord_{idx:03d}",
+            "customer_id": "cus_001",
+            "amount": 1.0,
+            "order_created_at": f"2026-02-2{idx % 2}T08:00:00+00:00",
+            "ingested_at": "2026-02-21T08:00:00+00:00",
+            "batch_id": "11111111-1111-1111-1111-111111111111",
+            "source_system": "partner-api",
+        }
+        for idx in range(4)
+    ]
+    staging_service.build_staging(records)
+    # ord_001 is corrected onto the 20th, so its old version on the 21st is replaced as well.
+    correction = {**records[1], "amount": 3.0, "order_created_at": "2026-02-20T12:00:00+00:00"}
+
+    refreshed = staging_service.merge_partition(
+        [records[0], records[2], correction], start=date(2026, 2, 20), end=date(2026, 2, 20)
+    )
+
+    assert (refreshed.staged_rows, refreshed.metric_days) == (3, 0)
+    with duckdb.connect(settings.duckdb_path) as conn:
+        rows = conn.execute(
+            "SELECT source_order_id, amount FROM staging.partner_orders ORDER BY source_order_id"
+        ).fetchall()
+    assert rows == [("ord_000", 1.0), ("ord_001", 3.0), ("ord_002", 1.0), ("ord_003", 1.0)]
+
+
+def test_partition_merge_keeps_staging_fingerprints_reconciled(tmp_path: Path) -> None:
+    settings = DummySettings(str(tmp_path / "warehouse.duckdb"))
+    warehouse = DuckDbWarehouseRepository(settings=settings)
+    service = OrdersStagingService(warehouse=warehouse)
+
+    def record(order: int, day: int, amount: float, hour: int, batch: str) -> dict:
+        return {
+            "source_order_id": f"ord_{order:03d}",
+            "customer_id": "cus_001",
+            "amount": amount,
+            "order_created_at": f"2026-02-{day:02d}T08:00:00+00:00",
+            "ingested_at": f"2026-02-22T{hour:02d}:00:00+00:00",
+            "batch_id": batch * 8 + "-1111-1111-1111-111111111111",
+            "source_system": "test-source",
+        }
+
+    # Batch 2 corrects ord_000 onto the 21st and ord_001 to a negative amount; the full build already
+    # accounts for both, and the merge below re-reads them under new partitions.
+    raw_records = [record(index, 20 + index % 2, 10.0 + index, 1, "1") for index in range(4)]
+    raw_records += [record(0, 21, 15.0, 2, "2"), record(1, 21, -1.0, 2, "2")]
+    service.build_staging_chunked([raw_records])
+    raw = fingerprint_rows(
+        [row["batch_id"] for row in raw_records],
+        [row["source_order_id"] for row in raw_records],
+        [row["amount"] for row in raw_records],
+    )
+
+    # The merge deletes and restages rows of both batches; each must still add up to its raw fingerprint.
+    versions = [row for row in raw_records if row["source_order_id"] in ("ord_000", "ord_001", "ord_002")]
+    service.merge_partition(versions, start=date(2026, 2, 20), end=date(2026, 2, 21))
+    warehouse.refresh_marts()
+
+    fingerprints = warehouse.staging_fingerprints()
+    assert {item.status for item in reconcile_batches(raw, fingerprints)} == {MATCHED}
+    assert all(item.matched for item in reconcile_marts(fingerprints, warehouse.mart_totals()))
+
+    # Rows from a batch the full build never read cannot be accounted for, so the fingerprints are dropped.
+    service.merge_partition([record(4, 20, 9.0, 3, "3")], start=date(2026, 2, 20), end=date(2026, 2, 20))
+    assert warehouse.staging_fingerprints() == {}
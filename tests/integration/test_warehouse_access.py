@@ -0,0 +1,119 @@
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import duckdb
+
+from drp.storage.duckdb.warehouse_access import (
+    current_snapshot,
+    metrics_version,
+    publish_snapshot,
+    snapshot_connection,
+    snapshot_dir,
+    warehouse_connection,
+)
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+_WRITER = textwrap.dedent(
+    """
+    import sys
+    from drp.storage.duckdb.warehouse_access import warehouse_connection
+
+    db_path, worker = sys.argv[1], sys.argv[2]
+    for step in range(5):
+        with warehouse_connection(db_path, lock_timeout_seconds=60) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS writes (worker VARCHAR, step INTEGER)")
+            conn.execute("INSERT INTO writes VALUES (?, ?)", [worker, step])
+    """
+)
+
+_SNAPSHOT_READER = textwrap.dedent(
+    """
+    import sys
+    from drp.storage.duckdb.warehouse_access import snapshot_connection
+
+    with snapshot_connection(sys.argv[1]) as conn:
+        print(conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0])
+    """
+)
+
+
+def _python(script: str, *args: str) -> subprocess.Popen[str]:
+    return subprocess.Popen(
+        [sys.executable, "-c", script, *args],
+        env={"PYTHONPATH": str(SRC_DIR)},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+
+def test_writer_processes_queue_on_the_writer_lock(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "warehouse.duckdb")
+
+    workers = [_python(_WRITER, db_path, f"worker-{index}") for index in range(4)]
+    outcomes = [(worker.wait(timeout=120), worker.stderr.read()) for worker in workers]
+
+    assert all(code == 0 for code, _ in outcomes), outcomes
+    with duckdb.connect(db_path, read_only=True) as conn:
+        assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT worker) FROM writes").fetchone() == (20, 4)
+
+
+def test_snapshot_readers_do_not_contend_with_an_open_writer(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "warehouse.duckdb")
+    with warehouse_connection(db_path) as conn:
+        conn.execute("CREATE TABLE writes AS SELECT range AS step FROM range(3)")
+    first = publish_snapshot(db_path, retain=2)
+    version = metrics_version(db_path)
+
+    with warehouse_connection(db_path) as conn:
+        conn.execute("INSERT INTO writes SELECT range FROM range(10)")
+        # Another process reading through the snapshot is unaffected by the writer holding the file.
+        reader = _python(_SNAPSHOT_READER, db_path)
+        stdout, stderr = reader.communicate(timeout=60)
+        assert reader.returncode == 0, stderr
+        assert stdout.strip() == "3"
+
+    for _ in range(3):
+        latest = publish_snapshot(db_path, retain=2)
+    with snapshot_connection(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 13
+
+    assert current_snapshot(db_path) == latest
+    assert metrics_version(db_path) != version
+    assert not first.exists()
+    assert len(list(snapshot_dir(db_path).glob("warehouse-*.duckdb"))) == 2
+
+
+def test_readers_in_one_process_overlap(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "warehouse.duckdb")
+    with warehouse_connection(db_path) as conn:
+        conn.execute("CREATE TABLE writes AS SELECT range AS step FROM range(3)")
+    publish_snapshot(db_path)
+    first_open = threading.Event()
+    second_done = threading.Event()
+
+    def hold_reader() -> None:
+        with snapshot_connection(db_path) as conn:
+            first_open.set()
+            # Only returns once a second reader has queried while this one is still open.
+            assert second_done.wait(timeout=30)
+            assert conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 3
+
+    holder = threading.Thread(target=hold_reader)
+    holder.start()
+    assert first_open.wait(timeout=30)
+    with snapshot_connection(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 3
+    with warehouse_connection(db_path, read_only=True) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 3
+    second_done.set()
+    holder.join(timeout=30)
+    assert not holder.is_alive()
+
+    # The snapshot readers are gone, so a writer can open the live file again.
+    with warehouse_connection(db_path) as conn:
+        conn.execute("INSERT INTO writes VALUES (3)")
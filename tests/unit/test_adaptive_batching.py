@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from drp.ingestion.services.adaptive_batching import AdaptiveBatchController, BatchSizing, BatchSizingStore
+
+
+class DummySettings:
+    source_system = "orders_api"
+    ingest_min_page_size = 10
+    ingest_max_page_size = 100
+    ingest_max_in_flight = 3
+    ingest_target_latency_seconds = 1.0
+
+    def __init__(self, state_path: Path) -> None:
+        self.ingest_batch_state_path = str(state_path)
+
+
+def test_controller_grows_page_size_then_concurrency_and_backs_off_in_reverse() -> None:
+    controller = AdaptiveBatchController(
+        initial=BatchSizing(page_size=20),
+        min_page_size=10,
+        max_page_size=100,
+        max_in_flight=3,
+        target_latency_seconds=1.0,
+    )
+
+    for _ in range(16):
+        page_size = controller.sizing.page_size
+        controller.record_success(requested=page_size, rows=page_size, latency_seconds=0.2)
+    assert controller.sizing == BatchSizing(page_size=100, in_flight=1)
+    # A short page means the source ran dry, so it is not evidence of spare capacity.
+    assert controller.record_success(requested=100, rows=30, latency_seconds=0.1) == BatchSizing(100, 1)
+
+    for _ in range(3):
+        controller.record_success(requested=100, rows=100, latency_seconds=0.2)
+    assert controller.sizing == BatchSizing(page_size=100, in_flight=3)
+    assert controller.throughput_rows_per_second > 0
+
+    # Over target: concurrency gives way first, in proportion to the overshoot.
+    assert controller.record_success(requested=100, rows=100, latency_seconds=1.5) == BatchSizing(100, 2)
+    assert controller.record_success(requested=100, rows=100, latency_seconds=1.5) == BatchSizing(100, 1)
+    assert controller.record_success(requested=100, rows=100, latency_seconds=1.25) == BatchSizing(80, 1)
+    assert controller.record_failure() == BatchSizing(40, 1)
+    for _ in range(5):
+        controller.record_failure()
+    assert controller.sizing == BatchSizing(page_size=10, in_flight=1)
+
+
+def test_sizing_is_persisted_and_warm_starts_the_next_run(tmp_path: Path) -> None:
+    state_path = tmp_path / "state" / "batch_sizing.json"
+    settings = DummySettings(state_path)
+
+    cold = AdaptiveBatchController.from_settings(settings, initial_page_size=500)  # type: ignore[arg-type]
+    assert cold.sizing == BatchSizing(page_size=100, in_flight=1)
+    cold.record_failure()
+    cold.record_success(requested=50, rows=50, latency_seconds=0.1)
+    cold.persist()
+
+    warm = AdaptiveBatchController.from_settings(settings, initial_page_size=500)  # type: ignore[arg-type]
+    assert warm.sizing == BatchSizing(page_size=55, in_flight=1)
+    assert json.loads(state_path.read_text())["orders_api"]["page_size"] == 55
+
+    state_path.write_text("{not json")
+    assert BatchSizingStore(state_path).load("orders_api") is None
+    assert AdaptiveBatchController.from_settings(settings, 40).sizing.page_size == 40  # type: ignore[arg-type]
@@ -0,0 +1,58 @@
+import random
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from drp.core.batch_fingerprint import BatchFingerprint, fingerprint_rows
+from drp.quality.reconciliation import (
+    MATCHED,
+    MISMATCHED,
+    MISSING_IN_STAGING,
+    UNFINGERPRINTED,
+    reconcile_batches,
+    reconcile_marts,
+)
+from drp.storage.duckdb.warehouse_repository import StagingFingerprint
+
+BATCH = UUID("11111111-1111-1111-1111-111111111111")
+
+
+def _fingerprint(rows: list[tuple[str, float]], batch_id: UUID = BATCH) -> BatchFingerprint:
+    return fingerprint_rows([batch_id] * len(rows), [key for key, _ in rows], [amount for _, amount in rows])[batch_id]
+
+
+def test_fingerprints_are_order_independent_and_additive() -> None:
+    rows = [(f"ord_{index}", round(random.Random(index).uniform(1, 500), 2)) for index in range(200)]
+    shuffled = random.Random(7).sample(rows, len(rows))
+
+    whole = _fingerprint(rows)
+    assert whole == _fingerprint(shuffled)
+    assert _fingerprint(rows[:50]) + _fingerprint(rows[50:]) == whole
+    # Postgres hands back NUMERIC amounts; they must land on the same cents as the warehouse's doubles.
+    assert _fingerprint([(key, Decimal(str(amount))) for key, amount in rows]) == whole
+    # A duplicated row is visible even where an XOR of keys would cancel it out.
+    assert not _fingerprint(rows + [rows[0], rows[0]]).matches(whole)
+    assert not _fingerprint([("ord_0", 10.0)]).matches(_fingerprint([("ord_1", 10.0)]))
+
+
+def test_batches_are_matched_on_staged_plus_excluded_rows() -> None:
+    rows = [("ord_1", 10.0), ("ord_2", 20.0), ("ord_3", -5.0)]
+    lossy, missing, legacy = uuid4(), uuid4(), uuid4()
+    loaded_at = datetime(2026, 2, 21, tzinfo=UTC)
+    staging = {
+        BATCH: StagingFingerprint(loaded_at, staged=_fingerprint(rows[:2]), excluded=_fingerprint(rows[2:])),
+        lossy: StagingFingerprint(loaded_at, staged=_fingerprint(rows[:1], lossy), excluded=BatchFingerprint(lossy)),
+        legacy: StagingFingerprint(loaded_at, staged=_fingerprint(rows, legacy), excluded=BatchFingerprint(legacy)),
+    }
+    raw = {BATCH: _fingerprint(rows), lossy: _fingerprint(rows[:2], lossy), missing: _fingerprint(rows, missing)}
+
+    statuses = {item.batch_id: item.status for item in reconcile_batches(raw, staging)}
+
+    assert statuses == {BATCH: MATCHED, lossy: MISMATCHED, missing: MISSING_IN_STAGING, legacy: UNFINGERPRINTED}
+
+    [daily, hourly] = reconcile_marts(
+        {BATCH: staging[BATCH]},
+        {"daily_order_metrics": (2, 30.000000001), "hourly_order_metrics": (1, 10.0)},
+    )
+    assert daily.matched
+    assert not hourly.matched
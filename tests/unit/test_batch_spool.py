@@ -0,0 +1,60 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+import pyarrow as pa
+
+from drp.storage.local.batch_spool import ArrowBatchSpool
+
+
+class DummySettings:
+    def __init__(self, batch_spool_dir: str) -> None:
+        self.batch_spool_dir = batch_spool_dir
+
+
+def test_spool_round_trips_raw_rows(tmp_path: Path) -> None:
+    spool = ArrowBatchSpool(settings=DummySettings(str(tmp_path)))
+    records = [
+        {
+            "source_order_id": "ord_1",
+            "amount": Decimal("12.50"),
+            "ingested_at": datetime(2026, 2, 20, 8, 0, tzinfo=UTC),
+            "batch_id": UUID("11111111-1111-1111-1111-111111111111"),
+        },
+        {
+            "source_order_id": "ord_2",
+            "amount": Decimal("7.25"),
+            "ingested_at": datetime(2026, 2, 20, 9, 0, tzinfo=UTC),
+            "batch_id": UUID("22222222-2222-2222-2222-222222222222"),
+        },
+    ]
+
+    handle = spool.write_records(records, name="raw-orders")
+    restored = spool.read_records(handle)
+
+    assert handle.row_count == 2
+    assert restored[0]["source_order_id"] == "ord_1"
+    assert restored[0]["amount"] == Decimal("12.50")
+    assert restored[1]["ingested_at"] == datetime(2026, 2, 20, 9, 0, tzinfo=UTC)
+    assert restored[1]["batch_id"] == "22222222-2222-2222-2222-222222222222"
+
+
+def test_spool_open_table_is_memory_mapped(tmp_path: Path) -> None:
+    spool = ArrowBatchSpool(settings=DummySettings(str(tmp_path)))
+    handle = spool.write_records([{"order_id": f"ord_{idx}", "amount": float(idx)} for idx in range(10_000)], name="src")
+
+    allocated_before = pa.total_allocated_bytes()
+    table = spool.open_table(handle)
+
+    assert table.num_rows == 10_000
+    assert pa.total_allocated_bytes() == allocated_before
+
+
+def test_spool_release_removes_file(tmp_path: Path) -> None:
+    spool = ArrowBatchSpool(settings=DummySettings(str(tmp_path)))
+    handle = spool.write_records([{"order_id": "ord_1"}], name="src")
+
+    spool.release(handle)
+
+    assert not Path(handle.path).exists()
@@ -0,0 +1,131 @@
+import random
+from uuid import UUID, uuid4
+
+import pytest
+
+from drp.core.column_profile import NEGATIVE_BUCKET, NUMERIC, TEXT, TIMESTAMP, ColumnProfile, profile_batch
+from drp.core.order_batch import OrderBatch
+from drp.quality.drift import HISTOGRAM_PSI, MEAN_ZSCORE, NULL_RATE, BatchDriftMonitor, DriftThresholds, check_drift
+
+THRESHOLDS = DriftThresholds(null_rate_tolerance=0.05, mean_zscore=4.0, psi=0.25, min_baseline_batches=5)
+
+
+class DummySettings:
+    source_system = "orders_api"
+    column_profile_baseline_batches = 20
+    column_profile_min_baseline_batches = 5
+    drift_null_rate_tolerance = 0.05
+    drift_mean_zscore = 4.0
+    drift_psi_threshold = 0.25
+
+
+class FakeProfileRepository:
+    def __init__(self) -> None:
+        self.batches: dict[UUID, tuple[list[ColumnProfile], dict]] = {}
+
+    def ensure_table(self) -> None:
+        return None
+
+    def recent_profiles(self, source_system: str, batches: int, exclude_batch_id: UUID | None = None) -> dict:
+        baseline: dict[str, list[ColumnProfile]] = {}
+        recent = [batch_id for batch_id in self.batches if batch_id != exclude_batch_id][-batches:]
+        for batch_id in recent:
+            for profile in self.batches[batch_id][0]:
+                baseline.setdefault(profile.column_name, []).append(profile)
+        return baseline
+
+    def insert_profiles(self, batch_id: UUID, source_system: str, profiles: list, drift_findings: dict) -> int:
+        if batch_id in self.batches:
+            return 0
+        self.batches[batch_id] = (profiles, drift_findings)
+        return len(profiles)
+
+
+def _orders(seed: int, rows: int = 200, scale: float = 1.0, null_customers: float = 0.0) -> OrderBatch:
+    rng = random.Random(seed)
+    return OrderBatch.from_records(
+        [
+            {
+                "order_id": f"ord_{seed}_{index}",
+                "customer_id": None if rng.random() < null_customers else f"cus_{rng.randrange(50)}",
+                "amount": round(rng.uniform(5, 500) * scale, 2),
+                "created_at": f"2026-02-20T{index % 24:02d}:00:00+00:00",
+            }
+            for index in range(rows)
+        ]
+    )
+
+
+def test_profile_batch_summarises_each_column_in_one_pass() -> None:
+    batch = OrderBatch.from_records(
+        [
+            {"order_id": "ord_1", "customer_id": "cus_1", "amount": 0.0, "created_at": "2026-02-20T10:00:00Z"},
+            {"order_id": "ord_2", "customer_id": None, "amount": 3.0, "created_at": "2026-02-20T12:00:00Z"},
+            {"order_id": "ord_3", "customer_id": "cus_1", "amount": -1.0, "created_at": None},
+            {"order_id": "ord_3", "customer_id": "cus_2", "amount": 5.0, "created_at": "2026-02-20T11:00:00Z"},
+        ]
+    )
+
+    profiles = {profile.column_name: profile for profile in profile_batch(batch)}
+
+    assert profiles["order_id"] == ColumnProfile("order_id", TEXT, row_count=4, null_count=0, distinct_count=3)
+    assert profiles["customer_id"].null_rate == 0.25
+    amount = profiles["amount"]
+    assert (amount.kind, amount.min_value, amount.max_value, amount.mean) == (NUMERIC, -1.0, 5.0, 1.75)
+    assert amount.histogram == {"0": 1, "2^1": 1, "2^2": 1, NEGATIVE_BUCKET: 1}
+    created = profiles["created_at"]
+    assert (created.kind, created.null_count, created.histogram) == (TIMESTAMP, 1, {})
+    assert created.max_value - created.min_value == 7200
+
+    # A dirty column keeps its null and cardinality figures even when it cannot be summarised.
+    [_, _, dirty, missing] = profile_batch(
+        OrderBatch.from_records([{"order_id": "ord_1", "customer_id": "cus_1", "amount": "n/a"}])
+    )
+    assert (dirty.mean, dirty.distinct_count) == (None, 1)
+    assert missing.null_rate == 1.0
+
+
+def test_drift_checks_compare_a_batch_with_the_rolling_baseline() -> None:
+    baseline = [{p.column_name: p for p in profile_batch(_orders(seed))} for seed in range(10)]
+
+    def findings(batch: OrderBatch) -> set[tuple[str, str]]:
+        return {
+            (finding.column_name, finding.metric)
+            for profile in profile_batch(batch)
+            for finding in check_drift(profile, [item[profile.column_name] for item in baseline], THRESHOLDS)
+        }
+
+    assert findings(_orders(seed=99)) == set()
+    assert findings(_orders(seed=99, scale=3.0)) == {("amount", MEAN_ZSCORE), ("amount", HISTOGRAM_PSI)}
+    assert findings(_orders(seed=99, null_customers=0.3)) == {("customer_id", NULL_RATE)}
+    # Too short a history is no baseline at all.
+    profile = profile_batch(_orders(seed=99, scale=3.0))[2]
+    assert check_drift(profile, [item["amount"] for item in baseline[:4]], THRESHOLDS) == []
+
+
+def test_monitor_stores_profiles_with_findings_and_skips_replayed_batches() -> None:
+    repository = FakeProfileRepository()
+    monitor = BatchDriftMonitor(settings=DummySettings(), repository=repository)  # type: ignore[arg-type]
+
+    for seed in range(6):
+        assert monitor.observe(batch_id=uuid4(), records=_orders(seed)).findings == ()
+
+    drifted_id = uuid4()
+    report = monitor.observe(batch_id=drifted_id, records=_orders(seed=42, scale=0.1))
+    assert report.drifted_columns == ["amount"]
+    assert report.baseline_batches == 6
+    stored_findings = repository.batches[drifted_id][1]
+    assert {finding["metric"] for finding in stored_findings["amount"]} == {MEAN_ZSCORE, HISTOGRAM_PSI}
+
+    # A replay is judged against the other batches, not itself, and is stored only once.
+    replay = monitor.observe(batch_id=drifted_id, records=_orders(seed=42, scale=0.1))
+    assert replay.drifted_columns == ["amount"]
+    assert len(repository.batches) == 7
+    assert monitor.observe(batch_id=uuid4(), records=OrderBatch.empty()).profiled_columns == 0
+
+
+@pytest.mark.parametrize("scale", [1.0, 1.02])
+def test_small_steady_shifts_are_not_reported(scale: float) -> None:
+    baseline = [profile_batch(_orders(seed, rows=50))[2] for seed in range(20)]
+
+    assert check_drift(profile_batch(_orders(seed=77, rows=1000, scale=scale))[2], baseline, THRESHOLDS) == []
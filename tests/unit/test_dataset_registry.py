@@ -0,0 +1,86 @@
+import json
+from dataclasses import replace
+
+import pyarrow as pa
+import pytest
+
+from drp.config.settings import Settings
+from drp.core.order_batch import OrderBatch
+from drp.datasets.registry import ORDERS, DatasetRegistry
+from drp.ingestion.validation.orders_payload_validator import OrdersPayloadValidator
+from drp.transform.staging.orders_staging_service import OrdersStagingService
+
+
+def test_registry_file_declares_new_sources_of_a_known_shape(tmp_path) -> None:
+    path = tmp_path / "datasets.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "partner_orders",
+                    "extends": "orders",
+                    "source_system": "partner-api",
+                    "source_endpoint": "/partner/orders",
+                    "archive_prefix": "raw/partner_orders",
+                }
+            ]
+        )
+    )
+    registry = DatasetRegistry([ORDERS])
+
+    [partner] = registry.load_file(path)
+
+    assert registry.names() == ["orders", "partner_orders"]
+    assert partner.staging_table == "staging.partner_orders"
+    assert partner.blue_green_tables == ("staging.partner_orders", "staging.partner_orders_fingerprints")
+    assert partner.expectations == ORDERS.expectations
+    settings = partner.settings_for(Settings())
+    assert (settings.source_system, settings.api_orders_endpoint, settings.object_store_raw_prefix) == (
+        "partner-api",
+        "/partner/orders",
+        "raw/partner_orders",
+    )
+    assert ORDERS.settings_for(settings) is settings
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.load_file(path)
+    path.write_text(json.dumps([{"name": "bad", "extends": "orders", "key_columns": ["customer_id"]}]))
+    with pytest.raises(ValueError, match="unsupported fields"):
+        registry.load_file(path)
+    with pytest.raises(ValueError, match="Unknown dataset"):
+        registry.select(["missing"])
+
+
+def test_validation_and_staging_follow_the_dataset_spec() -> None:
+    schema = pa.schema([*ORDERS.source_schema, pa.field("channel", pa.string())])
+    dataset = replace(
+        ORDERS,
+        source_schema=schema,
+        key_columns=("source_order_id", "customer_id"),
+        non_negative_columns=(),
+    )
+
+    result = OrdersPayloadValidator(dataset).validate(
+        OrderBatch.from_records(
+            [
+                {"order_id": "ord_1", "customer_id": "cus_1", "amount": "-5", "created_at": "2026-02-20T10:00:00Z"},
+                {"order_id": "ord_2", "customer_id": "cus_1", "amount": 5, "created_at": "2026-02-20T10:00:00Z"},
+                {"order_id": "ord_3", "customer_id": "cus_1", "amount": "n/a", "created_at": "2026-02-20T10:00:00Z"},
+            ]
+        )
+    )
+    # The optional column may be null or absent; the typed columns are still parsed by their declared type.
+    assert result.valid_count == 2
+    assert result.quarantined.column("quarantine_reasons").to_pylist() == ["non-numeric amount"]
+
+    staged = OrdersStagingService(warehouse=None, dataset=dataset).clean(  # type: ignore[arg-type]
+        [
+            {"source_order_id": "ord_1", "customer_id": "cus_1", "amount": -1.0, "ingested_at": "2026-02-20T00:00:00Z"},
+            {"source_order_id": "ord_1", "customer_id": "cus_2", "amount": 2.0, "ingested_at": "2026-02-20T00:00:00Z"},
+            {"source_order_id": "ord_1", "customer_id": "cus_2", "amount": 3.0, "ingested_at": "2026-02-20T00:05:00Z"},
+        ]
+    )
+    assert sorted(zip(staged.column("customer_id").to_pylist(), staged.column("amount").to_pylist())) == [
+        ("cus_1", -1.0),
+        ("cus_2", 3.0),
+    ]
@@ -0,0 +1,51 @@
+import threading
+import time
+from dataclasses import replace
+
+from drp.datasets.registry import ORDERS
+from drp.orchestration.dataset_scheduler import WAREHOUSE, DatasetScheduler, ResourceLimits, SharedResources
+
+
+class DummySettings:
+    dataset_max_concurrency = 4
+
+
+def test_datasets_run_concurrently_but_share_backend_limits() -> None:
+    datasets = [replace(ORDERS, name=f"source_{index}") for index in range(4)]
+    resources = SharedResources(ResourceLimits(postgres_connections=4, warehouse_slots=1, object_store_slots=4))
+    lock = threading.Lock()
+    active = {"workers": 0, "warehouse": 0}
+    peaks = {"workers": 0, "warehouse": 0}
+
+    def enter(name: str) -> None:
+        with lock:
+            active[name] += 1
+            peaks[name] = max(peaks[name], active[name])
+
+    def leave(name: str) -> None:
+        with lock:
+            active[name] -= 1
+
+    def work(dataset, shared):  # type: ignore[no-untyped-def]
+        enter("workers")
+        time.sleep(0.05)
+        with shared.hold(WAREHOUSE):
+            enter("warehouse")
+            time.sleep(0.01)
+            leave("warehouse")
+        leave("workers")
+        if dataset.name == "source_2":
+            raise RuntimeError("source down")
+        return dataset.name
+
+    runs = DatasetScheduler(DummySettings(), resources=resources).run(work, datasets)  # type: ignore[arg-type]
+
+    assert peaks == {"workers": 4, "warehouse": 1}
+    assert [(run.dataset, run.succeeded) for run in runs] == [
+        ("source_0", True),
+        ("source_1", True),
+        ("source_2", False),
+        ("source_3", True),
+    ]
+    assert runs[2].error == "source down"
+    assert runs[0].result == "source_0"
@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+FLOW_MODULES = (
+    "drp.orchestration.prefect.flows.ingest_orders_flow",
+    "drp.orchestration.prefect.flows.ingest_datasets_flow",
+    "drp.orchestration.prefect.flows.stream_orders_flow",
+    "drp.orchestration.prefect.flows.backfill_raw_orders_flow",
+    "drp.orchestration.prefect.flows.tier_raw_orders_flow",
+    "drp.orchestration.prefect.flows.stage_and_validate_orders_flow",
+    "drp.orchestration.prefect.flows.recompute_orders_flow",
+    "drp.orchestration.prefect.run",
+)
+DEFERRED_MODULES = ("great_expectations", "pandas", "boto3", "psycopg")
+# Prefect itself is excluded: flows cannot be declared without it. The rest of start-up is ours.
+IMPORT_BUDGET_SECONDS = 1.5
+
+_PROBE = """
+import importlib, json, sys, time
+import prefect
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.fixture(scope="module")
+def flow_imports() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, *FLOW_MODULES],
+        capture_output=True,
+        check=True,
+        cwd=SRC_DIR,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_flow_modules_defer_heavy_dependencies(flow_imports: dict) -> None:
+    loaded = {module.partition(".")[0] for module in flow_imports["modules"]}
+
+    assert loaded.isdisjoint(DEFERRED_MODULES), sorted(loaded.intersection(DEFERRED_MODULES))
+
+
+def test_flow_modules_import_within_budget(flow_imports: dict) -> None:
+    assert flow_imports["seconds"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,84 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from drp.config.settings import Settings, get_settings
+from drp.core.order_batch import OrderBatch
+from drp.core.ttl_cache import TtlLruCache
+from drp.interfaces.api import metrics_api
+from drp.storage.duckdb.warehouse_repository import DuckDbWarehouseRepository
+
+RAW_RECORDS = [
+    {
+        "source_order_id": f"ord_{idx:03d}",
+        "customer_id": "cus_001",
+        "amount": 10.0,
+        "order_created_at": f"2026-02-2{idx % 3}T08:00:00+00:00",
+        "ingested_at": "2026-02-23T09:00:00+00:00",
+        "batch_id": "11111111-1111-1111-1111-111111111111",
+        "source_system": "test-source",
+    }
+    for idx in range(6)
+]
+
+
+@pytest.fixture
+def warehouse(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[DuckDbWarehouseRepository]:
+    settings = Settings(DUCKDB_PATH=str(tmp_path / "warehouse.duckdb"), OBJECT_STORE_ENABLED=False)
+    warehouse = DuckDbWarehouseRepository(settings)
+    warehouse.replace_staging_orders(OrderBatch.from_raw_records(RAW_RECORDS))
+    warehouse.refresh_daily_metrics()
+    warehouse.publish_snapshot()
+    monkeypatch.setattr(metrics_api, "_cache", TtlLruCache(max_entries=8, ttl_seconds=60))
+    metrics_api.app.dependency_overrides[get_settings] = lambda: settings
+    yield warehouse
+    metrics_api.app.dependency_overrides.clear()
+
+
+def test_daily_metrics_are_served_by_date_range_with_etag(warehouse: DuckDbWarehouseRepository) -> None:
+    client = TestClient(metrics_api.app)
+
+    response = client.get("/v1/metrics/daily", params={"start": "2026-02-21", "end": "2026-02-22"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["order_date"] for row in body["metrics"]] == ["2026-02-21", "2026-02-22"]
+    assert body["metrics"][0]["total_orders"] == 2
+    assert response.headers["etag"].startswith('"')
+
+    revalidated = client.get(
+        "/v1/metrics/daily",
+        params={"start": "2026-02-21", "end": "2026-02-22"},
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert client.get("/v1/metrics/cache").json() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_publish_invalidates_cached_metrics(warehouse: DuckDbWarehouseRepository) -> None:
+    client = TestClient(metrics_api.app)
+    params = {"start": "2026-02-20", "end": "2026-02-22"}
+    before = client.get("/v1/metrics/daily", params=params)
+
+    warehouse.replace_staging_orders(OrderBatch.from_raw_records(RAW_RECORDS[:3]))
+    warehouse.refresh_daily_metrics()
+    unpublished = client.get("/v1/metrics/daily", params=params, headers={"If-None-Match": before.headers["etag"]})
+    warehouse.publish_snapshot()
+    after = client.get("/v1/metrics/daily", params=params, headers={"If-None-Match": before.headers["etag"]})
+
+    assert unpublished.status_code == 304
+    assert after.status_code == 200
+    assert after.headers["x-metrics-version"] != before.headers["x-metrics-version"]
+    assert sum(row["total_orders"] for row in after.json()["metrics"]) == 3
+
+
+def test_daily_metrics_rejects_inverted_range(warehouse: DuckDbWarehouseRepository) -> None:
+    client = TestClient(metrics_api.app)
+
+    response = client.get("/v1/metrics/daily", params={"start": "2026-02-22", "end": "2026-02-21"})
+
+    assert response.status_code == 422
@@ -1,5 +1,9 @@
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
 from drp.core.exceptions import StorageError
 from drp.storage.object_store.archive_service import ObjectStoreArchiveService
+from drp.storage.postgres.raw_orders_repository import UnarchivedBatch
 
 
 class DummySettings:
@@ -18,10 +22,12 @@ class DummySettings:
 class FakeRepo:
     def __init__(self, raise_error: bool = False) -> None:
         self.raise_error = raise_error
+        self.objects: dict[str, dict] = {}
 
     def put_json(self, key: str, payload: dict) -> str:
         if self.raise_error:
             raise StorageError("upload failed")
+        self.objects[key] = payload
         return f"s3://bucket/{key}"
 
     def upload_file(self, local_path: str, key: str) -> str:
@@ -50,3 +56,56 @@ def test_archive_raw_batch_swallow_errors_when_not_required() -> None:
     uri = service.archive_raw_batch(batch_id="b-1", records=[{"id": 1}])
 
     assert uri is None
+
+
+class FakeRawRepository:
+    def __init__(self, pending: list[UnarchivedBatch]) -> None:
+        self.pending = pending
+        self.archived: list[UUID] = []
+
+    def unarchived_batches(self, source_system: str, limit: int) -> list[UnarchivedBatch]:
+        return [item for item in self.pending if item.batch_id not in self.archived][:limit]
+
+    def fetch_batch_payloads(self, batch_id: UUID) -> list[dict]:
+        return [{"order_id": f"ord_{batch_id}"}]
+
+    def mark_archived(self, batch_id: UUID) -> None:
+        self.archived.append(batch_id)
+
+
+def test_archive_unarchived_batches_rebuilds_committed_pages_under_their_ingest_date() -> None:
+    pending = [
+        UnarchivedBatch(batch_id=uuid4(), committed_at=datetime(2026, 2, day, 23, 0, tzinfo=UTC)) for day in (1, 2)
+    ]
+    raw_repository = FakeRawRepository(pending)
+    service = ObjectStoreArchiveService(settings=DummySettings())
+    store = FakeRepo()
+    service._repo = store  # type: ignore[assignment]
+
+    uris = service.archive_unarchived_batches(
+        raw_repository,  # type: ignore[arg-type]
+        source_system="orders_api",
+        limit=10,
+    )
+
+    assert uris == [
+        f"s3://bucket/raw/orders/ingest_date=2026-02-0{day}/batch_id={item.batch_id}.json"
+        for day, item in zip((1, 2), pending, strict=True)
+    ]
+    assert raw_repository.archived == [item.batch_id for item in pending]
+    assert all(payload["record_count"] == 1 for payload in store.objects.values())
+
+
+def test_archive_unarchived_batches_leaves_pages_pending_when_the_upload_is_skipped() -> None:
+    raw_repository = FakeRawRepository([UnarchivedBatch(batch_id=uuid4(), committed_at=datetime.now(UTC))])
+    service = ObjectStoreArchiveService(settings=DummySettings())
+    service._repo = FakeRepo(raise_error=True)  # type: ignore[assignment]
+
+    uris = service.archive_unarchived_batches(
+        raw_repository,  # type: ignore[arg-type]
+        source_system="orders_api",
+        limit=10,
+    )
+
+    assert uris == []
+    assert raw_repository.archived == []
@@ -0,0 +1,63 @@
+import tracemalloc
+from datetime import UTC, datetime
+
+import pyarrow as pa
+import pytest
+
+from drp.core.order_batch import RAW_ORDER_SCHEMA, SOURCE_ORDER_SCHEMA, OrderBatch, as_order_batch
+from drp.synthetic.orders_generator import SyntheticOrdersConfig, SyntheticOrdersGenerator
+
+
+def test_from_source_records_conforms_types_and_keeps_extra_fields() -> None:
+    batch = OrderBatch.from_source_records(
+        [
+            {"order_id": "ord_1", "customer_id": "cus_1", "amount": 10, "created_at": "2026-02-20T10:00:00+02:00", "note": "x"},
+            {"order_id": "ord_2", "customer_id": "cus_2", "amount": 2.5, "created_at": "2026-02-20T09:00:00"},
+        ]
+    )
+
+    for field in SOURCE_ORDER_SCHEMA:
+        assert batch.schema.field(field.name).type == field.type
+    assert batch.column_names[-1] == "note"
+    assert batch[0]["created_at"] == datetime(2026, 2, 20, 8, 0, tzinfo=UTC)
+    assert batch[1]["created_at"] == datetime(2026, 2, 20, 9, 0, tzinfo=UTC)
+    assert batch.to_json_records()[0]["created_at"] == "2026-02-20T08:00:00.000000+00:00"
+
+
+def test_slices_and_iteration_are_views_over_the_table() -> None:
+    batch = OrderBatch.from_records([{"order_id": f"ord_{idx}", "amount": float(idx)} for idx in range(10)])
+
+    assert [len(view) for view in batch.iter_slices(4)] == [4, 4, 2]
+    assert batch[2:5].column("order_id").to_pylist() == ["ord_2", "ord_3", "ord_4"]
+    assert batch[-1]["order_id"] == "ord_9"
+    assert [row["amount"] for row in batch] == [float(idx) for idx in range(10)]
+    assert len(OrderBatch.concat([batch[:3], batch[7:]])) == 6
+    with pytest.raises(IndexError):
+        batch[10]
+
+
+def test_as_order_batch_accepts_batches_and_records() -> None:
+    records = [{"source_order_id": "ord_1", "amount": "12.50", "ingested_at": "2026-02-20T08:00:00Z"}]
+
+    from_records = as_order_batch(records, RAW_ORDER_SCHEMA)
+    from_batch = as_order_batch(OrderBatch.from_records(records), RAW_ORDER_SCHEMA)
+
+    assert from_records.column("amount").type == pa.float64()
+    assert from_records.column("batch_id").null_count == 1
+    assert from_batch.column("amount").to_pylist() == [12.5]
+    assert from_batch.column("ingested_at").type == pa.timestamp("us", tz="UTC")
+
+
+def test_columnar_batch_is_an_order_of_magnitude_smaller_than_record_dicts() -> None:
+    generator = SyntheticOrdersGenerator(SyntheticOrdersConfig(rows=50_000))
+
+    tracemalloc.start()
+    try:
+        records = generator.source_records()
+        dict_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    batch = OrderBatch.from_source_records(records)
+
+    assert len(batch) == 50_000
+    assert batch.nbytes * 8 < dict_bytes
@@ -1,12 +1,21 @@
 import pytest
+import requests
 
-from drp.core.exceptions import DataSourceError
+from drp.core.exceptions import CircuitOpenError, DataSourceError
 from drp.ingestion.connectors.orders_api_client import OrdersApiClient
+from drp.ingestion.connectors.resilience import OPEN, CircuitBreaker, SourceGuard
 
 
 class DummySettings:
     api_base_url = "http://test-api:8000"
     api_orders_endpoint = "/v1/orders"
+    orders_api_connect_timeout_seconds = 1.0
+    orders_api_read_timeout_seconds = 5.0
+    orders_api_rate_limit_per_second = 0.0
+    orders_api_rate_limit_burst = 1
+    orders_api_circuit_failure_threshold = 100
+    orders_api_circuit_reset_seconds = 1.0
+    orders_api_circuit_max_reset_seconds = 1.0
 
 
 class FakeResponse:
@@ -42,3 +51,30 @@ def test_fetch_orders_raises_on_invalid_payload(monkeypatch: pytest.MonkeyPatch)
 
     with pytest.raises(DataSourceError):
         client.fetch_orders(limit=10)
+
+
+def test_source_failures_open_the_circuit_and_later_calls_fail_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[int | None, float]] = []
+    statuses = [404, 503, 503]
+
+    def fake_get(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls.append((kwargs["params"].get("cursor"), kwargs["timeout"]))
+        response = requests.Response()
+        response.status_code = statuses.pop(0)
+        return response
+
+    monkeypatch.setattr("drp.ingestion.connectors.orders_api_client.requests.get", fake_get)
+    breaker = CircuitBreaker("orders", failure_threshold=2, reset_timeout_seconds=30, max_reset_timeout_seconds=60)
+    client = OrdersApiClient(settings=DummySettings(), guard=SourceGuard(breaker=breaker))
+
+    for cursor in range(3):
+        with pytest.raises(DataSourceError) as raised:
+            client.fetch_orders(limit=10, cursor=cursor)
+        assert not isinstance(raised.value, CircuitOpenError)
+    assert breaker.state == OPEN
+
+    # A 404 means the source answered, so only the two 503s counted towards the threshold.
+    with pytest.raises(CircuitOpenError) as rejected:
+        client.fetch_orders(limit=10, cursor=3)
+    assert rejected.value.retry_after_seconds > 0
+    assert calls == [(0, (1.0, 5.0)), (1, (1.0, 5.0)), (2, (1.0, 5.0))]
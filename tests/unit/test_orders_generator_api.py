@@ -0,0 +1,88 @@
+import json
+
+import pyarrow as pa
+from fastapi.testclient import TestClient
+
+from drp.interfaces.api.main import app
+
+client = TestClient(app)
+
+
+def test_stream_orders_returns_ndjson_rows() -> None:
+    response = client.get("/v1/orders/stream", params={"rows": 2_500, "chunk_size": 1_000})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.content.splitlines()
+    assert len(lines) == 2_500
+    first = json.loads(lines[0])
+    assert set(first) == {"order_id", "customer_id", "amount", "created_at"}
+    assert first["order_id"] == "ord_000000001"
+
+
+def test_get_orders_pages_are_resumable_by_cursor() -> None:
+    params = {"seed": 3, "profile": "dedup-pressure", "start_at": "2026-02-01T00:00:00Z"}
+
+    first = client.get("/v1/orders", params={**params, "limit": 40}).json()
+    second = client.get("/v1/orders", params={**params, "limit": 60, "cursor": first["next_cursor"]}).json()
+    whole = client.get("/v1/orders", params={**params, "limit": 100}).json()
+
+    assert first["next_cursor"] == 40
+    assert second["next_cursor"] == 100
+    assert first["records"] + second["records"] == whole["records"]
+
+
+def test_get_orders_default_start_is_a_fixed_epoch() -> None:
+    params = {"seed": 7, "limit": 20, "cursor": 100}
+
+    page = client.get("/v1/orders", params=params).json()
+    pinned = client.get("/v1/orders", params={**params, "start_at": "2026-01-01T00:00:00Z"}).json()
+
+    assert page["start_at"] == "2026-01-01T00:00:00+00:00"
+    assert page["records"] == pinned["records"]
+
+
+def test_get_orders_rejects_unknown_profile() -> None:
+    response = client.get("/v1/orders", params={"profile": "unknown"})
+
+    assert response.status_code == 422
+
+
+def test_stream_orders_matches_paged_orders() -> None:
+    params = {"seed": 4, "profile": "production-like", "start_at": "2026-02-01T00:00:00Z"}
+
+    page = client.get("/v1/orders", params={**params, "limit": 20, "cursor": 500}).json()["records"]
+    streamed = client.get("/v1/orders/stream", params={**params, "rows": 20, "cursor": 500}).content.splitlines()
+
+    assert [json.loads(line) for line in streamed] == page
+
+
+def test_stream_orders_is_deterministic_for_seed_and_start() -> None:
+    params = {"rows": 300, "seed": 9, "start_at": "2026-02-01T00:00:00Z"}
+
+    first = client.get("/v1/orders/stream", params=params).content
+    second = client.get("/v1/orders/stream", params={**params, "chunk_size": 7}).content
+
+    assert first == second
+
+
+def test_stream_orders_arrow_format_matches_ndjson() -> None:
+    params = {"rows": 1_200, "seed": 5, "start_at": "2026-02-01T00:00:00Z", "chunk_size": 500}
+
+    ndjson_rows = [json.loads(line) for line in client.get("/v1/orders/stream", params=params).content.splitlines()]
+    arrow_response = client.get("/v1/orders/stream", params={**params, "format": "arrow"})
+    table = pa.ipc.open_stream(arrow_response.content).read_all()
+
+    assert table.num_rows == 1_200
+    assert table.column("order_id").to_pylist() == [row["order_id"] for row in ndjson_rows]
+    assert table.column("amount").to_pylist() == [row["amount"] for row in ndjson_rows]
+
+
+def test_stream_stats_report_rows_per_second() -> None:
+    client.get("/v1/orders/stream", params={"rows": 100})
+
+    stats = client.get("/v1/orders/stream/stats").json()
+
+    assert stats["streams_completed"] >= 1
+    assert stats["last_stream"]["rows"] == 100
+    assert stats["last_stream"]["rows_per_sec"] > 0
@@ -0,0 +1,111 @@
+from datetime import UTC, datetime
+
+from drp.core.order_batch import QUARANTINE_REASONS_COLUMN, SOURCE_ORDER_SCHEMA, OrderBatch
+from drp.ingestion.services.orders_ingestion_service import OrdersIngestionService
+from drp.ingestion.validation.orders_payload_validator import OrdersPayloadValidator
+from drp.storage.postgres.raw_orders_repository import IngestionCheckpoint, PageCommit
+
+RECORDS = [
+    {"order_id": "ord_1", "customer_id": "cus_1", "amount": 10.5, "created_at": "2026-02-20T10:00:00+00:00"},
+    {"order_id": "ord_2", "customer_id": "cus_2", "amount": "abc", "created_at": "2026-02-20T10:00:00+00:00"},
+    {"order_id": "ord_3", "customer_id": "cus_3", "amount": "7.25", "created_at": "2026-13-40T10:00:00"},
+    {"order_id": "ord_4", "amount": 3, "created_at": "2026-02-20 11:30:00Z"},
+    {"order_id": 5, "customer_id": "cus_5", "amount": 4, "created_at": "2026-02-20T12:00:00"},
+]
+
+
+class FakeRepository:
+    def __init__(self) -> None:
+        self.inserted: list[dict] = []
+        self.quarantined: list[dict] = []
+        self.checkpoints: list[IngestionCheckpoint] = []
+
+    def ensure_table(self) -> None:
+        return None
+
+    def commit_page(
+        self,
+        valid: OrderBatch,
+        quarantined: OrderBatch,
+        checkpoint: IngestionCheckpoint,
+    ) -> PageCommit | None:
+        if checkpoint in self.checkpoints:
+            return None
+        self.checkpoints.append(checkpoint)
+        self.inserted.extend(valid.to_records())
+        self.quarantined.extend(quarantined.to_records())
+        return PageCommit(inserted=len(valid), quarantined=len(quarantined))
+
+
+def test_validator_splits_valid_rows_from_quarantined_rows_with_reasons() -> None:
+    result = OrdersPayloadValidator().validate(OrderBatch.from_records(RECORDS))
+
+    assert [row["order_id"] for row in result.valid] == ["ord_1", "5"]
+    assert result.valid[1]["created_at"] == datetime(2026, 2, 20, 12, 0, tzinfo=UTC)
+    for field in SOURCE_ORDER_SCHEMA:
+        assert result.valid.schema.field(field.name).type == field.type
+
+    reasons = {row["order_id"]: row[QUARANTINE_REASONS_COLUMN] for row in result.quarantined}
+    assert reasons == {
+        "ord_2": "non-numeric amount",
+        "ord_3": "invalid created_at",
+        "ord_4": "missing customer_id",
+    }
+    assert result.quarantined[0]["amount"] == "abc"
+
+
+def test_validator_quarantines_amounts_outside_the_raw_numeric_range() -> None:
+    created_at = "2026-02-20T10:00:00+00:00"
+    records = [
+        {"order_id": "ord_1", "customer_id": "cus_1", "amount": 9_999_999_999.99, "created_at": created_at},
+        {"order_id": "ord_2", "customer_id": "cus_2", "amount": 1e12, "created_at": created_at},
+        {"order_id": "ord_3", "customer_id": "cus_3", "amount": "-10000000000", "created_at": created_at},
+        {"order_id": "ord_4", "customer_id": "cus_4", "amount": "9999999999.995", "created_at": created_at},
+    ]
+
+    result = OrdersPayloadValidator().validate(records)
+
+    assert [row["order_id"] for row in result.valid] == ["ord_1"]
+    reasons = {row["order_id"]: row[QUARANTINE_REASONS_COLUMN] for row in result.quarantined}
+    assert reasons == {"ord_2": "out-of-range amount", "ord_3": "out-of-range amount", "ord_4": "out-of-range amount"}
+
+
+def test_validator_quarantines_nul_characters_in_any_string_column() -> None:
+    created_at = "2026-02-20T10:00:00+00:00"
+    records = [
+        {"order_id": "ord_1", "customer_id": "cus\x001", "amount": 1, "created_at": created_at, "note": "ok"},
+        {"order_id": "ord_2", "customer_id": "cus_2", "amount": 2, "created_at": created_at, "note": "x\x00"},
+        {"order_id": "ord_3", "customer_id": "cus_3", "amount": 3, "created_at": created_at, "note": "ok"},
+    ]
+
+    result = OrdersPayloadValidator().validate(records)
+
+    assert [row["order_id"] for row in result.valid] == ["ord_3"]
+    reasons = {row["order_id"]: row[QUARANTINE_REASONS_COLUMN] for row in result.quarantined}
+    assert reasons == {"ord_1": "NUL character in customer_id", "ord_2": "NUL character in note"}
+
+
+def test_validator_reports_every_missing_field() -> None:
+    result = OrdersPayloadValidator().validate([{"unexpected": 1}])
+
+    assert result.valid_count == 0
+    assert result.quarantined[0][QUARANTINE_REASONS_COLUMN] == (
+        "missing order_id; missing customer_id; missing amount; missing created_at"
+    )
+
+
+def test_load_page_is_idempotent_for_a_refetched_page() -> None:
+    repository = FakeRepository()
+    settings = type("DummySettings", (), {"source_system": "orders_api"})()
+    service = OrdersIngestionService(settings=settings, client=object(), repository=repository)  # type: ignore[arg-type]
+
+    first = service.checkpoint_for(OrderBatch.from_records(RECORDS), cursor=100)
+    refetched = service.checkpoint_for(OrderBatch.from_records([dict(record) for record in RECORDS]), cursor=100)
+    loaded = service.load_page(records=OrderBatch.from_records(RECORDS), checkpoint=first)
+    replayed = service.load_page(records=OrderBatch.from_records(RECORDS), checkpoint=refetched)
+
+    assert refetched == first
+    assert (first.cursor_start, first.cursor_end) == (100, 105)
+    assert (loaded.inserted, loaded.quarantined, loaded.already_committed) == (2, 3, False)
+    assert (replayed.inserted, replayed.quarantined, replayed.already_committed) == (0, 0, True)
+    assert len(repository.inserted) == 2
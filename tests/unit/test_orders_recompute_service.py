@@ -0,0 +1,22 @@
+from datetime import date
+
+import pytest
+
+from drp.transform.recompute.orders_recompute_service import DatePartition, split_date_range
+
+
+def test_split_date_range_by_day_and_iso_week() -> None:
+    assert split_date_range(date(2026, 2, 20), date(2026, 2, 21)) == [
+        DatePartition(date(2026, 2, 20), date(2026, 2, 20)),
+        DatePartition(date(2026, 2, 21), date(2026, 2, 21)),
+    ]
+    assert split_date_range(date(2026, 2, 20), date(2026, 3, 3), grain="week") == [
+        DatePartition(date(2026, 2, 20), date(2026, 2, 22)),
+        DatePartition(date(2026, 2, 23), date(2026, 3, 1)),
+        DatePartition(date(2026, 3, 2), date(2026, 3, 3)),
+    ]
+
+
+def test_split_date_range_rejects_inverted_range() -> None:
+    with pytest.raises(ValueError):
+        split_date_range(date(2026, 2, 21), date(2026, 2, 20))
@@ -0,0 +1,244 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, date, datetime
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from drp.core.exceptions import StorageError
+from drp.core.order_batch import OrderBatch
+from drp.ingestion.services.raw_backfill_service import RawBackfillService
+from drp.storage.postgres import raw_orders_repository
+from drp.storage.postgres.raw_orders_repository import PageCommit, RawOrdersRepository
+from drp.transform.staging.orders_staging_service import OrdersStagingService
+
+
+class DummySettings:
+    object_store_raw_prefix = "raw/orders"
+    backfill_max_workers = 4
+
+
+def _key(day: str, index: int) -> str:
+    return f"raw/orders/ingest_date={day}/batch_id={UUID(int=index)}.json"
+
+
+def _payload(index: int, size: int = 3) -> dict:
+    records = [
+        {
+            "order_id": f"ord_{index}_{row}",
+            "customer_id": "cus_1",
+            "amount": "bad" if row == 2 else 5.0,
+            "created_at": "2026-02-20T10:00:00.000000+00:00",
+        }
+        for row in range(size)
+    ]
+    return {"batch_id": str(UUID(int=index)), "record_count": size, "records": records}
+
+
+class FakeObjects:
+    def __init__(self, objects: dict[str, dict], broken_key: str | None = None) -> None:
+        self.objects = objects
+        self.broken_key = broken_key
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def list_keys(self, prefix: str) -> list[str]:
+        return [key for key in self.objects if key.startswith(prefix)] + [f"{prefix}_SUCCESS"]
+
+    def get_json(self, key: str) -> dict:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        if key == self.broken_key:
+            raise StorageError("download failed")
+        return self.objects[key]
+
+
+class FakeRepository:
+    def __init__(self) -> None:
+        self.loaded: dict[str, tuple[UUID, list[dict], list[dict]]] = {}
+        self.ingested_at: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def ensure_table(self) -> None:
+        return None
+
+    def loaded_archive_keys(self, object_keys: list[str]) -> set[str]:
+        return set(object_keys) & set(self.loaded)
+
+    def commit_archived_batch(
+        self,
+        valid: OrderBatch,
+        quarantined: OrderBatch,
+        batch_id: UUID,
+        object_key: str,
+        ingested_at: datetime,
+    ) -> PageCommit | None:
+        with self._lock:
+            if object_key in self.loaded:
+                return None
+            self.ingested_at[object_key] = ingested_at
+            self.loaded[object_key] = (batch_id, valid.to_records(), quarantined.to_records())
+        return PageCommit(inserted=len(valid), quarantined=len(quarantined))
+
+
+class FakeCopy:
+    def __init__(self, rows: list[tuple[Any, ...]]) -> None:
+        self._rows = rows
+
+    def write_row(self, row: tuple[Any, ...]) -> None:
+        self._rows.append(row)
+
+
+class FakeCursor:
+    def __init__(self, checkpoint: tuple[str, datetime] | None) -> None:
+        self.checkpoint = checkpoint
+        self.copied: list[tuple[Any, ...]] = []
+        self._result: list[tuple[Any, ...]] = []
+
+    def execute(self, statement: str, params: tuple[Any, ...] = ()) -> None:
+        if "RETURNING object_key" in statement:
+            self._result = [(params[0],)]
+        elif "SELECT batch_hash, committed_at" in statement:
+            self._result = [self.checkpoint] if self.checkpoint is not None else []
+        elif "RETURNING source_order_id, amount" in statement:
+            self._result = [(row[0], row[2]) for row in self.copied]
+        else:
+            self._result = []
+
+    def fetchone(self) -> tuple[Any, ...] | None:
+        return self._result[0] if self._result else None
+
+    def fetchall(self) -> list[tuple[Any, ...]]:
+        return self._result
+
+    @contextmanager
+    def copy(self, statement: str) -> Iterator[FakeCopy]:
+        yield FakeCopy(self.copied)
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+class FakeConnection:
+    def __init__(self, cursor: FakeCursor) -> None:
+        self._cursor = cursor
+
+    def cursor(self) -> FakeCursor:
+        return self._cursor
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def __enter__(self) -> "FakeConnection":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+class RepositorySettings:
+    postgres_dsn = "postgresql://unused"
+    raw_schema = "raw"
+    raw_orders_table = "orders_raw"
+    raw_quarantine_table = "orders_quarantine"
+    raw_checkpoint_table = "ingestion_checkpoints"
+    raw_backfill_table = "backfill_progress"
+    raw_fingerprint_table = "batch_fingerprints"
+    source_system = "orders_api"
+
+
+def _service(objects: FakeObjects, repository: FakeRepository) -> RawBackfillService:
+    return RawBackfillService(
+        settings=DummySettings(),  # type: ignore[arg-type]
+        repository=repository,  # type: ignore[arg-type]
+        objects=objects,  # type: ignore[arg-type]
+    )
+
+
+def test_backfill_loads_archived_batches_for_date_range_in_parallel() -> None:
+    keys = {_key("2026-02-01", 1): 1, _key("2026-02-02", 2): 2, _key("2026-02-03", 3): 3, _key("2026-02-05", 5): 5}
+    for index in range(10, 16):
+        keys[_key("2026-02-02", index)] = index
+    objects = FakeObjects({key: _payload(index) for key, index in keys.items()})
+    repository = FakeRepository()
+
+    stats = _service(objects, repository).run(start=date(2026, 2, 2), end=date(2026, 2, 4))
+
+    assert sorted(repository.loaded) == sorted(key for key in keys if "02-02" in key or "02-03" in key)
+    assert (stats.batches_listed, stats.batches_loaded, stats.batches_skipped) == (8, 8, 0)
+    assert (stats.records_inserted, stats.records_quarantined) == (16, 8)
+    batch_id, valid, quarantined = repository.loaded[_key("2026-02-03", 3)]
+    assert batch_id == UUID(int=3)
+    assert [row["order_id"] for row in valid] == ["ord_3_0", "ord_3_1"]
+    assert quarantined[0]["quarantine_reasons"] == "non-numeric amount"
+    assert 1 < objects.max_active <= DummySettings.backfill_max_workers
+
+
+def test_backfill_resumes_after_a_failed_run() -> None:
+    keys = [_key("2026-02-02", index) for index in range(6)]
+    objects = FakeObjects({key: _payload(index) for index, key in enumerate(keys)}, broken_key=keys[3])
+    repository = FakeRepository()
+
+    with pytest.raises(StorageError):
+        _service(objects, repository).run(start=date(2026, 2, 2), end=date(2026, 2, 2), max_workers=1)
+    loaded_before = set(repository.loaded)
+    objects.broken_key = None
+    stats = _service(objects, repository).run(start=date(2026, 2, 2), end=date(2026, 2, 2))
+
+    assert set(keys[:3]) <= loaded_before
+    assert keys[3] not in loaded_before
+    assert set(repository.loaded) == set(keys)
+    assert stats.batches_skipped == len(loaded_before)
+    assert stats.batches_loaded == len(keys) - len(loaded_before)
+
+
+def test_backfill_keys_unchecked_batches_to_their_archive_day() -> None:
+    key = _key("2026-02-03", 3)
+    repository = FakeRepository()
+
+    _service(FakeObjects({key: _payload(3)}), repository).run(start=date(2026, 2, 3), end=date(2026, 2, 3))
+
+    assert repository.ingested_at[key] == datetime(2026, 2, 3, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    ("checkpoint", "expected_ingested_at"),
+    [
+        (("hash-1", datetime(2026, 2, 3, 9, 30, tzinfo=UTC)), datetime(2026, 2, 3, 9, 30, tzinfo=UTC)),
+        (None, datetime(2026, 2, 3, tzinfo=UTC)),
+    ],
+)
+def test_backfilled_stale_version_loses_to_newer_live_row(
+    monkeypatch: pytest.MonkeyPatch,
+    checkpoint: tuple[str, datetime] | None,
+    expected_ingested_at: datetime,
+) -> None:
+    cursor = FakeCursor(checkpoint)
+    monkeypatch.setattr(raw_orders_repository, "connect", lambda dsn: FakeConnection(cursor))
+    monkeypatch.setattr(raw_orders_repository, "json_param", lambda value: value)
+    key = _key("2026-02-03", 3)
+    objects = FakeObjects({key: _payload(3, size=1)})
+    repository = RawOrdersRepository(RepositorySettings())  # type: ignore[arg-type]
+
+    # The archive is replayed days after a correction to ord_3_0 was loaded live.
+    _service(objects, repository).run(start=date(2026, 2, 3), end=date(2026, 2, 3))  # type: ignore[arg-type]
+    backfilled = dict(zip(raw_orders_repository._RAW_COLUMNS, cursor.copied[0], strict=True))
+    live = {**backfilled, "amount": 7.5, "ingested_at": datetime(2026, 2, 4, 8, 0, tzinfo=UTC)}
+    staged = OrdersStagingService(warehouse=None).clean([backfilled, live])  # type: ignore[arg-type]
+
+    assert backfilled["ingested_at"] == expected_ingested_at
+    assert staged.to_records()[0]["amount"] == 7.5
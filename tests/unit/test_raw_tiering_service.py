@@ -0,0 +1,209 @@
+import shutil
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+from drp.core.exceptions import StorageError
+from drp.core.order_batch import RAW_ORDER_SCHEMA, OrderBatch
+from drp.storage.object_store.raw_tiering_service import COLD_RAW_ORDER_SCHEMA, RawTieringService
+
+
+class DummySettings:
+    object_store_enabled = True
+    object_store_raw_cold_prefix = "raw/orders_cold"
+    raw_hot_retention_days = 30
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.raw_cold_cache_dir = str(cache_dir)
+
+
+def _row(index: int, ingested_at: datetime) -> dict:
+    return {
+        "source_order_id": f"ord_{index}",
+        "customer_id": "cus_1",
+        "amount": 10.0 + index,
+        "order_created_at": ingested_at - timedelta(minutes=5),
+        "ingested_at": ingested_at,
+        "batch_id": "00000000-0000-0000-0000-000000000001",
+        "source_system": "orders_api",
+        "batch_hash": "hash-1",
+        "raw_payload": f'{{"order_id": "ord_{index}"}}',
+    }
+
+
+class FakeRawRepository:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.deleted: list[date] = []
+
+    def list_raw_partitions(self, before: date) -> list[tuple[date, int]]:
+        counts: dict[date, int] = {}
+        for row in self.rows:
+            if row["ingested_at"].date() < before:
+                counts[row["ingested_at"].date()] = counts.get(row["ingested_at"].date(), 0) + 1
+        return sorted(counts.items())
+
+    def iter_raw_partition(self, ingest_date: date):
+        day = [row for row in self.rows if row["ingested_at"].date() == ingest_date]
+        for offset in range(0, len(day), 2):
+            yield OrderBatch.from_records(day[offset : offset + 2], COLD_RAW_ORDER_SCHEMA)
+
+    def delete_raw_partition(self, ingest_date: date, expected_rows: int) -> int:
+        self.deleted.append(ingest_date)
+        self.rows = [row for row in self.rows if row["ingested_at"].date() != ingest_date]
+        return expected_rows
+
+    def fetch_raw_orders_between(self, start: datetime, end: datetime) -> OrderBatch:
+        rows = [
+            {key: value for key, value in row.items() if key != "raw_payload"}
+            for row in self.rows
+            if start <= row["ingested_at"] < end
+        ]
+        return OrderBatch.from_records(rows, COLD_RAW_ORDER_SCHEMA)
+
+    def fetch_raw_order_versions(
+        self, created_from: datetime, created_to: datetime, source_order_ids: tuple[str, ...] = ()
+    ) -> OrderBatch:
+        touched = {row["source_order_id"] for row in self.rows if created_from <= row["order_created_at"] < created_to}
+        touched |= set(source_order_ids)
+        rows = [row for row in self.rows if row["source_order_id"] in touched]
+        return OrderBatch.from_records(rows, RAW_ORDER_SCHEMA)
+
+
+class FakeObjectRepository:
+    def __init__(self, root: Path, fail_upload: bool = False) -> None:
+        self.root = root
+        self.fail_upload = fail_upload
+        self.downloads: list[str] = []
+
+    def upload_file(self, local_path: str, key: str) -> str:
+        if self.fail_upload:
+            raise StorageError("upload failed")
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, target)
+        return f"s3://bucket/{key}"
+
+    def list_keys(self, prefix: str) -> list[str]:
+        keys = [str(path.relative_to(self.root)) for path in self.root.rglob("*.parquet")]
+        return [key for key in keys if key.startswith(prefix)]
+
+    def delete_object(self, key: str) -> None:
+        (self.root / key).unlink()
+
+    def download_file(self, key: str, local_path: str) -> str:
+        self.downloads.append(key)
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.root / key, local_path)
+        return local_path
+
+
+def _service(tmp_path: Path, rows: list[dict], fail_upload: bool = False):
+    raw = FakeRawRepository(rows)
+    objects = FakeObjectRepository(tmp_path / "bucket", fail_upload=fail_upload)
+    service = RawTieringService(
+        settings=DummySettings(tmp_path / "cache"),  # type: ignore[arg-type]
+        raw_repository=raw,  # type: ignore[arg-type]
+        object_repository=objects,  # type: ignore[arg-type]
+    )
+    return service, raw, objects
+
+
+def test_offload_moves_partitions_older_than_retention_to_parquet(tmp_path: Path) -> None:
+    old = datetime(2026, 1, 1, 8, tzinfo=UTC)
+    recent = datetime(2026, 3, 1, 8, tzinfo=UTC)
+    rows = [_row(index, old + timedelta(hours=index)) for index in range(5)] + [_row(9, recent)]
+    service, raw, objects = _service(tmp_path, rows)
+
+    partitions = service.offload_cold_partitions(as_of=date(2026, 3, 2))
+
+    assert [(partition.ingest_date, partition.row_count) for partition in partitions] == [(date(2026, 1, 1), 5)]
+    assert raw.deleted == [date(2026, 1, 1)]
+    assert [row["source_order_id"] for row in raw.rows] == ["ord_9"]
+    key = partitions[0].uri.removeprefix("s3://bucket/")
+    assert key.startswith("raw/orders_cold/ingest_date=2026-01-01/part-")
+    exported = pq.ParquetFile(objects.root / key).read()
+    assert exported.schema == COLD_RAW_ORDER_SCHEMA
+    assert pq.read_metadata(objects.root / key).row_group(0).column(0).compression == "ZSTD"
+    assert exported.column("raw_payload").to_pylist()[0] == '{"order_id": "ord_0"}'
+
+
+def test_offload_keeps_rows_in_postgres_when_upload_fails(tmp_path: Path) -> None:
+    rows = [_row(index, datetime(2026, 1, 1, 8, tzinfo=UTC)) for index in range(3)]
+    service, raw, _ = _service(tmp_path, rows, fail_upload=True)
+
+    with pytest.raises(StorageError):
+        service.offload_cold_partitions(as_of=date(2026, 3, 2))
+
+    assert raw.deleted == []
+    assert len(raw.rows) == 3
+
+
+def test_read_raw_orders_unions_hot_and_cold_tiers(tmp_path: Path) -> None:
+    rows = [_row(index, datetime(2026, 1, day, 8, tzinfo=UTC)) for index, day in enumerate((1, 2, 20), start=1)]
+    service, _, objects = _service(tmp_path, rows)
+    service.offload_cold_partitions(as_of=date(2026, 2, 10))
+
+    result = service.read_raw_orders(start=date(2026, 1, 2), end=date(2026, 1, 31))
+    again = service.read_raw_orders(start=date(2026, 1, 2), end=date(2026, 1, 31))
+
+    assert [row["source_order_id"] for row in result] == ["ord_2", "ord_3"]
+    assert result[0]["ingested_at"] == datetime(2026, 1, 2, 8, tzinfo=UTC)
+    assert result[0]["amount"] == 12.0
+    assert again.to_records() == result.to_records()
+    assert len(objects.downloads) == 1
+
+
+def test_replayed_tiered_day_is_read_once_and_re_offloaded_into_one_object(tmp_path: Path) -> None:
+    day = datetime(2026, 1, 1, 8, tzinfo=UTC)
+    rows = [_row(index, day + timedelta(hours=index)) for index in range(3)]
+    service, raw, objects = _service(tmp_path, rows)
+    service.offload_cold_partitions(as_of=date(2026, 3, 2))
+    # A backfill replays part of the offloaded day with its original ingest time, plus a row it never had.
+    raw.rows = [rows[1], _row(7, day + timedelta(hours=5))]
+
+    result = service.read_raw_orders(start=date(2026, 1, 1), end=date(2026, 1, 1))
+    partitions = service.offload_cold_partitions(as_of=date(2026, 3, 2))
+    reread = service.read_raw_orders(start=date(2026, 1, 1), end=date(2026, 1, 1))
+
+    assert [row["source_order_id"] for row in result] == ["ord_0", "ord_1", "ord_2", "ord_7"]
+    assert [(partition.ingest_date, partition.row_count) for partition in partitions] == [(date(2026, 1, 1), 2)]
+    [key] = objects.list_keys(prefix="raw/orders_cold/ingest_date=2026-01-01/")
+    merged = pq.read_table(objects.root / key)
+    assert merged.column("source_order_id").to_pylist() == ["ord_0", "ord_1", "ord_2", "ord_7"]
+    assert raw.rows == []
+    assert reread.to_records() == result.to_records()
+
+
+def test_order_versions_are_read_from_both_tiers(tmp_path: Path) -> None:
+    old = datetime(2026, 1, 1, 8, tzinfo=UTC)
+    rows = [_row(index, old + timedelta(hours=index)) for index in range(3)]
+    service, raw, _ = _service(tmp_path, rows)
+    service.offload_cold_partitions(as_of=date(2026, 3, 2))
+    # ord_1 was corrected after its first version went cold; ord_9 was created on a later day.
+    correction = {**_row(1, datetime(2026, 3, 1, 8, tzinfo=UTC)), "order_created_at": rows[1]["order_created_at"]}
+    raw.rows = [correction, _row(9, datetime(2026, 3, 1, 9, tzinfo=UTC))]
+
+    versions = service.read_raw_order_versions(
+        created_from=datetime(2026, 1, 1, tzinfo=UTC), created_to=datetime(2026, 1, 2, tzinfo=UTC)
+    )
+
+    assert [(row["source_order_id"], row["ingested_at"].date()) for row in versions] == [
+        ("ord_0", date(2026, 1, 1)),
+        ("ord_1", date(2026, 1, 1)),
+        ("ord_2", date(2026, 1, 1)),
+        ("ord_1", date(2026, 3, 1)),
+    ]
+
+
+def test_order_versions_read_only_postgres_without_cold_partitions(tmp_path: Path) -> None:
+    rows = [_row(index, datetime(2026, 3, 1, 8 + index, tzinfo=UTC)) for index in range(2)]
+    service, _, _ = _service(tmp_path, rows)
+
+    versions = service.read_raw_order_versions(
+        created_from=datetime(2026, 3, 1, tzinfo=UTC), created_to=datetime(2026, 3, 2, tzinfo=UTC)
+    )
+
+    assert [row["source_order_id"] for row in versions] == ["ord_0", "ord_1"]
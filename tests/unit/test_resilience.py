@@ -0,0 +1,82 @@
+import pytest
+
+from drp.core.exceptions import CircuitOpenError
+from drp.ingestion.connectors.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_token_bucket_allows_a_burst_then_paces_callers_at_the_rate() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=4, burst=2, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+    assert [bucket.acquire() for _ in range(3)] == [0.25, 0.25, 0.25]
+
+    # An idle period refills the bucket, but never beyond the burst.
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.25]
+
+
+def test_circuit_breaker_probes_half_open_and_backs_off_exponentially_with_jitter() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "orders",
+        failure_threshold=3,
+        reset_timeout_seconds=2,
+        max_reset_timeout_seconds=5,
+        clock=clock,
+        jitter=iter([1.0, 1.0, 1.0, 0.0]).__next__,
+    )
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_after_seconds == 2
+
+    # Only one caller probes once the open period has passed; a failed probe doubles the period.
+    clock.now += 2
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_after_seconds == 4
+
+    clock.now += 4
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_after_seconds == 5
+
+    clock.now += 5
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+    for _ in range(3):
+        breaker.record_failure()
+    # A successful probe reset the backoff, and jitter shortens the period by at most half.
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_after_seconds == 1
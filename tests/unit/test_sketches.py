@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from drp.core.sketches import HyperLogLog, TDigest, hash64
+
+
+def test_hyperloglog_merge_estimates_union_cardinality() -> None:
+    customers = [f"cus_{index}" for index in range(20_000)]
+    left = HyperLogLog.from_values(customers[:12_000])
+    right = HyperLogLog.from_values(customers[8_000:])
+
+    merged = HyperLogLog.from_bytes(left.merge(right).to_bytes())
+
+    assert merged.estimate() == pytest.approx(20_000, rel=0.05)
+    assert HyperLogLog.from_values(customers[:50]).estimate() == pytest.approx(50, abs=2)
+    assert HyperLogLog().estimate() == 0.0
+    assert hash64("abc") == 12704604231530709392
+
+
+def test_tdigest_merged_quantiles_track_exact_quantiles() -> None:
+    amounts = np.random.default_rng(7).lognormal(mean=3.0, sigma=1.0, size=100_000)
+    digest = TDigest()
+    for chunk in np.array_split(amounts, 20):
+        digest = digest.merge(TDigest.from_bytes(TDigest.from_values(chunk).to_bytes()))
+
+    assert digest.count == amounts.size
+    for q in (0.5, 0.95, 0.99):
+        assert digest.quantile(q) == pytest.approx(float(np.quantile(amounts, q)), rel=0.02)
+    assert digest.quantile(0.0) == amounts.min()
+    assert digest.quantile(1.0) == amounts.max()
+    assert TDigest().quantile(0.5) is None
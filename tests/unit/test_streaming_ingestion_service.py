@@ -0,0 +1,262 @@
+import json
+import threading
+import time
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from drp.core.exceptions import DataSourceError
+from drp.core.order_batch import OrderBatch
+from drp.ingestion.services.streaming_ingestion_service import StreamingIngestionService
+from drp.quality.drift import DriftFinding, DriftReport
+from drp.storage.postgres.raw_orders_repository import IngestionCheckpoint, PageCommit
+
+
+class DummySettings:
+    stream_page_size = 10
+    stream_queue_max_pages = 2
+    stream_commit_max_records = 25
+    stream_commit_max_seconds = 0.2
+    stream_archive_queue_max_batches = 2
+    stream_idle_wait_seconds = 0.01
+    stream_max_consecutive_fetch_errors = 3
+    source_system = "orders_api"
+    raw_archive_catchup_batches = 20
+    ingest_adaptive_batching = False
+
+
+class FakeClient:
+    def __init__(self, failures: int = 0) -> None:
+        self.calls: list[tuple[int, int | None]] = []
+        self._failures = failures
+
+    def fetch_orders(self, limit: int, cursor: int | None = None) -> OrderBatch:
+        self.calls.append((limit, cursor))
+        if self._failures > 0:
+            self._failures -= 1
+            raise DataSourceError("temporary outage")
+        start = cursor or 0
+        return OrderBatch.from_records(
+            [
+                {
+                    "order_id": f"ord_{index}",
+                    "customer_id": "cus_1",
+                    "amount": "not-a-number" if index == 7 else 10.0,
+                    "created_at": "2026-02-20T10:00:00+00:00",
+                }
+                for index in range(start, start + limit)
+            ]
+        )
+
+
+class AdaptiveSettings(DummySettings):
+    ingest_adaptive_batching = True
+    ingest_min_page_size = 5
+    ingest_max_page_size = 40
+    ingest_max_in_flight = 3
+    ingest_target_latency_seconds = 0.5
+
+    def __init__(self, state_path: Path) -> None:
+        self.ingest_batch_state_path = str(state_path)
+
+
+class ConcurrentClient(FakeClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch_orders(self, limit: int, cursor: int | None = None) -> OrderBatch:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.005)
+        try:
+            with self._lock:
+                return super().fetch_orders(limit=limit, cursor=cursor)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class FakeRepository:
+    def __init__(self, delay_seconds: float = 0.0, checkpoint: IngestionCheckpoint | None = None) -> None:
+        self.batches: list[tuple[UUID, list[dict]]] = []
+        self.quarantined: list[dict] = []
+        self.checkpoints: list[IngestionCheckpoint] = [] if checkpoint is None else [checkpoint]
+        self.archived: set[UUID] = set()
+        self.ensure_calls = 0
+        self._delay_seconds = delay_seconds
+
+    def ensure_table(self) -> None:
+        self.ensure_calls += 1
+
+    def latest_checkpoint(self, source_system: str) -> IngestionCheckpoint | None:
+        return max(self.checkpoints, key=lambda checkpoint: checkpoint.cursor_end, default=None)
+
+    def commit_page(
+        self,
+        valid: OrderBatch,
+        quarantined: OrderBatch,
+        checkpoint: IngestionCheckpoint,
+    ) -> PageCommit | None:
+        time.sleep(self._delay_seconds)
+        if checkpoint in self.checkpoints:
+            return None
+        self.quarantined.extend(quarantined.to_records())
+        self.batches.append((checkpoint.batch_id, valid.to_records()))
+        self.checkpoints.append(checkpoint)
+        return PageCommit(inserted=len(valid), quarantined=len(quarantined))
+
+    def mark_archived(self, batch_id: UUID) -> None:
+        self.archived.add(batch_id)
+
+
+class FakeArchive:
+    def __init__(self) -> None:
+        self.batch_ids: list[str] = []
+        self.catchup_sources: list[str] = []
+
+    def archive_raw_batch(self, batch_id: str, records: OrderBatch) -> str | None:
+        self.batch_ids.append(batch_id)
+        return f"s3://raw/{batch_id}.json"
+
+    def archive_unarchived_batches(self, repository: FakeRepository, source_system: str, limit: int) -> list[str]:
+        self.catchup_sources.append(source_system)
+        return []
+
+
+class FakeDriftMonitor:
+    def __init__(self) -> None:
+        self.observed: list[tuple[UUID, int]] = []
+
+    def observe(self, batch_id: UUID, records: OrderBatch) -> DriftReport:
+        self.observed.append((batch_id, len(records)))
+        # The first micro-batch carries the unparsable amount, which is what the fake reports as drift.
+        findings = (DriftFinding("amount", "null_rate", 0.04, 0.0, 0.04, 0.01),) if len(self.observed) == 1 else ()
+        return DriftReport(batch_id=batch_id, profiled_columns=4, baseline_batches=5, findings=findings)
+
+
+def _service(
+    client: FakeClient,
+    repository: FakeRepository,
+    archive: FakeArchive,
+    settings: DummySettings | None = None,
+    drift_monitor: FakeDriftMonitor | None = None,
+) -> StreamingIngestionService:
+    return StreamingIngestionService(
+        settings=settings or DummySettings(),  # type: ignore[arg-type]
+        client=client,  # type: ignore[arg-type]
+        repository=repository,  # type: ignore[arg-type]
+        archive=archive,  # type: ignore[arg-type]
+        drift_monitor=drift_monitor,  # type: ignore[arg-type]
+    )
+
+
+def test_streaming_ingestion_commits_size_bounded_batches_and_archives_each() -> None:
+    client, repository, archive, drift_monitor = FakeClient(), FakeRepository(), FakeArchive(), FakeDriftMonitor()
+
+    stats = _service(client, repository, archive, drift_monitor=drift_monitor).run(
+        stop_event=threading.Event(), max_records=95
+    )
+
+    loaded_ids = [record["order_id"] for _, records in repository.batches for record in records]
+    assert loaded_ids == [f"ord_{index}" for index in range(95) if index != 7]
+    assert [record["order_id"] for record in repository.quarantined] == ["ord_7"]
+    assert all(len(records) <= 30 for _, records in repository.batches)
+    assert archive.batch_ids == [str(batch_id) for batch_id, _ in repository.batches]
+    assert repository.archived == {batch_id for batch_id, _ in repository.batches}
+    assert archive.catchup_sources == ["orders_api"]
+    assert repository.ensure_calls == 1
+    assert stats.records_loaded == 94
+    assert stats.records_quarantined == 1
+    assert stats.next_cursor == 95
+    assert stats.batches_archived == stats.batches_committed == len(repository.batches)
+    # Each micro-batch is profiled as delivered, including the row validation quarantined.
+    assert [batch_id for batch_id, _ in drift_monitor.observed] == [batch_id for batch_id, _ in repository.batches]
+    assert sum(rows for _, rows in drift_monitor.observed) == 95
+    assert stats.drifted_batches == 1
+
+
+def test_streaming_ingestion_applies_backpressure_and_drains_on_stop() -> None:
+    client, repository, archive = FakeClient(), FakeRepository(delay_seconds=0.1), FakeArchive()
+    stop_event = threading.Event()
+    timer = threading.Timer(0.3, stop_event.set)
+    timer.start()
+
+    stats = _service(client, repository, archive).run(stop_event=stop_event)
+    timer.cancel()
+
+    loaded = sum(len(records) for _, records in repository.batches) + len(repository.quarantined)
+    # The fetcher can only run ahead of the loader by the bounded queue plus one buffered commit.
+    assert stats.records_fetched - loaded == 0
+    assert stats.records_fetched <= (len(repository.batches) + 1) * 30 + DummySettings.stream_queue_max_pages * 10
+    assert len(archive.batch_ids) == len(repository.batches)
+
+
+def test_streaming_ingestion_retries_transient_fetch_errors() -> None:
+    client, repository, archive = FakeClient(failures=2), FakeRepository(), FakeArchive()
+
+    stats = _service(client, repository, archive).run(stop_event=threading.Event(), max_records=20)
+
+    assert stats.fetch_errors == 2
+    assert stats.records_loaded + stats.records_quarantined == 20
+
+
+def test_streaming_ingestion_raises_after_consecutive_fetch_errors() -> None:
+    client, repository, archive = FakeClient(failures=10), FakeRepository(), FakeArchive()
+
+    with pytest.raises(DataSourceError):
+        _service(client, repository, archive).run(stop_event=threading.Event(), max_records=20)
+
+    assert repository.batches == []
+
+
+def test_streaming_ingestion_resumes_after_last_committed_checkpoint() -> None:
+    committed = IngestionCheckpoint(
+        source_system="orders_api",
+        cursor_start=0,
+        cursor_end=40,
+        batch_id=UUID(int=1),
+        batch_hash="committed",
+    )
+    client, repository, archive = FakeClient(), FakeRepository(checkpoint=committed), FakeArchive()
+
+    stats = _service(client, repository, archive).run(stop_event=threading.Event(), max_records=20)
+
+    assert client.calls[0] == (10, 40)
+    assert [checkpoint.cursor_start for checkpoint in repository.checkpoints[1:]] == [40]
+    assert stats.next_cursor == 60
+
+
+def test_streaming_ingestion_replay_of_committed_range_loads_nothing() -> None:
+    client, repository, archive = FakeClient(), FakeRepository(), FakeArchive()
+    _service(client, repository, archive).run(stop_event=threading.Event(), max_records=50, start_cursor=0)
+    committed_batches = list(repository.batches)
+
+    stats = _service(FakeClient(), repository, archive).run(stop_event=threading.Event(), max_records=50, start_cursor=0)
+
+    assert repository.batches == committed_batches
+    assert stats.records_loaded == 0
+
+
+def test_streaming_ingestion_adapts_page_size_and_concurrency_and_starts_warm(tmp_path: Path) -> None:
+    settings = AdaptiveSettings(tmp_path / "batch_sizing.json")
+    client, repository, archive = ConcurrentClient(), FakeRepository(), FakeArchive()
+
+    stats = _service(client, repository, archive, settings).run(stop_event=threading.Event(), max_records=600)
+
+    loaded_ids = [record["order_id"] for _, records in repository.batches for record in records]
+    assert loaded_ids == [f"ord_{index}" for index in range(600) if index != 7]
+    assert client.calls[0] == (10, 0)
+    assert max(limit for limit, _ in client.calls) == 40
+    assert client.max_active > 1
+    assert (stats.page_size, stats.in_flight) == (40, 3)
+    assert json.loads((tmp_path / "batch_sizing.json").read_text())["orders_api"]["in_flight"] == 3
+
+    warm_client = ConcurrentClient()
+    _service(warm_client, FakeRepository(), FakeArchive(), settings).run(stop_event=threading.Event(), max_records=80)
+    # The second run opens at the persisted size: two full windows in flight at once cover the 80 rows.
+    assert sorted(warm_client.calls) == [(40, 0), (40, 40)]
@@ -0,0 +1,73 @@
+import pytest
+
+from drp.synthetic.orders_generator import (
+    SyntheticOrdersConfig,
+    SyntheticOrdersGenerator,
+    get_load_profile,
+)
+
+
+def test_generator_is_deterministic_for_seed() -> None:
+    config = SyntheticOrdersConfig(rows=500, seed=7, duplicate_ratio=0.2, customer_skew=1.2)
+
+    first = SyntheticOrdersGenerator(config).source_records(chunk_size=128)
+    second = SyntheticOrdersGenerator(config).source_records(chunk_size=128)
+
+    assert first == second
+    assert len(first) == 500
+    assert set(first[0]) == {"order_id", "customer_id", "amount", "created_at"}
+
+
+def test_generator_emits_configured_duplicate_ratio() -> None:
+    config = SyntheticOrdersConfig(rows=20_000, seed=3, duplicate_ratio=0.25)
+
+    records = SyntheticOrdersGenerator(config).raw_records()
+    distinct_orders = len({record["source_order_id"] for record in records})
+
+    duplicate_share = 1 - distinct_orders / len(records)
+    assert duplicate_share == pytest.approx(0.25, abs=0.03)
+
+
+def test_generator_skews_customers_with_zipf_exponent() -> None:
+    uniform = SyntheticOrdersGenerator(SyntheticOrdersConfig(rows=5_000, customer_count=1_000)).raw_records()
+    skewed = SyntheticOrdersGenerator(
+        SyntheticOrdersConfig(rows=5_000, customer_count=1_000, customer_skew=1.5)
+    ).raw_records()
+
+    def top_customer_share(records: list[dict]) -> float:
+        counts: dict[str, int] = {}
+        for record in records:
+            counts[record["customer_id"]] = counts.get(record["customer_id"], 0) + 1
+        return max(counts.values()) / len(records)
+
+    assert top_customer_share(skewed) > 10 * top_customer_share(uniform)
+
+
+def test_generator_rejects_invalid_duplicate_ratio() -> None:
+    with pytest.raises(ValueError):
+        SyntheticOrdersGenerator(SyntheticOrdersConfig(rows=10, duplicate_ratio=1.0))
+
+
+def test_page_is_addressable_by_cursor() -> None:
+    generator = SyntheticOrdersGenerator(SyntheticOrdersConfig(rows=1_000, seed=5, duplicate_ratio=0.3))
+
+    full = generator.source_records(chunk_size=1_000)
+    page = generator.page(cursor=400, size=50).to_source_records()
+
+    assert page == full[400:450]
+
+
+def test_load_profile_injects_late_and_negative_orders() -> None:
+    config = get_load_profile("production-like").to_config(rows=20_000, seed=2, order_interval_us=1_000_000)
+    records = SyntheticOrdersGenerator(config).raw_records()
+
+    negative = [record for record in records if record["amount"] < 0]
+    late = [record for record in records if record["order_created_at"] < config.start_at.isoformat()]
+
+    assert 0 < len(negative) < 100
+    assert late
+
+
+def test_unknown_load_profile_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        get_load_profile("does-not-exist")
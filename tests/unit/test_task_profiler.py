@@ -0,0 +1,139 @@
+import cProfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from drp.observability import flow_monitor as flow_monitor_module
+from drp.observability import task_profiler
+from drp.observability.flow_monitor import FlowExecutionContext, FlowMonitor
+from drp.observability.task_profiler import TaskProfiler, profile_dir
+from drp.storage.object_store.archive_service import ObjectStoreArchiveService
+
+
+class DummySettings:
+    object_store_enabled = True
+    object_store_required = False
+    object_store_bucket = "drp-lakehouse"
+    object_store_profiles_prefix = "profiles"
+    alert_on_failure = False
+    alert_webhook_url = None
+
+    def __init__(self, profile_output_dir: Path) -> None:
+        self.profile_output_dir = str(profile_output_dir)
+
+
+class FakeRepo:
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+
+    def upload_file(self, local_path: str, key: str) -> str:
+        self.keys.append(key)
+        return f"s3://drp-lakehouse/{key}"
+
+
+class FakeAuditRepository:
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+
+    def insert_audit_event(self, **event: Any) -> None:
+        self.events.append(event)
+
+
+def _spin(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def test_task_profiler_writes_function_stats_and_collapsed_stacks(tmp_path: Path) -> None:
+    with TaskProfiler(output_dir=tmp_path, name="build staging/orders", sample_interval_seconds=0.001):
+        _spin(0.1)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "build_staging_orders.folded",
+        "build_staging_orders.pstats",
+        "build_staging_orders.stats.txt",
+    ]
+    assert "_spin" in (tmp_path / "build_staging_orders.stats.txt").read_text(encoding="utf-8")
+    folded = (tmp_path / "build_staging_orders.folded").read_text(encoding="utf-8").splitlines()
+    assert folded
+    stack, count = folded[0].rsplit(" ", 1)
+    assert stack.split(";")[0] == f"{__name__}:_spin"
+    assert int(count) > 0
+
+
+def test_overlapping_profiled_tasks_share_cprofile_and_each_keep_their_stacks(tmp_path: Path) -> None:
+    # Python 3.12 refuses a second active cProfile in the process; concurrent tasks must not fail on it.
+    both_running = threading.Barrier(2)
+    errors: list[BaseException] = []
+
+    def task(name: str) -> None:
+        try:
+            with TaskProfiler(output_dir=tmp_path, name=name, sample_interval_seconds=0.001):
+                both_running.wait(timeout=5)
+                _spin(0.1)
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=task, args=(name,)) for name in ("analytics", "quality")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(list(tmp_path.glob("*.pstats"))) == 1
+    for name in ("analytics", "quality"):
+        folded = (tmp_path / f"{name}.folded").read_text(encoding="utf-8")
+        assert f"{__name__}:_spin" in folded
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("profile-")]
+
+
+def test_task_profiler_samples_only_when_another_profiler_is_active(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class ActiveToolProfile(cProfile.Profile):
+        def enable(self, *args: Any, **kwargs: Any) -> None:
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(task_profiler.cProfile, "Profile", ActiveToolProfile)
+    with TaskProfiler(output_dir=tmp_path, name="task-a", sample_interval_seconds=0.001):
+        _spin(0.05)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["task-a.folded"]
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("profile-")]
+    # The failed attempt gave the process-wide slot back.
+    assert task_profiler._CPROFILE_LOCK.acquire(blocking=False)
+    task_profiler._CPROFILE_LOCK.release()
+
+
+def test_flow_monitor_archives_profiles_and_references_them_in_audit_metadata(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = DummySettings(tmp_path)
+    repo = FakeRepo()
+    monkeypatch.setattr(
+        flow_monitor_module,
+        "ObjectStoreArchiveService",
+        lambda settings: ObjectStoreArchiveService(settings, repository=repo),  # type: ignore[arg-type]
+    )
+    monitor = FlowMonitor(settings)  # type: ignore[arg-type]
+    audit = FakeAuditRepository()
+    monitor._audit_repo = audit  # type: ignore[assignment]
+    ctx = FlowExecutionContext(flow_name="flow-a", flow_run_id="run-1", started_at="2026-02-21T00:00:00+00:00")
+    with TaskProfiler(output_dir=profile_dir(settings, "run-1"), name="task-a"):  # type: ignore[arg-type]
+        _spin(0.01)
+
+    monitor.success(ctx=ctx, records_processed=1, metadata={"rows": 1})
+
+    assert audit.events[0]["metadata"] == {"rows": 1, "profile_uri": "s3://drp-lakehouse/profiles/flow_run_id=run-1/"}
+    assert sorted(repo.keys) == [
+        "profiles/flow_run_id=run-1/task-a.folded",
+        "profiles/flow_run_id=run-1/task-a.pstats",
+        "profiles/flow_run_id=run-1/task-a.stats.txt",
+    ]
@@ -0,0 +1,34 @@
+from drp.core.ttl_cache import TtlLruCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_entry() -> None:
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=4, ttl_seconds=5, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0